@@ -0,0 +1,357 @@
+"""
+Asyncio Google Calendar client.
+Implements the CalendarServiceProtocol operations as coroutines over a pooled,
+keep-alive HTTP/1.1 connection, with bounded concurrency and jittered
+exponential backoff on rate-limit and server errors.  Uses only the standard
+library, so it runs anywhere the rest of the scheduler does.
+"""
+
+import asyncio
+import json
+import random
+import ssl
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+import instrumentation
+
+DEFAULT_BASE_URL = "https://www.googleapis.com/calendar/v3"
+
+# 403 is only retried when Google says it is a rate limit, not a permissions problem
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CalendarHTTPError(Exception):
+    """Non-2xx response from the Calendar API."""
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+        self.reason = error_reason(body)
+        super().__init__(f"HTTP {status}: {self.reason or body[:200]!r}")
+
+    @property
+    def is_rate_limit(self) -> bool:
+        return self.status == 429 or (self.status == 403 and self.reason in RATE_LIMIT_REASONS)
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.is_rate_limit or self.status in RETRY_STATUSES
+
+
+def error_reason(body: bytes) -> Optional[str]:
+    """Pull error.errors[0].reason out of a Google API error body, if any."""
+    try:
+        error = json.loads(body)["error"]
+        return error.get("errors", [{}])[0].get("reason") or error.get("status")
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.requests = 0
+
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Keep-alive connections to one host, at most max_connections at a time."""
+
+    def __init__(self, host: str, port: int, ssl_context=None, max_connections: int = 8):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.max_connections = max_connections
+        self.idle: List[_Connection] = []
+        self.opened = 0
+        self._semaphore = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # created lazily so the pool can be built outside a running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self._semaphore
+
+    async def acquire(self) -> _Connection:
+        await self.semaphore.acquire()
+        try:
+            while self.idle:
+                conn = self.idle.pop()
+                if conn.usable():
+                    return conn
+                conn.close()
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl_context
+            )
+            self.opened += 1
+            instrumentation.count("calendar.connections_opened")
+            return _Connection(reader, writer)
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+    def release(self, conn: _Connection, reusable: bool):
+        if reusable and conn.usable():
+            self.idle.append(conn)
+        else:
+            conn.close()
+        self.semaphore.release()
+
+    async def close(self):
+        idle, self.idle = self.idle, []
+        for conn in idle:
+            conn.close()
+        for conn in idle:
+            try:
+                await conn.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                # trailers end with a blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    elif status in (204, 304) or 100 <= status < 200:
+        body = b""
+    else:
+        body = await reader.read()
+        headers["connection"] = "close"
+    return status, headers, body
+
+
+class AsyncCalendarClient:
+    """Async counterpart of GoogleCalendarService.
+
+    Args:
+        token: OAuth access token, or None for a server that doesn't need one
+        token_provider: callable returning a fresh access token for each request
+            (takes precedence over token)
+        base_url: Calendar API root, overridable for a local stub server in tests
+        max_connections: upper bound on concurrent requests/open connections
+        max_retries: retries after a rate-limit or server error before giving up
+        backoff_base, backoff_max: full-jitter backoff is uniform(0, min(max, base * 2**attempt))
+        rate_limiter: optional limiter with async acquire_async()/on_success()/on_rate_limited()
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        token_provider: Optional[Callable[[], str]] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: int = 8,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 32.0,
+        rate_limiter=None,
+        rng: Optional[random.Random] = None,
+        sleep=asyncio.sleep,
+    ):
+        parts = urlsplit(base_url)
+        secure = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if secure else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.pool = ConnectionPool(
+            self.host,
+            self.port,
+            ssl.create_default_context() if secure else None,
+            max_connections,
+        )
+        self.token = token
+        self.token_provider = token_provider
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+        self.retries = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        await self.pool.close()
+
+    def _headers(self, body: Optional[bytes]) -> Dict[str, str]:
+        headers = {
+            "Host": self.host if self.port in (80, 443) else f"{self.host}:{self.port}",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+            "Content-Length": str(len(body) if body else 0),
+        }
+        token = self.token_provider() if self.token_provider else self.token
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if body:
+            headers["Content-Type"] = "application/json"
+        return headers
+
+    async def _send_once(self, method: str, target: str, body: Optional[bytes]):
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in self._headers(body).items()
+        )
+        payload = head.encode("latin-1") + b"\r\n" + (body or b"")
+
+        # a pooled keep-alive connection may have been closed by the server
+        # while idle; retry those once on a fresh connection
+        for _ in range(2):
+            conn = await self.pool.acquire()
+            reused = conn.requests > 0
+            reusable = False
+            try:
+                conn.writer.write(payload)
+                await conn.writer.drain()
+                status, headers, data = await _read_response(conn.reader)
+                conn.requests += 1
+                reusable = headers.get("connection", "").lower() != "close"
+                return status, data
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+            finally:
+                self.pool.release(conn, reusable)
+        raise ConnectionResetError("pooled connection failed twice")
+
+    async def request(self, method: str, path: str, params: Optional[Dict] = None,
+                      body: Optional[Dict] = None) -> Optional[Dict]:
+        """Send one API request, retrying rate-limit and server errors with backoff.
+        Returns the decoded JSON body (None for empty responses)."""
+        target = self.base_path + path
+        if params:
+            target += "?" + urlencode({k: v for k, v in params.items() if v is not None})
+        data = json.dumps(body).encode() if body is not None else None
+
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            with instrumentation.timer(f"calendar.async.{method.lower()}"):
+                status, response = await self._send_once(method, target, data)
+            if 200 <= status < 300:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.on_success()
+                return json.loads(response) if response else None
+
+            error = CalendarHTTPError(status, response)
+            if not error.is_retryable or attempt >= self.max_retries:
+                raise error
+            if self.rate_limiter is not None and error.is_rate_limit:
+                self.rate_limiter.on_rate_limited()
+            delay = self.rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            attempt += 1
+            self.retries += 1
+            instrumentation.count("calendar.retries")
+            await self.sleep(delay)
+
+    @staticmethod
+    def _events_path(calendar_id: str, event_id: Optional[str] = None) -> str:
+        path = f"/calendars/{quote(calendar_id, safe='')}/events"
+        if event_id is not None:
+            path += f"/{quote(event_id, safe='')}"
+        return path
+
+    async def list_events(self, calendar_id: str, time_min: str, time_max: str,
+                          page_token: Optional[str] = None, max_results: int = 100,
+                          fields: Optional[str] = None,
+                          private_extended_property: Optional[str] = None,
+                          sync_token: Optional[str] = None) -> Dict:
+        """One page of events; the filters mean what they do for
+        GoogleCalendarService.list_events."""
+        return await self.request(
+            "GET",
+            self._events_path(calendar_id),
+            params={
+                "timeMin": time_min,
+                "timeMax": time_max,
+                "pageToken": page_token,
+                "maxResults": max_results,
+                "fields": fields,
+                "privateExtendedProperty": private_extended_property,
+                "syncToken": sync_token,
+            },
+        )
+
+    async def list_all_events(self, calendar_id: str, time_min: str, time_max: str,
+                              max_results: int = 2500) -> List[Dict]:
+        """Follow nextPageToken and return every event in the range."""
+        events = []
+        page_token = None
+        while True:
+            result = await self.list_events(calendar_id, time_min, time_max, page_token, max_results)
+            events.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return events
+
+    async def get_event(self, calendar_id: str, event_id: str) -> Optional[Dict]:
+        """The event with this ID, or None if there is none."""
+        try:
+            return await self.request("GET", self._events_path(calendar_id, event_id))
+        except CalendarHTTPError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    async def create_event(self, calendar_id: str, event: Dict) -> Dict:
+        return await self.request("POST", self._events_path(calendar_id), body=event)
+
+    async def update_event(self, calendar_id: str, event_id: str, event: Dict) -> Dict:
+        return await self.request("PUT", self._events_path(calendar_id, event_id), body=event)
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self.request(
+            "DELETE",
+            self._events_path(calendar_id, event_id),
+            params={"sendUpdates": "none"},
+        )
+
+
+def credentials_token_provider(creds) -> Callable[[], str]:
+    """Token provider for google.oauth2 credentials (e.g. the ones
+    google_calender keeps in token.pickle), refreshing them when they expire."""
+
+    def provider():
+        if not creds.valid:
+            from google.auth.transport.requests import Request
+
+            creds.refresh(Request())
+        return creds.token
+
+    return provider
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the iCalendar export: how long a century-long feed takes to
+generate, split into schedule generation and ICS writing.
+
+    python bench_ics_export.py --years 100 --repeat 5
+"""
+
+import argparse
+import io
+import time
+
+import take2
+from ics_export import write_ics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark iCalendar export")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    schedule = [
+        take2.generate_schedule(year)
+        for year in range(args.start_year, args.start_year + args.years)
+    ]
+    generate_seconds = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.repeat):
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        count = write_ics(schedule, buffer)
+        timings.append(time.perf_counter() - start)
+    size = len(buffer.getvalue().encode("utf-8"))
+    best = min(timings)
+
+    print(f"years:            {args.years}")
+    print(f"events:           {count}")
+    print(f"feed size:        {size / 1024:.1f} KiB")
+    print(f"generate years:   {generate_seconds * 1e3:.1f} ms")
+    print(f"write ics (best): {best * 1e3:.1f} ms ({count / best:,.0f} events/s)")
+    print(f"write ics (mean): {sum(timings) / len(timings) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for startup time: how long a fresh interpreter takes to import each
+entry point, and which heavy optional dependencies (the Google client
+libraries, openpyxl, asyncio) each one drags in.  Those are imported on the
+code path that needs them, so quick commands like printing a year should
+start in tens of milliseconds.
+
+    python bench_startup.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+# imported only on the code paths that use them
+HEAVY_MODULES = ["googleapiclient", "google_auth_oauthlib", "google.auth", "openpyxl", "asyncio"]
+
+COMMANDS = {
+    "interpreter": "pass",
+    "print a year": "import print_schedule; print_schedule.print_year_schedule(2026)",
+    "import winship_schedule": "import winship_schedule",
+    "import take2": "import take2",
+    "import rebalance2": "import rebalance2",
+    "import export_to_excel": "import export_to_excel",
+    "import google_calender": "import google_calender",
+    "import calendar exporter": "import export_winship_schedule_to_google_calender",
+}
+
+
+def run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return result.stdout
+
+
+def heavy_modules_loaded(code: str) -> List[str]:
+    """HEAVY_MODULES left in sys.modules after running code in a fresh
+    interpreter."""
+    probe = (
+        f"{code}\nimport json as _json, sys as _sys\n"
+        f"print(_json.dumps([m for m in {HEAVY_MODULES!r} if m in _sys.modules]))"
+    )
+    return json.loads(run(probe).splitlines()[-1])
+
+
+def time_command(code: str, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(code)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark entry point startup time")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    # warm the bytecode cache so the first run doesn't pay for compiling
+    for code in COMMANDS.values():
+        run(code)
+
+    baseline = None
+    for name, code in COMMANDS.items():
+        median = statistics.median(time_command(code, args.repeat))
+        if baseline is None:
+            baseline = median
+        heavy = ", ".join(heavy_modules_loaded(code)) or "-"
+        print(f"{name:28} {median * 1e3:7.1f} ms  (+{(median - baseline) * 1e3:5.1f} ms)  heavy: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
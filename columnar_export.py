@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Columnar export of the schedule for analysis.
+One row per (year, week index) with year, week_index, start, end, kind,
+holiday and share columns.  Written as Parquet or Arrow IPC when pyarrow is
+installed; otherwise (or on request) as a dependency-free packed binary of
+little-endian column arrays that read_packed() loads back.
+
+    python columnar_export.py --years 100 -o winship_weeks.parquet
+    python columnar_export.py --years 100 --format packed -o winship_weeks.wscol
+"""
+
+import argparse
+import datetime
+import json
+import struct
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from schedule_arrays import KINDS, NO_WEEK, ScheduleArrays
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+PACKED_MAGIC = b"WSCOL1\0\0"
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+FORMAT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "packed": ".wscol"}
+
+# string columns are dictionary encoded; code 0 of holiday is "no holiday"
+DICTIONARY_COLUMNS = ("kind", "holiday", "share")
+
+
+class Columns:
+    """
+    The export's columns as stdlib arrays.
+
+        year, week_index      int16
+        start, end            int32 days since 1970-01-01 (Arrow date32)
+        kind, holiday, share  int16 codes into dictionaries[name]
+    """
+
+    def __init__(self, data: Dict[str, array], dictionaries: Dict[str, List[Optional[str]]]):
+        self.data = data
+        self.dictionaries = dictionaries
+
+    def __len__(self):
+        return len(self.data["year"])
+
+    def __getitem__(self, name: str) -> array:
+        return self.data[name]
+
+    def decoded(self, name: str) -> List:
+        """A column as Python values (strings, dates or ints)."""
+        if name in self.dictionaries:
+            dictionary = self.dictionaries[name]
+            return [dictionary[code] for code in self.data[name]]
+        if name in ("start", "end"):
+            return [datetime.date.fromordinal(day + EPOCH_ORDINAL) for day in self.data[name]]
+        return list(self.data[name])
+
+    def count_by(self, *names: str) -> Counter:
+        """Rows per combination of the named columns' values, e.g.
+        count_by("share", "kind") for each owner's weeks of each kind."""
+        return Counter(zip(*(self.decoded(name) for name in names)))
+
+
+def schedule_columns(schedule) -> Columns:
+    """Columns for a schedule (list of HouseYear, or ScheduleArrays)."""
+    arrays = schedule if isinstance(schedule, ScheduleArrays) else ScheduleArrays.from_schedule(schedule)
+    data = {name: array("h") for name in ("year", "week_index", "kind", "holiday", "share")}
+    data["start"] = array("i")
+    data["end"] = array("i")
+    for year in arrays.years:
+        base = arrays.slot(year, 0)
+        for w_idx in range(arrays.weeks_per_year):
+            slot = base + w_idx
+            if arrays.share[slot] == NO_WEEK:
+                continue
+            start = arrays.start[slot] - EPOCH_ORDINAL
+            data["year"].append(year)
+            data["week_index"].append(w_idx)
+            data["start"].append(start)
+            data["end"].append(start + 7)
+            data["kind"].append(arrays.kind[slot])
+            data["holiday"].append(arrays.holiday[slot])
+            data["share"].append(arrays.share[slot])
+    dictionaries = {
+        "kind": list(KINDS),
+        "holiday": list(arrays.holiday_names),
+        "share": list(arrays.share_names),
+    }
+    return Columns(data, dictionaries)
+
+
+def to_arrow_table(columns: Columns):
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is not installed; use the packed format")
+    fields = {}
+    for name in ("year", "week_index"):
+        fields[name] = pyarrow.array(columns[name], type=pyarrow.int16())
+    for name in ("start", "end"):
+        fields[name] = pyarrow.array(columns[name], type=pyarrow.int32()).cast(pyarrow.date32())
+    for name in DICTIONARY_COLUMNS:
+        dictionary = columns.dictionaries[name]
+        codes = columns[name]
+        if name == "holiday":
+            mask = pyarrow.array([code == 0 for code in codes])
+            indices = pyarrow.array(codes, type=pyarrow.int16(), mask=mask)
+        else:
+            indices = pyarrow.array(codes, type=pyarrow.int16())
+        fields[name] = pyarrow.DictionaryArray.from_arrays(
+            indices, pyarrow.array(["" if v is None else v for v in dictionary])
+        )
+    return pyarrow.table(fields)
+
+
+def write_packed(columns: Columns, path: str):
+    """
+    Packed layout: magic, uint32 header length, JSON header, then each
+    column's little-endian bytes at the 8-byte aligned offset the header
+    gives (relative to the end of the header).
+    """
+    meta = []
+    blobs = []
+    offset = 0
+    for name, values in columns.data.items():
+        values = array(values.typecode, values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        blob = values.tobytes()
+        meta.append({"name": name, "typecode": values.typecode, "length": len(values), "offset": offset})
+        padding = -len(blob) % 8
+        blobs.append(blob + b"\0" * padding)
+        offset += len(blob) + padding
+    header = json.dumps({"columns": meta, "dictionaries": columns.dictionaries}).encode()
+    header += b" " * (-len(header) % 8)
+    with open(path, "wb") as f:
+        f.write(PACKED_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(b"\0" * 4)
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+
+
+def read_packed(path: str) -> Columns:
+    with open(path, "rb") as f:
+        content = f.read()
+    if content[:8] != PACKED_MAGIC:
+        raise ValueError(f"{path} is not a packed column file")
+    (header_length,) = struct.unpack_from("<I", content, 8)
+    body = 16 + header_length
+    header = json.loads(content[16:body])
+    data = {}
+    for column in header["columns"]:
+        values = array(column["typecode"])
+        start = body + column["offset"]
+        values.frombytes(content[start:start + column["length"] * values.itemsize])
+        if sys.byteorder != "little":
+            values.byteswap()
+        data[column["name"]] = values
+    return Columns(data, header["dictionaries"])
+
+
+def resolve_format(path: str, fmt: Optional[str]) -> Tuple[str, str]:
+    """Pick the format (Parquet when pyarrow is available, else packed) and
+    the output path with a matching extension."""
+    if fmt in (None, "auto"):
+        fmt = next((f for f, ext in FORMAT_EXTENSIONS.items() if path.endswith(ext)), None)
+        if fmt is None or (fmt != "packed" and pyarrow is None):
+            fmt = "parquet" if pyarrow is not None else "packed"
+    if not path.endswith(FORMAT_EXTENSIONS[fmt]):
+        path = path.rsplit(".", 1)[0] if "." in path.rsplit("/", 1)[-1] else path
+        path += FORMAT_EXTENSIONS[fmt]
+    return fmt, path
+
+
+def write_columns(schedule, path: str, fmt: Optional[str] = None) -> str:
+    """Write the schedule's columns, returning the path written."""
+    fmt, path = resolve_format(path, fmt)
+    columns = schedule if isinstance(schedule, Columns) else schedule_columns(schedule)
+    if fmt == "packed":
+        write_packed(columns, path)
+    elif fmt == "parquet":
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(to_arrow_table(columns), path)
+    else:
+        import pyarrow.ipc
+
+        table = to_arrow_table(columns)
+        with pyarrow.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the schedule as columns")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--format", choices=["auto", "parquet", "arrow", "packed"], default="auto")
+    parser.add_argument("--no-rebalance", action="store_true")
+    parser.add_argument("-o", "--output", default="winship_weeks")
+    args = parser.parse_args(argv)
+
+    import rebalance2
+    import take2
+
+    schedule = take2.generate_multi_year_schedule(args.start_year, args.years)
+    if not args.no_rebalance:
+        schedule = rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+    path = write_columns(schedule, args.output, args.format)
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
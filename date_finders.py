@@ -153,11 +153,23 @@ def cleanup_weekend_start(year):
     return early_cool_weeks_start(year) - timedelta(days=2 + 7)
 
 
+HOT_WEEKS_BEFORE_TATE_ANNUAL = 8
+
+# Years laid out with a different number of hot weeks before Tate Annual week.
+# season_layout.py checks the layout rules for every year 1900-2300 and finds
+# none that need one.  2021 has 9, which keeps its season inside the calendar
+# year: Aug 1 was a Sunday, so with 8 the last cold week runs to Jan 1.  2027,
+# 2032 and 2038 are the same shape; `python season_layout.py --table --strict`
+# lists every such year.
+HOT_WEEKS_EXCEPTIONS = {2021: 9}
+
+
 def hot_weeks_before_tate_annual_week_start(year):
-    # TODO: what's special about 2021?  Can I find other years like this?
-    if year == 2021:
-        return 9
-    return 8
+    """
+    >>> hot_weeks_before_tate_annual_week_start(2021), hot_weeks_before_tate_annual_week_start(2025)
+    (9, 8)
+    """
+    return HOT_WEEKS_EXCEPTIONS.get(year, HOT_WEEKS_BEFORE_TATE_ANNUAL)
 
 
 def sunday_after(dd):
@@ -1,107 +1,148 @@
 #!/usr/bin/env python3
  
-import openpyxl
-from openpyxl.styles import PatternFill, Font
-from openpyxl.utils import get_column_letter
-from openpyxl.comments import Comment
 from date_finders import holiday_to_emoji
+import instrumentation
+import roster
 import winship_schedule
-from datetime import timedelta
+from functools import lru_cache
+
+# row 1 is the year header; week rows follow
+FIRST_WEEK_ROW = 2
+
+
+def week_row_layout(schedule):
+    """
+    Sheet rows for every week, from the schedule's own week index: week i of
+    every year goes on row FIRST_WEEK_ROW + i, so season weeks line up across
+    years and a 53-ISO-week year can't collide with itself.
+
+    Returns ({year: [row for each week in house_year.weeks]}, number of week rows)
+    """
+    num_rows = max(len(house_year.weeks) for house_year in schedule)
+    rows = list(range(FIRST_WEEK_ROW, FIRST_WEEK_ROW + num_rows))
+    return {house_year.year: rows[:len(house_year.weeks)] for house_year in schedule}, num_rows
+
+
+def week_cell_value(week):
+    share_name = winship_schedule.share_name_to_name(week.share)
+    if week.holiday:
+        return f"{share_name} {holiday_to_emoji(week.holiday)}"
+    return share_name
+
+
+def week_comment_text(week):
+    comment_text = f"{week.start.strftime('%Y-%m-%d')}\n{week.kind}"
+    if week.holiday:
+        comment_text += f"\nHoliday: {week.holiday}"
+    return comment_text
 
-def get_iso_week(d):
-    # If the date is not a Sunday, get the previous Sunday
-    while d.weekday() != 6:  # 6 represents Sunday
-        d -= timedelta(days=1)
-    return d.isocalendar()[1]
 
 def get_colors(share):
-    # Generate unique colors for each share (background, font)
-    colors = {
-        'becca': ('B2B2B2', '000000'),
-        'david': ('287289', 'FFFFFF'),
-        'hugh': ('FFFFC1', '000000'),
-        'eddie': ('2A4C7F', 'FFFFFF'),
-        'frank_latimer': ('F7B17D', '000000'),
-        'frank_may': ('B8B085', '000000'),
-        'hankey': ('AAC0DE', '000000'),
-        'jim': ('17A43F', 'FFFFFF'),
-        'joe': ('C2FFC0', '000000'),
-        'myers': ('FC4C06', 'FFFFFF'),
-        'lane': ('ead203', '000000'),
-        'hayley': ('AF2488', 'FFFFFF'),
-        'jordan': ('5483FF', '000000'),
-        'richard': ('A56193', 'FFFFFF'),
-        'will': ('FFA1A2', '000000')
-    }
-    return colors.get(share.split('-')[0], ('FFFFFF', '000000'))
+    # Colors for each share (background, font) come from the roster
+    return roster.default_roster().color(share.split('-')[0])
+
+
+@lru_cache(maxsize=None)
+def get_styles(share):
+    # one PatternFill/Font pair per share, shared by all its cells
+    from openpyxl.styles import PatternFill, Font
+
+    bg_color, font_color = get_colors(share)
+    return (
+        PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid"),
+        Font(color=font_color),
+    )
+
 
 def export_to_excel(filename, schedule):
+    with instrumentation.timer("export_xlsx"):
+        _export_to_excel(filename, schedule)
+
+def _export_to_excel(filename, schedule):
+    # openpyxl is only imported when a workbook is written, so importing this
+    # module for its layout helpers stays cheap
+    import openpyxl
+    from openpyxl.comments import Comment
+    from openpyxl.utils import get_column_letter
+
     # Determine start and end years from schedule
     start_year = min(hy.year for hy in schedule)
     end_year = max(hy.year for hy in schedule)
-    
+    layout, num_rows = week_row_layout(schedule)
+    house_years = {hy.year: hy for hy in schedule}
+
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "Winship House Schedule"
 
-    # Set up header row with years
+    # Set up header row with years and the week column
     ws.cell(row=1, column=1, value="Week")
     for year in range(start_year, end_year + 1):
         ws.cell(row=1, column=(year - start_year + 2), value=year)
+    for week_number in range(1, num_rows + 1):
+        ws.cell(row=FIRST_WEEK_ROW + week_number - 1, column=1, value=f"Week {week_number}")
 
-    # Fill in the schedule
+    # Fill in the schedule a year (column) at a time
     print(f"start_year: {start_year} end_year: {end_year}")
     for year in range(start_year, end_year + 1):
-        #print(f"year: {year}")
-        house_year = next((hy for hy in schedule if hy.year == year), None)
+        house_year = house_years.get(year)
         if not house_year:
             print(f"Warning: No schedule found for year {year}")
             continue
-            
+
         column = year - start_year + 2
-        
-        for week in house_year.weeks:
-            #print(f"week: {week.start} {week.end} {week.kind} {week.share}")
-            iso_week = get_iso_week(week.start)
-            if iso_week <= 9:
-                continue  # Skip the first 9 weeks
-            row = iso_week - 9 + 1  # +1 because row 1 is the header, -9 to adjust for skipped weeks
-            cell = ws.cell(row=row, column=column)
-            share_name = winship_schedule.share_name_to_name(week.share)
-            
-            # Add emoji if it's a holiday week
-            if week.holiday:
-                emoji = holiday_to_emoji(week.holiday)
-                cell.value = f"{share_name} {emoji}"
-            else:
-                cell.value = share_name
-                
-            bg_color, font_color = get_colors(week.share)
-            cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-            cell.font = Font(color=font_color)
-            
+        for row, week in zip(layout[year], house_year.weeks):
+            cell = ws.cell(row=row, column=column, value=week_cell_value(week))
+            cell.fill, cell.font = get_styles(week.share)
             # Add comment with date range, chunk type, and holiday (if any)
-            date_range = f"{week.start.strftime('%Y-%m-%d')}"
-            comment_text = f"{date_range}\n{week.kind}"
-            if hasattr(week, 'holiday') and week.holiday:
-                comment_text += f"\nHoliday: {week.holiday}"
-            comment = Comment(comment_text, "Winship Schedule")
-            cell.comment = comment
-
-        # Fill in the week numbers for this year
-        if year == start_year:
-            for week_num in range(10, 54):
-                ws.cell(row=week_num - 9 + 1, column=1, value=f"Week {week_num}")
+            cell.comment = Comment(week_comment_text(week), "Winship Schedule")
 
     # Adjust column widths
     for column in range(1, end_year - start_year + 3):
         ws.column_dimensions[get_column_letter(column)].width = 15
 
     # Adjust row height
-    for row in range(1, 46):  # 44 weeks (53-9) + header
+    for row in range(1, FIRST_WEEK_ROW + num_rows):
         ws.row_dimensions[row].height = 30
 
     wb.save(filename)
 
+# Excel's limit on sheet names
+MAX_SHEET_TITLE = 31
+
+
+def export_owner_sheets(filename, owner_index, shares=None):
+    """
+    A workbook with one sheet per owner listing their weeks (year, week,
+    start, kind, holiday), read from an owner_index.OwnerIndex so each sheet
+    is one owner's list rather than a scan of the whole schedule.
+    """
+    with instrumentation.timer("export_owner_xlsx"):
+        import openpyxl
+        from openpyxl.utils import get_column_letter
+
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        for share in shares or owner_index.shares():
+            ws = wb.create_sheet(winship_schedule.share_name_to_name(share)[:MAX_SHEET_TITLE])
+            fill, font = get_styles(share)
+            for column, title in enumerate(["Year", "Week", "Start", "Kind", "Holiday"], start=1):
+                cell = ws.cell(row=1, column=column, value=title)
+                cell.fill, cell.font = fill, font
+            for row, (year, week_index, week) in enumerate(owner_index.weeks_of(share), start=2):
+                ws.cell(row=row, column=1, value=year)
+                ws.cell(row=row, column=2, value=week_index + 1)
+                ws.cell(row=row, column=3, value=week.start).number_format = "yyyy-mm-dd"
+                ws.cell(row=row, column=4, value=week.kind)
+                if week.holiday:
+                    ws.cell(row=row, column=5, value=f"{week.holiday} {holiday_to_emoji(week.holiday)}")
+            for column in range(1, 6):
+                ws.column_dimensions[get_column_letter(column)].width = 15
+        wb.save(filename)
+
+
 if __name__ == "__main__":
+    import schedule_cache
+
+    schedule, _ = schedule_cache.load_schedule(cache=schedule_cache.ScheduleCache())
     export_to_excel("winship_schedule.xlsx", schedule)
@@ -1,12 +1,32 @@
 #!/usr/bin/env python3
 import datetime
-import time
+from typing import Dict, List, Optional
 
 import rebalance2
 import google_calender
 import take2
 import logging
 
+import instrumentation
+from calendar_snapshot import DEFAULT_SNAPSHOT_PATH, CalendarSnapshot
+from google_calendar_wrapper import GoogleCalendarService, MAX_LIST_RESULTS
+from rate_limiter import AdaptiveRateLimiter, error_status
+from winship_calendar_core import (
+    PROPERTY_YEAR,
+    CalendarEvent,
+    CalendarServiceProtocol,
+    calendar_event_to_google_format,
+    find_conflicts,
+    get_events_for_year,
+    get_year_from_schedule,
+    make_event_id,
+    plan_sync,
+    stored_hash,
+)
+
+
+# shared by every call below; paces itself to whatever quota is available
+RATE_LIMITER = AdaptiveRateLimiter()
 
 WINSHIP_HOUSE_CALENDER_ID = (
     "maski.org_rphaqm5b55daqion1cubolqfpk@group.calendar.google.com"
@@ -23,17 +43,212 @@ def list_calenders():
 def share_name_to_printable(share_name):
     return share_name.replace("_", " ").title()
 
-def delete_event_for_week(week, service):
+
+def generate_schedule(start_year=2025, num_years=20):
+    """The rebalanced multi-year schedule the calendar is exported from."""
+    schedule = take2.generate_multi_year_schedule(start_year, num_years)
+    return rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+
+
+class CalendarExporter:
+    """Writes schedule events to a calendar.
+
+    Events generated from the schedule carry a deterministic ID per
+    (year, week index) plus a content hash, so they are found by ID rather
+    than by scanning dates, and re-exporting an unchanged schedule writes
+    nothing.
+
+    With a snapshot, remote state is read from the local CalendarSnapshot,
+    refreshed once per exporter with only the changes since the last run.
+    """
+
+    def __init__(self, service: CalendarServiceProtocol, calendar_id: str,
+                 snapshot: Optional[CalendarSnapshot] = None):
+        self.service = service
+        self.calendar_id = calendar_id
+        self.snapshot = snapshot
+        self.snapshot_refreshed = False
+
+    def current_snapshot(self) -> CalendarSnapshot:
+        if not self.snapshot_refreshed:
+            self.snapshot.refresh(self.service)
+            self.snapshot_refreshed = True
+        return self.snapshot
+
+    def check_conflicts(self, event: CalendarEvent) -> List[Dict]:
+        """Other events overlapping the event's dates (not the event itself)."""
+        if self.snapshot is not None:
+            existing = list(self.current_snapshot().events.values())
+        else:
+            existing = self.service.list_events(
+                self.calendar_id,
+                event.start_date.isoformat() + "T00:00:00Z",
+                event.end_date.isoformat() + "T00:00:00Z",
+            ).get("items", [])
+        conflicts = find_conflicts(existing, event.start_date, event.end_date)
+        return [c for c in conflicts if event.event_id is None or c["id"] != event.event_id]
+
+    def create_or_update_event(self, event: CalendarEvent, check_conflicts=True) -> bool:
+        """Write one event, returning True if the calendar now has it.
+
+        With check_conflicts, an overlapping event from somewhere else blocks
+        the write and False is returned.
+        """
+        if check_conflicts:
+            conflicts = self.check_conflicts(event)
+            if conflicts:
+                for conflict in conflicts:
+                    print(f"  Conflict with {conflict['summary']} "
+                          f"({conflict['start']} - {conflict['end']})")
+                return False
+        self.write_event(event)
+        return True
+
+    def write_event(self, event: CalendarEvent) -> str:
+        """Insert the event under its ID, falling back to an update if the ID
+        is taken.  Returns "created", "updated" or "unchanged"."""
+        body = calendar_event_to_google_format(event)
+        try:
+            self.published(self.service.create_event(self.calendar_id, body), body)
+            return "created"
+        except Exception as e:
+            # 409: the ID exists, possibly as a deleted ("cancelled") event
+            if event.event_id is None or error_status(e) != 409:
+                raise
+        current = self.service.get_event(self.calendar_id, event.event_id)
+        if (current and current.get("status") != "cancelled"
+                and stored_hash(current) == event.content_hash()):
+            return "unchanged"
+        self.update_event(event)
+        return "updated"
+
+    def update_event(self, event: CalendarEvent):
+        body = dict(calendar_event_to_google_format(event), status="confirmed")
+        self.published(self.service.update_event(self.calendar_id, event.event_id, body), body)
+
+    def delete_event(self, event_id: str):
+        self.service.delete_event(self.calendar_id, event_id)
+        if self.snapshot is not None:
+            self.snapshot.forget(event_id)
+
+    def published(self, result: Optional[Dict], body: Dict):
+        """Keep the snapshot in step with a write; the API's copy wins."""
+        if self.snapshot is not None:
+            self.snapshot.record(result if isinstance(result, dict) and "id" in result else body)
+
+    def exported_events(self, year: int) -> List[Dict]:
+        """Every event previously exported for the year, from one filtered
+        listing on the year's extended property (or from the snapshot)."""
+        if self.snapshot is not None:
+            return self.current_snapshot().with_property(PROPERTY_YEAR, str(year))
+        events = []
+        page_token = None
+        while True:
+            result = self.service.list_events(
+                self.calendar_id,
+                None,
+                None,
+                page_token=page_token,
+                max_results=MAX_LIST_RESULTS,
+                private_extended_property=f"{PROPERTY_YEAR}={year}",
+            )
+            events.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return events
+
+    def sync_year(self, events: List[CalendarEvent], year: int) -> Dict[str, int]:
+        """Make the calendar's exported events for the year match events:
+        create missing ones, update changed ones and delete stale ones.
+
+        An empty events list is refused rather than read as "delete the
+        whole year", which is what a year outside the schedule looks like."""
+        if not events:
+            raise ValueError(f"No schedule events for {year}; refusing to sync")
+        creates, updates, deletes = plan_sync(events, self.exported_events(year))
+        counts = {"created": 0, "updated": 0, "deleted": len(deletes),
+                  "unchanged": len(events) - len(creates) - len(updates)}
+        for event in creates:
+            counts[self.write_event(event)] += 1
+        for event in updates:
+            self.update_event(event)
+            counts["updated"] += 1
+        for event_id in deletes:
+            self.delete_event(event_id)
+        if self.snapshot is not None:
+            self.snapshot.save()
+        return counts
+
+    def push_events(self, events: List[CalendarEvent], deleted_ids=()) -> Dict[str, int]:
+        """Write only the given events by ID and delete deleted_ids, without
+        listing the calendar; feed it schedule_diff.changed_events."""
+        counts = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        for event in events:
+            counts[self.write_event(event)] += 1
+        for event_id in deleted_ids:
+            try:
+                self.delete_event(event_id)
+                counts["deleted"] += 1
+            except Exception as e:
+                if error_status(e) not in (404, 410):
+                    raise
+        if self.snapshot is not None:
+            self.snapshot.save()
+        return counts
+
+
+def export_year(year, week_format="monday-sunday", service=None,
+                snapshot_path=DEFAULT_SNAPSHOT_PATH, schedule=None):
+    """Sync one year of the schedule to the house calendar, reconciling
+    against the local snapshot at snapshot_path (None to list remotely).
+    schedule defaults to generate_schedule(); a year it doesn't cover raises
+    ValueError before the calendar is touched."""
+    if schedule is None:
+        schedule = generate_schedule()
+    if get_year_from_schedule(schedule, year) is None:
+        raise ValueError(
+            f"{year} is not in the schedule ({schedule[0].year}-{schedule[-1].year})"
+        )
+    calendar = GoogleCalendarService(
+        service or google_calender.get_calender_service(), rate_limiter=RATE_LIMITER
+    )
+    snapshot = (
+        CalendarSnapshot.load(WINSHIP_HOUSE_CALENDER_ID, snapshot_path) if snapshot_path else None
+    )
+    exporter = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID, snapshot)
+    events = get_events_for_year(schedule, year, week_format)
+    counts = exporter.sync_year(events, year)
+    print(f"{year}: {counts['created']} created, {counts['updated']} updated, "
+          f"{counts['deleted']} deleted, {counts['unchanged']} unchanged "
+          f"({RATE_LIMITER.summary()})")
+    return counts
+
+def delete_event_for_week(week, service, event_id=None):
+    if event_id is not None:
+        # exported events are deleted directly by ID; older ones are found by date
+        try:
+            instrumentation.count("calendar.delete_event")
+            RATE_LIMITER.execute(service.events().delete(
+                calendarId=WINSHIP_HOUSE_CALENDER_ID,
+                eventId=event_id,
+                sendNotifications=False
+            ).execute)
+            return True
+        except Exception as e:
+            if error_status(e) not in (404, 410):
+                raise
+
     # Calculate end date if not set (week runs for 7 days)
     end_date = week.end if week.end else (week.start + datetime.timedelta(days=7))
     
     # Search for events that match our start and end dates
-    events_result = (
+    instrumentation.count("calendar.list_events")
+    events_result = RATE_LIMITER.execute(
         service.events()
         .list(calendarId=WINSHIP_HOUSE_CALENDER_ID,
               timeMin=week.start.isoformat() + "T00:00:00Z",
               timeMax=end_date.isoformat() + "T23:59:59Z")
-        .execute()
+        .execute
     )
     
     for event in events_result.get("items", []):
@@ -46,38 +261,26 @@ def delete_event_for_week(week, service):
             if (event_start == week.start.isoformat() and 
                 event_end == end_date.isoformat()):
                 print(f"Deleting event: {event.get('summary', 'No title')} from {event_start} to {event_end}")
-                service.events().delete(
+                instrumentation.count("calendar.delete_event")
+                RATE_LIMITER.execute(service.events().delete(
                     calendarId=WINSHIP_HOUSE_CALENDER_ID,
                     eventId=event["id"],
                     sendNotifications=False
-                ).execute()
+                ).execute)
                 return True  # Found and deleted the event
     
     return False  # Event not found
 
 
-def delete_all_events(service):
-    page_token = None
-    while True:
-        events_result = (
-            service.events()
-            .list(calendarId=WINSHIP_HOUSE_CALENDER_ID, pageToken=page_token)
-            .execute()
-        )
-        for event in events_result.get("items", []):
-            print("deleteing {}".format(event["id"]))
-            kwargs = {
-                "calendarId": WINSHIP_HOUSE_CALENDER_ID,
-                "eventId": event["id"],
-                "sendNotifications": False,
-            }
-            rq = service.events().delete(**kwargs)
-            resp = rq.execute()
-            print("sleeping for 30 seconds")
-            time.sleep(30)
-        page_token = events_result.get("nextPageToken")
-        if not page_token:
-            break
+def delete_all_events(service, checkpoint_path="purge_checkpoint.json"):
+    """Delete every event in the house calendar.  Safe to rerun after an
+    interruption; it resumes from checkpoint_path."""
+    calendar = GoogleCalendarService(service, rate_limiter=RATE_LIMITER)
+    deleted_count = calendar.purge_events(
+        WINSHIP_HOUSE_CALENDER_ID, checkpoint_path=checkpoint_path
+    )
+    print(f"Deleted {deleted_count} events ({RATE_LIMITER.summary()})")
+    return deleted_count
 
 
 def delete_sunday_events_for_year(service, year):
@@ -92,13 +295,14 @@ def delete_sunday_events_for_year(service, year):
     deleted_count = 0
     
     while True:
-        events_result = (
+        instrumentation.count("calendar.list_events")
+        events_result = RATE_LIMITER.execute(
             service.events()
             .list(calendarId=WINSHIP_HOUSE_CALENDER_ID, 
                   timeMin=time_min, 
                   timeMax=time_max,
                   pageToken=page_token)
-            .execute()
+            .execute
         )
         
         for event in events_result.get("items", []):
@@ -107,50 +311,46 @@ def delete_sunday_events_for_year(service, year):
                 event_date = datetime.datetime.fromisoformat(event['start']['date']).date()
                 if event_date.weekday() == 6:  # Sunday is 6
                     print(f"Deleting Sunday event: {event.get('summary', 'No title')} on {event_date}")
-                    service.events().delete(
+                    instrumentation.count("calendar.delete_event")
+                    RATE_LIMITER.execute(service.events().delete(
                         calendarId=WINSHIP_HOUSE_CALENDER_ID,
                         eventId=event["id"],
                         sendNotifications=False
-                    ).execute()
+                    ).execute)
                     deleted_count += 1
-                    time.sleep(1)  # Rate limit
         
         page_token = events_result.get("nextPageToken")
         if not page_token:
             break
     
-    print(f"Deleted {deleted_count} Sunday events for {year}")
+    print(f"Deleted {deleted_count} Sunday events for {year} ({RATE_LIMITER.summary()})")
 
 def main(year=2026):
     # Set logging level to INFO to suppress debug messages
     logging.basicConfig(level=logging.INFO)
+    instrumentation.enable_from_environment()
     
     service = google_calender.get_calender_service()
     
-    # Generate the rebalanced schedule using rebalance2.py logic
-    schedule = []
-    for y in range(2025, 2045):
-        house_year = take2.HouseYear(y, debug=False)
-        house_year.compute_all()
-        schedule.append(house_year)
-    
-    # Apply rebalancing
-    rebalanced_schedule = rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+    rebalanced_schedule = generate_schedule()
 
     for house_year in rebalanced_schedule:
         if house_year.year != year:
             continue
         print(f"Deleting events for {house_year.year}")
         deleted_count = 0
-        for week in house_year.weeks:
-            if delete_event_for_week(week, service):
+        for week_index, week in enumerate(house_year.weeks):
+            with instrumentation.timer("calendar.delete_event_for_week"):
+                found = delete_event_for_week(
+                    week, service, make_event_id(house_year.year, week_index)
+                )
+            if found:
                 deleted_count += 1
                 print(".", end="", flush=True)
             else:
                 print("x", end="", flush=True)  # Event not found
-            time.sleep(0.5)  # Rate limiting
 
-        print(f"\nDeleted {deleted_count} events for {year}")
+        print(f"\nDeleted {deleted_count} events for {year} ({RATE_LIMITER.summary()})")
 
 
 if __name__ == "__main__":
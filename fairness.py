@@ -0,0 +1,212 @@
+"""
+Fairness metrics for a multi-year schedule.
+Builds share x week-index, share x kind, share x holiday and holiday-repeat
+count matrices from the ScheduleArrays form of a schedule in one pass over
+its columns, and reduces them to scores: index deviation, anomaly counts,
+holiday spread and Gini coefficients.  rebalance2 picks candidate swaps
+from its own surplus/deficit counts and accepts one only if swap_delta
+says it lowers objective().
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, List, Optional
+
+import roster
+from schedule_arrays import KINDS, NO_WEEK, ScheduleArrays
+
+# holidays every owner shares, left out of holiday fairness
+EXCLUDED_HOLIDAYS = {"Tate Annual"}
+
+
+class CountMatrix:
+    """Integer counts, one row per share, stored row-major in an array."""
+
+    def __init__(self, rows: List[str], cols: List):
+        self.rows = rows
+        self.cols = cols
+        self.row_index = {row: i for i, row in enumerate(rows)}
+        self.col_index = {col: j for j, col in enumerate(cols)}
+        self.width = len(cols)
+        self.data = array("i", [0]) * (len(rows) * len(cols))
+
+    def get(self, row, col) -> int:
+        return self.data[self.row_index[row] * self.width + self.col_index[col]]
+
+    def row_values(self, row) -> array:
+        start = self.row_index[row] * self.width
+        return self.data[start:start + self.width]
+
+    def col_values(self, col) -> List[int]:
+        return list(self.data[self.col_index[col]::self.width])
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """{row: {col: count}} with the zero counts left out."""
+        result = {}
+        for row in self.rows:
+            counts = {col: n for col, n in zip(self.cols, self.row_values(row)) if n}
+            if counts:
+                result[row] = counts
+        return result
+
+
+def gini(values) -> float:
+    """Gini coefficient of non-negative values: 0 when all are equal, towards 1
+    as one value holds everything.
+
+    >>> gini([1, 1, 1, 1])
+    0.0
+    >>> gini([0, 0, 0, 4])
+    0.75
+    """
+    values = sorted(values)
+    n = len(values)
+    total = sum(values)
+    if n == 0 or total == 0:
+        return 0.0
+    weighted = sum((i + 1) * v for i, v in enumerate(values))
+    return 2 * weighted / (n * total) - (n + 1) / n
+
+
+class FairnessMetrics:
+    """
+    Count matrices for a schedule.
+
+        share_index     share x week index
+        share_kind      share x kind (KINDS)
+        share_holiday   share x holiday (excluding EXCLUDED_HOLIDAYS)
+        holiday_repeats share x holiday: years a share held the same holiday
+                        as in the year before
+    """
+
+    def __init__(self, schedule, share_roster: Optional[roster.Roster] = None):
+        arrays = schedule if isinstance(schedule, ScheduleArrays) else ScheduleArrays.from_schedule(schedule)
+        if share_roster is None:
+            share_roster = getattr(schedule[0], "roster", None) if not isinstance(schedule, ScheduleArrays) else None
+        self.roster = share_roster or roster.default_roster()
+        self.num_years = len(arrays.years)
+        self.weeks_per_year = arrays.weeks_per_year
+
+        shares = list(self.roster.shares)
+        holidays = [h for h in arrays.holiday_names[1:] if h not in EXCLUDED_HOLIDAYS]
+        self.share_index = CountMatrix(shares, list(range(arrays.weeks_per_year)))
+        self.share_kind = CountMatrix(shares, list(KINDS))
+        self.share_holiday = CountMatrix(shares, holidays)
+        self.holiday_repeats = CountMatrix(shares, holidays)
+
+        # schedule codes -> matrix rows/cols (-1 for "everyone", a missing
+        # slot and excluded holidays)
+        row_of = {code: self.share_index.row_index.get(name, -1) for code, name in enumerate(arrays.share_names)}
+        row_of[NO_WEEK] = -1
+        holiday_col = [-1] + [self.share_holiday.col_index.get(h, -1) for h in arrays.holiday_names[1:]]
+        week_index = array("h", range(arrays.weeks_per_year)) * self.num_years
+
+        # count each (share, column value) pair over whole columns at once,
+        # then add the distinct pairs into the matrices
+        for matrix, column, col_of in (
+            (self.share_index, week_index, None),
+            (self.share_kind, arrays.kind, None),
+            (self.share_holiday, arrays.holiday, holiday_col),
+        ):
+            for (code, value), n in Counter(zip(arrays.share, column)).items():
+                row = row_of[code]
+                col = value if col_of is None else col_of[value]
+                if row >= 0 and col >= 0:
+                    matrix.data[row * matrix.width + col] += n
+
+        # (year position, holiday code) -> share code, for every holiday slot
+        holders = {
+            (slot // arrays.weeks_per_year, arrays.holiday[slot]): arrays.share[slot]
+            for slot in compress(range(len(arrays.holiday)), arrays.holiday)
+        }
+        for (year_pos, holiday), code in holders.items():
+            row, col = row_of[code], holiday_col[holiday]
+            if row >= 0 and col >= 0 and holders.get((year_pos - 1, holiday)) == code:
+                self.holiday_repeats.data[row * self.holiday_repeats.width + col] += 1
+
+    def expected_per_index(self, share: str) -> float:
+        """Times a share should hold each week index over the horizon."""
+        return self.roster.weeks[self.roster.share_ids[share]] * self.num_years / roster.WEEKS_PER_YEAR
+
+    def index_deviation(self) -> Dict[str, float]:
+        """Per share, the sum of squared differences between how often it
+        holds each week index and how often it should."""
+        deviation = {}
+        for share in self.share_index.rows:
+            expected = self.expected_per_index(share)
+            deviation[share] = sum((n - expected) ** 2 for n in self.share_index.row_values(share))
+        return deviation
+
+    def objective(self) -> float:
+        """Total squared week-index deviation; lower is fairer."""
+        return sum(self.index_deviation().values())
+
+    def swap_delta(self, share_a: str, w_a: int, share_b: str, w_b: int) -> float:
+        """How much objective() would change if share_a's week index w_a and
+        share_b's w_b traded owners in one year, without recounting."""
+        delta = 0.0
+        for share, lose, gain in ((share_a, w_a, w_b), (share_b, w_b, w_a)):
+            expected = self.expected_per_index(share)
+            lost = self.share_index.get(share, lose) - expected
+            gained = self.share_index.get(share, gain) - expected
+            delta += (lost - 1) ** 2 - lost ** 2 + (gained + 1) ** 2 - gained ** 2
+        return delta
+
+    def apply_swap(self, share_a: str, w_a: int, share_b: str, w_b: int):
+        """Update share_index for the trade swap_delta scores."""
+        data, width = self.share_index.data, self.share_index.width
+        for share, lose, gain in ((share_a, w_a, w_b), (share_b, w_b, w_a)):
+            base = self.share_index.row_index[share] * width
+            data[base + lose] -= 1
+            data[base + gain] += 1
+
+    def index_anomalies(self) -> int:
+        """(share, week index) pairs held a different number of times than
+        expected, as in take2.test_schedule_results."""
+        anomalies = 0
+        for share in self.share_index.rows:
+            expected = self.expected_per_index(share)
+            anomalies += sum(1 for n in self.share_index.row_values(share) if n != expected)
+        return anomalies
+
+    def holiday_rates(self, holiday) -> List[float]:
+        """Each share's count of a holiday per week it owns each year."""
+        return [
+            n / self.roster.weeks[self.roster.share_ids[share]]
+            for share, n in zip(self.share_holiday.rows, self.share_holiday.col_values(holiday))
+        ]
+
+    def kind_rates(self, kind) -> List[float]:
+        """Each share's fraction of its weeks that are of a kind."""
+        rates = []
+        for share, n in zip(self.share_kind.rows, self.share_kind.col_values(kind)):
+            total = sum(self.share_kind.row_values(share))
+            rates.append(n / total if total else 0.0)
+        return rates
+
+    def holiday_spread(self) -> float:
+        """Largest gap, over holidays, between the shares getting a holiday
+        most and least often per week owned."""
+        spread = 0.0
+        for holiday in self.share_holiday.cols:
+            rates = self.holiday_rates(holiday)
+            spread = max(spread, max(rates) - min(rates))
+        return spread
+
+    def scores(self) -> Dict[str, float]:
+        holidays = self.share_holiday.cols
+        return {
+            "index_deviation": round(self.objective(), 3),
+            "anomalies": self.index_anomalies(),
+            "holiday_spread": round(self.holiday_spread(), 2),
+            "kind_gini": round(sum(gini(self.kind_rates(k)) for k in KINDS) / len(KINDS), 4),
+            "holiday_gini": round(
+                sum(gini(self.holiday_rates(h)) for h in holidays) / len(holidays), 4
+            ) if holidays else 0.0,
+            "holiday_repeats": sum(self.holiday_repeats.data),
+        }
+
+
+def fairness_scores(schedule, share_roster: Optional[roster.Roster] = None) -> Dict[str, float]:
+    return FairnessMetrics(schedule, share_roster).scores()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Fuzz the scheduler over many year ranges and roster variants.
+Each case is a start year, a number of years, a list of scenarios.py roster
+changes, and whether (and with which seed) to rebalance.  Cases run on a
+process pool and each schedule is checked against the invariants below; a
+failing case is shrunk (fewer years, fewer changes, no rebalancing) to a
+minimal one that still breaks the same invariant, and printed with the
+command that replays it.
+
+    gaps          every week of every year has a share, a week apart
+    share_counts  every share holds its weeks (a 10% share one of each kind)
+    spacing       a 10% share's weeks are MIN_TEN_PERCENT_SPACING apart
+    alternation   5% shares alternate hot/cold and warm/cool years
+    holidays      each holiday is in one week, of its kind, held by a share
+    relaxed       no year was generated with a rule given up (allow_relaxed)
+
+Every worker keeps the longest generated run for each (roster, start year)
+it has seen and slices shorter cases from it, since a year never depends on
+the years after it; rebalancing can also go through the on-disk
+schedule_cache with --cache-dir.
+
+    python fuzz_schedule.py --cases 2000 --workers 8
+    python fuzz_schedule.py --replay '{"start_year": 2048, "num_years": 2, ...}'
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import rebalance2
+import roster
+import scenarios
+import schedule_cache
+import take2
+from season_layout import HOLIDAY_KINDS, SEASON_WEEKS
+
+# {"start_year": 2031, "num_years": 7, "changes": [...], "seed": None, "rebalance": False}
+Case = Dict
+
+TEN_PERCENT_KINDS = ["cold", "cool", "hot", "warm"]
+
+ALTERNATING_KINDS = [({"hot", "cold"}, {"warm", "cool"}), ({"warm", "cool"}, {"hot", "cold"})]
+
+
+def check_gaps(schedule, share_roster: roster.Roster) -> List[str]:
+    problems = []
+    for house_year in schedule:
+        weeks = house_year.weeks
+        if len(weeks) != SEASON_WEEKS:
+            problems.append(f"{house_year.year}: {len(weeks)} weeks, not {SEASON_WEEKS}")
+        for i, week in enumerate(weeks):
+            if week.share is None:
+                problems.append(f"{house_year.year}: week {i} ({week.start}) has no share")
+            if i and (week.start - weeks[i - 1].start).days != 7:
+                problems.append(f"{house_year.year}: week {i} ({week.start}) doesn't follow week {i - 1}")
+    return problems
+
+
+def check_share_counts(schedule, share_roster: roster.Roster) -> List[str]:
+    problems = []
+    for house_year in schedule:
+        held: Dict[Optional[str], List[str]] = {}
+        for week in house_year.weeks:
+            held.setdefault(week.share, []).append(week.kind)
+        for share_id, share in enumerate(share_roster.shares):
+            kinds = sorted(held.pop(share, []))
+            if len(kinds) != share_roster.weeks[share_id]:
+                problems.append(f"{house_year.year}: {share} has {len(kinds)} weeks, not {share_roster.weeks[share_id]}")
+            elif share_roster.is_ten_percent(share) and kinds != TEN_PERCENT_KINDS:
+                problems.append(f"{house_year.year}: {share} has {kinds}")
+        if len(held.pop("everyone", [])) != 1:
+            problems.append(f"{house_year.year}: everyone doesn't have exactly one week")
+        held.pop(None, None)  # check_gaps reports these
+        for share in held:
+            problems.append(f"{house_year.year}: {share} isn't in the roster")
+    return problems
+
+
+def check_spacing(schedule, share_roster: roster.Roster) -> List[str]:
+    problems = []
+    for house_year in schedule:
+        for share in share_roster.ten_percent_shares:
+            indices = [i for i, week in enumerate(house_year.weeks) if week.share == share]
+            for a, b in zip(indices, indices[1:]):
+                if b - a < take2.MIN_TEN_PERCENT_SPACING:
+                    problems.append(f"{house_year.year}: {share} has weeks {a} and {b}, only {b - a} apart")
+    return problems
+
+
+def check_alternation(schedule, share_roster: roster.Roster) -> List[str]:
+    problems = []
+    for previous_year, house_year in zip(schedule, schedule[1:]):
+        previous = take2.five_percent_kinds(previous_year, share_roster)
+        current = take2.five_percent_kinds(house_year, share_roster)
+        for share, kinds in previous.items():
+            for had, needs in ALTERNATING_KINDS:
+                if had <= kinds and not needs <= current[share]:
+                    problems.append(
+                        f"{house_year.year}: {share} has {sorted(current[share])} "
+                        f"after {sorted(kinds)} in {previous_year.year}"
+                    )
+    return problems
+
+
+def check_holidays(schedule, share_roster: roster.Roster) -> List[str]:
+    problems = []
+    for house_year in schedule:
+        found: Dict[str, List] = {}
+        for week in house_year.weeks:
+            if week.holiday:
+                found.setdefault(week.holiday, []).append(week)
+        for holiday, kind in HOLIDAY_KINDS.items():
+            weeks = found.get(holiday, [])
+            if len(weeks) != 1:
+                problems.append(f"{house_year.year}: {holiday} is in {len(weeks)} weeks")
+            elif weeks[0].kind != kind:
+                problems.append(f"{house_year.year}: {holiday} week is {weeks[0].kind}, not {kind}")
+            elif weeks[0].share not in share_roster.share_ids:
+                problems.append(f"{house_year.year}: {holiday} week is held by {weeks[0].share!r}")
+        tate = found.get("Tate Annual", [])
+        if len(tate) != 1 or tate[0].share != "everyone":
+            problems.append(f"{house_year.year}: Tate Annual week isn't one week for everyone")
+    return problems
+
+
+def check_relaxed(schedule, share_roster: roster.Roster) -> List[str]:
+    return [
+        f"{house_year.year}: {description}"
+        for house_year in schedule
+        for description in getattr(house_year, "relaxed", [])
+    ]
+
+
+INVARIANTS: Dict[str, Callable] = {
+    "gaps": check_gaps,
+    "share_counts": check_share_counts,
+    "spacing": check_spacing,
+    "alternation": check_alternation,
+    "holidays": check_holidays,
+    "relaxed": check_relaxed,
+}
+
+
+def check_schedule(schedule, share_roster: roster.Roster) -> Dict[str, List[str]]:
+    """{invariant: problems} for the invariants the schedule breaks."""
+    failures = {}
+    for name, check in INVARIANTS.items():
+        problems = check(schedule, share_roster)
+        if problems:
+            failures[name] = problems
+    return failures
+
+
+class FixtureCache:
+    """
+    One worker's schedules.  Keeps each roster variant and the longest
+    generated run for each (roster variant, start year); a case asking for
+    fewer years slices it.  Rebalanced schedules are made from a copy of the
+    slice, or loaded through disk (a schedule_cache.ScheduleCache) if given.
+    """
+
+    def __init__(self, max_years: int = 20, disk: Optional[schedule_cache.ScheduleCache] = None,
+                 base: Optional[Dict] = None):
+        self.max_years = max_years
+        self.disk = disk
+        self.base = base or roster.default_roster().to_dict()
+        self.rosters: Dict[str, roster.Roster] = {}
+        self.runs: Dict[Tuple[str, int], List] = {}
+
+    def roster_for(self, changes: List[Dict]) -> Tuple[str, roster.Roster]:
+        key = json.dumps(changes, sort_keys=True)
+        if key not in self.rosters:
+            self.rosters[key] = roster.Roster(scenarios.apply_changes(self.base, changes))
+        return key, self.rosters[key]
+
+    def generated(self, changes: List[Dict], start_year: int, num_years: int):
+        key, share_roster = self.roster_for(changes)
+        run = self.runs.get((key, start_year))
+        if run is None or len(run) < num_years:
+            try:
+                run = take2.generate_multi_year_schedule(
+                    start_year, max(num_years, self.max_years), roster=share_roster
+                )
+            except take2.ScheduleGenerationError:
+                # the longer run may fail after the years asked for
+                run = take2.generate_multi_year_schedule(start_year, num_years, roster=share_roster)
+            self.runs[(key, start_year)] = run
+        return run[:num_years], share_roster
+
+    def schedule(self, case: Case):
+        schedule, share_roster = self.generated(case["changes"], case["start_year"], case["num_years"])
+        if not case["rebalance"]:
+            return schedule, share_roster
+        if self.disk is not None:
+            schedule, _ = schedule_cache.load_schedule(
+                case["start_year"], case["num_years"], share_roster, case["seed"], True, self.disk
+            )
+            return schedule, share_roster
+        schedule = rebalance2.rebalance_global(copy.deepcopy(schedule), share_roster.owner_percent, seed=case["seed"])
+        return schedule, share_roster
+
+
+def run_case(case: Case, fixtures: FixtureCache) -> Dict[str, List[str]]:
+    """{invariant: problems} for the case; a roster the changes can't make
+    fails "roster" and a schedule that can't be made fails "generate"."""
+    try:
+        fixtures.roster_for(case["changes"])
+    except (ValueError, KeyError, StopIteration) as e:
+        return {"roster": [f"{type(e).__name__}: {e}"]}
+    try:
+        schedule, share_roster = fixtures.schedule(case)
+    except Exception as e:
+        return {"generate": [f"{type(e).__name__}: {e}"]}
+    return check_schedule(schedule, share_roster)
+
+
+def shrink_candidates(case: Case) -> Iterator[Case]:
+    """Smaller versions of the case, simplest first."""
+    if case["rebalance"]:
+        yield dict(case, rebalance=False, seed=None)
+    changes = case["changes"]
+    for i in range(len(changes)):
+        yield dict(case, changes=changes[:i] + changes[i + 1:])
+    if case["seed"] is not None:
+        yield dict(case, seed=None)
+    n = case["num_years"]
+    for shorter in sorted({1, n // 2, n - 1}):
+        if 1 <= shorter < n:
+            yield dict(case, num_years=shorter)
+    for skip in sorted({n // 2, 1}, reverse=True):
+        if 1 <= skip < n:
+            yield dict(case, start_year=case["start_year"] + skip, num_years=n - skip)
+
+
+def shrink_case(case: Case, fails: Callable[[Case], bool], max_steps: int = 500) -> Case:
+    """Greedily replace case with the first smaller candidate that still
+    fails, until none does (or max_steps candidates have been tried)."""
+    steps = 0
+    while steps < max_steps:
+        for candidate in shrink_candidates(case):
+            steps += 1
+            if fails(candidate):
+                case = candidate
+                break
+            if steps >= max_steps:
+                break
+        else:
+            break
+    return case
+
+
+def random_changes(rng: random.Random, base: Dict, max_changes: int = 3) -> List[Dict]:
+    """Up to max_changes random sells, splits and merges that make a valid roster."""
+    data = base
+    changes = []
+    for _ in range(rng.randint(1, max_changes)):
+        share_roster = roster.Roster(data)
+        options = [{"sell": {"share": share, "to": f"{share}_new"}} for share in share_roster.shares]
+        options += [{"split": {"share": share, "into": [f"{share}_a", f"{share}_b"]}}
+                    for share in share_roster.ten_percent_shares]
+        options += [{"merge": {"shares": [a, b], "into": f"{a}_{b}"}}
+                    for a, b in share_roster.shares_pairs if a != b]
+        change = rng.choice(options)
+        try:
+            changed = scenarios.apply_changes(data, [change])
+            roster.Roster(changed)
+        except ValueError:
+            continue
+        data = changed
+        changes.append(change)
+    return changes
+
+
+def make_cases(count: int, seed: int = 0, first_year: int = 2000, last_year: int = 2099, max_years: int = 20,
+               variants: int = 8, rebalance_rate: float = 0.2) -> List[Case]:
+    """count random cases over variants roster variants (the first is the
+    roster itself), so workers' fixtures get reused."""
+    rng = random.Random(seed)
+    base = roster.default_roster().to_dict()
+    pool = [[]] + [random_changes(rng, base) for _ in range(variants - 1)]
+    cases = []
+    for _ in range(count):
+        rebalance = rng.random() < rebalance_rate
+        cases.append({
+            "start_year": rng.randint(first_year, last_year),
+            "num_years": rng.randint(1, max_years),
+            "changes": rng.choice(pool),
+            "seed": rng.randrange(1 << 16) if rebalance and rng.random() < 0.5 else None,
+            "rebalance": rebalance,
+        })
+    return cases
+
+
+# the worker process's FixtureCache, made by init_worker
+_fixtures: Optional[FixtureCache] = None
+
+
+def init_worker(max_years: int = 20, cache_dir: Optional[str] = None):
+    global _fixtures
+    disk = schedule_cache.ScheduleCache(cache_dir) if cache_dir else None
+    _fixtures = FixtureCache(max_years, disk)
+    # the unchanged roster's horizon, which most suites start from
+    _fixtures.generated([], 2025, max_years)
+
+
+def fuzz_case(case: Case) -> Dict:
+    """Run a case in this worker, shrinking it if it fails."""
+    failures = run_case(case, _fixtures)
+    result = {"case": case, "failures": failures}
+    if failures:
+        invariant = sorted(failures)[0]
+        shrunk = shrink_case(case, lambda c: invariant in run_case(c, _fixtures))
+        result.update(invariant=invariant, shrunk=shrunk, shrunk_failures=run_case(shrunk, _fixtures)[invariant])
+    return result
+
+
+def run_fuzz(cases: List[Case], workers: Optional[int] = None, max_years: int = 20,
+             cache_dir: Optional[str] = None) -> List[Dict]:
+    """fuzz_case every case, on a process pool unless workers is 1, returning
+    results in case order."""
+    if workers == 1:
+        init_worker(max_years, cache_dir)
+        return [fuzz_case(case) for case in cases]
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(max_years, cache_dir)) as pool:
+        chunksize = max(1, len(cases) // ((workers or 4) * 8))
+        return list(pool.map(fuzz_case, cases, chunksize=chunksize))
+
+
+def format_report(results: List[Dict], elapsed: float) -> str:
+    failed = [r for r in results if r["failures"]]
+    lines = [f"{len(results)} cases in {elapsed:.1f}s, {len(failed)} failed"]
+    for invariant, count in sorted(Counter(i for r in failed for i in r["failures"]).items()):
+        lines.append(f"  {invariant}: {count} cases")
+    minimal: Dict[Tuple[str, str], Dict] = {}
+    for r in failed:
+        minimal.setdefault((r["invariant"], json.dumps(r["shrunk"], sort_keys=True)), r)
+    for (invariant, shrunk), r in sorted(minimal.items()):
+        lines.append("")
+        lines.append(f"{invariant}: {r['shrunk_failures'][0]}")
+        lines.append(f"  python fuzz_schedule.py --replay '{shrunk}'")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz the scheduler over year ranges and roster variants")
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0, help="seed for making the cases")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--first-year", type=int, default=2000)
+    parser.add_argument("--last-year", type=int, default=2099)
+    parser.add_argument("--max-years", type=int, default=20)
+    parser.add_argument("--variants", type=int, default=8, help="roster variants, the roster itself included")
+    parser.add_argument("--rebalance-rate", type=float, default=0.2)
+    parser.add_argument("--cache-dir", default=None, help="keep rebalanced schedules in a schedule_cache here")
+    parser.add_argument("--replay", default=None, help="run one case, as JSON")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        init_worker(args.max_years, args.cache_dir)
+        failures = run_case(json.loads(args.replay), _fixtures)
+        for invariant, problems in failures.items():
+            for problem in problems:
+                print(f"{invariant}: {problem}")
+        if not failures:
+            print("ok")
+        return 1 if failures else 0
+
+    cases = make_cases(args.cases, args.seed, args.first_year, args.last_year, args.max_years,
+                       args.variants, args.rebalance_rate)
+    started = time.perf_counter()
+    results = run_fuzz(cases, args.workers, args.max_years, args.cache_dir)
+    print(format_report(results, time.perf_counter() - started))
+    return 1 if any(r["failures"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,26 +3,45 @@ Google Calendar service wrapper.
 Implements the CalendarServiceProtocol for dependency injection and testing.
 """
 
-from typing import Dict, Optional
-import time
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import instrumentation
+from rate_limiter import AdaptiveRateLimiter, error_status, is_rate_limit_error
+
+# Calendar API limits: events per list page, calls per batch request
+MAX_LIST_RESULTS = 2500
+MAX_BATCH_SIZE = 50
+
+# a purge only needs IDs, so skip the rest of each event
+PURGE_LIST_FIELDS = "items(id),nextPageToken"
 
 
 class GoogleCalendarService:
     """Wrapper around Google Calendar API - implements CalendarServiceProtocol"""
 
-    def __init__(self, service, rate_limit_delay: float = 0.3):
+    def __init__(self, service, rate_limit_delay: float = 0.3,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
         """
         Initialize the wrapper.
 
         Args:
             service: Google Calendar API service object
-            rate_limit_delay: Delay between API calls to avoid rate limits
+            rate_limit_delay: Starting delay between API calls; the limiter
+                shortens it while calls succeed and backs off on rate limits
+            rate_limiter: Limiter to share with other callers (one is created
+                from rate_limit_delay if omitted)
         """
         self.service = service
         self.rate_limit_delay = rate_limit_delay
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter.from_delay(rate_limit_delay)
 
     def list_events(self, calendar_id: str, time_min: str, time_max: str,
-                   page_token: Optional[str] = None, max_results: int = 100) -> Dict:
+                   page_token: Optional[str] = None, max_results: int = 100,
+                   fields: Optional[str] = None,
+                   private_extended_property: Optional[str] = None,
+                   sync_token: Optional[str] = None) -> Dict:
         """
         List events with pagination support.
 
@@ -32,17 +51,51 @@ class GoogleCalendarService:
             time_max: RFC3339 timestamp for end of time range
             page_token: Token for pagination
             max_results: Maximum number of events to return
+            fields: Partial response selector, e.g. "items(id),nextPageToken"
+            private_extended_property: Only events tagged "name=value", e.g.
+                "winship_year=2027"
+            sync_token: nextSyncToken from an earlier listing, to get only the
+                changes since then (deleted events come back as "cancelled");
+                the other filters must be None
 
         Returns:
             Dictionary containing events and pagination info
         """
-        return self.service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            pageToken=page_token,
-            maxResults=max_results
-        ).execute()
+        instrumentation.count("calendar.list_events")
+        with instrumentation.timer("calendar.list_events"):
+            return self.rate_limiter.execute(self.service.events().list(
+                calendarId=calendar_id,
+                timeMin=time_min,
+                timeMax=time_max,
+                pageToken=page_token,
+                maxResults=max_results,
+                fields=fields,
+                privateExtendedProperty=private_extended_property,
+                syncToken=sync_token
+            ).execute)
+
+    def get_event(self, calendar_id: str, event_id: str) -> Optional[Dict]:
+        """
+        Fetch one event by ID.
+
+        Args:
+            calendar_id: Google Calendar ID
+            event_id: ID of the event
+
+        Returns:
+            Event data, or None if there is no such event
+        """
+        instrumentation.count("calendar.get_event")
+        with instrumentation.timer("calendar.get_event"):
+            try:
+                return self.rate_limiter.execute(self.service.events().get(
+                    calendarId=calendar_id,
+                    eventId=event_id
+                ).execute)
+            except Exception as e:
+                if error_status(e) == 404:
+                    return None
+                raise
 
     def create_event(self, calendar_id: str, event: Dict) -> Dict:
         """
@@ -55,12 +108,12 @@ class GoogleCalendarService:
         Returns:
             Created event data
         """
-        result = self.service.events().insert(
-            calendarId=calendar_id,
-            body=event
-        ).execute()
-        time.sleep(self.rate_limit_delay)
-        return result
+        instrumentation.count("calendar.create_event")
+        with instrumentation.timer("calendar.create_event"):
+            return self.rate_limiter.execute(self.service.events().insert(
+                calendarId=calendar_id,
+                body=event
+            ).execute)
 
     def update_event(self, calendar_id: str, event_id: str, event: Dict) -> Dict:
         """
@@ -74,13 +127,13 @@ class GoogleCalendarService:
         Returns:
             Updated event data
         """
-        result = self.service.events().update(
-            calendarId=calendar_id,
-            eventId=event_id,
-            body=event
-        ).execute()
-        time.sleep(self.rate_limit_delay)
-        return result
+        instrumentation.count("calendar.update_event")
+        with instrumentation.timer("calendar.update_event"):
+            return self.rate_limiter.execute(self.service.events().update(
+                calendarId=calendar_id,
+                eventId=event_id,
+                body=event
+            ).execute)
 
     def delete_event(self, calendar_id: str, event_id: str) -> None:
         """
@@ -90,58 +143,165 @@ class GoogleCalendarService:
             calendar_id: Google Calendar ID
             event_id: ID of event to delete
         """
-        self.service.events().delete(
-            calendarId=calendar_id,
-            eventId=event_id,
-            sendNotifications=False
-        ).execute()
-        time.sleep(self.rate_limit_delay)
+        instrumentation.count("calendar.delete_event")
+        with instrumentation.timer("calendar.delete_event"):
+            self.rate_limiter.execute(self.service.events().delete(
+                calendarId=calendar_id,
+                eventId=event_id,
+                sendNotifications=False
+            ).execute)
 
-    def delete_all_events_for_year(self, calendar_id: str, year: int) -> int:
+    def delete_all_events_for_year(self, calendar_id: str, year: int,
+                                   checkpoint_path: Optional[str] = None) -> int:
         """
         Delete all events in the calendar for a specific year.
 
         Args:
             calendar_id: Google Calendar ID
             year: Year to delete events for
+            checkpoint_path: Where to record progress (see purge_events)
 
         Returns:
             Number of deleted events
         """
         print(f"Deleting all events for {year}...")
+        deleted_count = self.purge_events(
+            calendar_id,
+            time_min=f"{year}-01-01T00:00:00Z",
+            time_max=f"{year + 1}-01-01T00:00:00Z",
+            checkpoint_path=checkpoint_path,
+        )
+        print(f"Deleted {deleted_count} events for {year} ({self.rate_limiter.summary()})")
+        return deleted_count
 
-        # Get all events for the year
-        time_min = f"{year}-01-01T00:00:00Z"
-        time_max = f"{year + 1}-01-01T00:00:00Z"
-
-        deleted_count = 0
+    def list_event_ids(self, calendar_id: str, time_min: Optional[str] = None,
+                       time_max: Optional[str] = None) -> List[str]:
+        """
+        IDs of every event in the range, fetched in the largest pages the API
+        allows with only the id field.
+        """
+        event_ids = []
         page_token = None
-
         while True:
-            events_result = self.list_events(
+            result = self.list_events(
                 calendar_id=calendar_id,
                 time_min=time_min,
                 time_max=time_max,
                 page_token=page_token,
-                max_results=250
+                max_results=MAX_LIST_RESULTS,
+                fields=PURGE_LIST_FIELDS,
             )
+            event_ids.extend(event["id"] for event in result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return event_ids
 
-            events = events_result.get("items", [])
-            if not events:
-                break
+    def delete_events_batch(self, calendar_id: str,
+                            event_ids: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Delete up to MAX_BATCH_SIZE events in one batch HTTP request; Google
+        runs the deletes concurrently.
 
-            for event in events:
-                try:
-                    print(f"  Deleting: {event.get('summary', 'No title')} "
-                          f"({event.get('start', {}).get('date', 'No date')})")
-                    self.delete_event(calendar_id, event["id"])
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"    Error deleting event {event.get('id', 'unknown')}: {e}")
+        Returns:
+            (IDs that hit a rate limit and should be retried,
+             {ID: error} for deletes that failed for any other reason)
+        """
+        rate_limited = []
+        errors = {}
+
+        def callback(request_id, response, exception):
+            if exception is None:
+                return
+            if error_status(exception) in (404, 410):
+                return  # already deleted
+            if is_rate_limit_error(exception):
+                rate_limited.append(request_id)
+            else:
+                errors[request_id] = str(exception)
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for event_id in event_ids:
+            batch.add(
+                self.service.events().delete(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    sendNotifications=False
+                ),
+                request_id=event_id,
+            )
+        instrumentation.count("calendar.delete_batches")
+        with instrumentation.timer("calendar.delete_batch"):
+            self.rate_limiter.execute(batch.execute)
+        return rate_limited, errors
+
+    def purge_events(self, calendar_id: str, time_min: Optional[str] = None,
+                     time_max: Optional[str] = None,
+                     checkpoint_path: Optional[str] = None,
+                     batch_size: int = MAX_BATCH_SIZE) -> int:
+        """
+        Delete every event in the range using batched deletes.
+
+        The event IDs are listed once and written to checkpoint_path, which is
+        rewritten after every batch.  If the purge is interrupted, calling it
+        again with the same arguments picks up the remaining IDs instead of
+        relisting; the checkpoint is removed once the purge completes.
+
+        Returns:
+            Number of deleted events
+        """
+        key = {"calendar_id": calendar_id, "time_min": time_min, "time_max": time_max}
+        state = load_purge_checkpoint(checkpoint_path, key)
+        if state is None:
+            state = dict(key, pending=self.list_event_ids(calendar_id, time_min, time_max),
+                         deleted=0, errors={})
+            save_purge_checkpoint(checkpoint_path, state)
+
+        pending = state["pending"]
+        attempt = 0
+        while pending:
+            chunk = pending[:batch_size]
+            rate_limited, errors = self.delete_events_batch(calendar_id, chunk)
+            retry = set(rate_limited)
+            state["deleted"] += len(chunk) - len(retry) - len(errors)
+            state["errors"].update(errors)
+            # rate-limited deletes go back to the front of the queue
+            pending[:len(chunk)] = [event_id for event_id in chunk if event_id in retry]
+            save_purge_checkpoint(checkpoint_path, state)
+
+            if retry:
+                self.rate_limiter.on_rate_limited()
+                if attempt >= self.rate_limiter.max_retries:
+                    raise RuntimeError(
+                        f"Still rate limited after {attempt} retries; "
+                        f"rerun to resume from {checkpoint_path}"
+                    )
+                self.rate_limiter.sleep(self.rate_limiter.backoff_delay(attempt))
+                attempt += 1
+            else:
+                attempt = 0
+
+        for event_id, error in state["errors"].items():
+            print(f"    Error deleting event {event_id}: {error}")
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return state["deleted"]
+
+
+def load_purge_checkpoint(path: Optional[str], key: Dict) -> Optional[Dict]:
+    """Saved purge state, or None if there is none for this calendar and range."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        state = json.load(f)
+    if any(state.get(name) != value for name, value in key.items()):
+        return None
+    return state
 
-            page_token = events_result.get("nextPageToken")
-            if not page_token:
-                break
 
-        print(f"Deleted {deleted_count} events for {year}")
-        return deleted_count
\ No newline at end of file
+def save_purge_checkpoint(path: Optional[str], state: Dict) -> None:
+    if not path:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Holiday assignment across the whole horizon.
+The rotation in take2 hands out the five holidays by fixed positions in the
+roster's rotation lists, which is only as fair as those lists are; nothing
+stops a share getting the same holiday two years running.  plan_holidays()
+checks and repairs it in one sweep over the years, keeping running counts per
+share and holiday so each year's choice avoids repeats and keeps who has had
+what in line with share size.  A rotation that is already fair comes out
+unchanged.
+
+    python holiday_rotation.py --years 100
+    python holiday_rotation.py --roster proposed.json --years 40 --plan plan.json
+"""
+
+import argparse
+import json
+import math
+from typing import Dict, List, Optional, Tuple
+
+import roster
+import take2
+
+HOLIDAYS = list(take2.HOLIDAY_ROTATION_INDEX)
+
+# how far ahead of its entitlement a share may get a holiday and still keep
+# the rotation's pick; a fair rotation is only even over its whole cycle
+# (the repo's own runs up to 1.5 ahead mid-cycle)
+MAX_AHEAD = 1.5
+
+
+def rotation_plan(start_year: int, num_years: int, share_roster: Optional[roster.Roster] = None) -> Dict[int, Dict[str, str]]:
+    """The {year: {holiday: share}} the existing rotation produces."""
+    share_roster = share_roster or roster.default_roster()
+    return {
+        year: take2.HouseYear(year, roster=share_roster).holiday_shares()
+        for year in range(start_year, start_year + num_years)
+    }
+
+
+def plan_holidays(start_year: int, num_years: int, share_roster: Optional[roster.Roster] = None) -> Dict[int, Dict[str, str]]:
+    """
+    Assign each year's holidays to distinct shares, with no share holding a
+    holiday it held the year before where that can be avoided and every
+    share's count of each holiday kept close to its entitlement (weeks owned /
+    weeks per year, per year).
+
+    Each holiday goes to the share that sorts first by:
+        would repeat last year's holder
+        would get more than MAX_AHEAD ahead of its entitlement
+        isn't who the rotation picks (so a fair rotation is kept as is)
+        would go over its entitlement rounded up
+        held some holiday last year too
+        how far ahead of its entitlement it is
+        position in this year's rotation
+    """
+    share_roster = share_roster or roster.default_roster()
+    shares = list(share_roster.shares)
+    share_ids = {share: s for s, share in enumerate(shares)}
+    entitlement = [w / roster.WEEKS_PER_YEAR for w in share_roster.weeks]
+    counts = [[0] * len(HOLIDAYS) for _ in shares]
+    last_holder = [-1] * len(HOLIDAYS)
+    held_last_year = set()
+
+    plan = {}
+    for n, year in enumerate(range(start_year, start_year + num_years)):
+        house_year = take2.HouseYear(year, roster=share_roster)
+        rotation = house_year.holiday_shares()
+        preference = rotation_preference(house_year.rotated_shares, shares)
+        taken = set()
+        assignment = {}
+        for h, holiday in enumerate(HOLIDAYS):
+            rotation_pick = share_ids.get(rotation.get(holiday))
+            best = None
+            for s in range(len(shares)):
+                if s in taken:
+                    continue
+                due = entitlement[s] * (n + 1)
+                key = (
+                    last_holder[h] == s,
+                    counts[s][h] + 1 - due > MAX_AHEAD + 1e-9,
+                    s != rotation_pick,
+                    counts[s][h] + 1 > math.ceil(due - 1e-9),
+                    s in held_last_year,
+                    counts[s][h] - due,
+                    preference[s],
+                )
+                if best is None or key < best[0]:
+                    best = (key, s)
+            s = best[1]
+            taken.add(s)
+            counts[s][h] += 1
+            last_holder[h] = s
+            assignment[holiday] = shares[s]
+        held_last_year = taken
+        plan[year] = assignment
+    return plan
+
+
+def rotation_preference(rotated_shares: List[str], shares: List[str]) -> List[int]:
+    """Each share's first position in a year's rotated holiday lists (shares
+    not in them sort last)."""
+    position = {}
+    for i, share in enumerate(rotated_shares):
+        position.setdefault(share, i)
+    return [position.get(share, len(rotated_shares)) for share in shares]
+
+
+def repeat_violations(plan: Dict[int, Dict[str, str]]) -> List[Tuple[int, str, str]]:
+    """(year, holiday, share) wherever a share holds a holiday it also held
+    the year before."""
+    violations = []
+    for year in sorted(plan):
+        previous = plan.get(year - 1)
+        if previous is None:
+            continue
+        for holiday, share in plan[year].items():
+            if previous.get(holiday) == share:
+                violations.append((year, holiday, share))
+    return violations
+
+
+def plan_from_schedule(schedule) -> Dict[int, Dict[str, str]]:
+    """The holiday assignment of a generated schedule."""
+    return {
+        house_year.year: {w.holiday: w.share for w in house_year.weeks if w.holiday in HOLIDAYS}
+        for house_year in schedule
+    }
+
+
+def plan_report(plan: Dict[int, Dict[str, str]], share_roster: Optional[roster.Roster] = None) -> Dict:
+    """
+    Summary of a plan:
+        repeats      repeat_violations(plan)
+        counts       {share: {holiday: n}}
+        max_excess   largest gap, over shares and holidays, between a
+                     share's count and its entitlement
+    """
+    share_roster = share_roster or roster.default_roster()
+    counts = {share: {holiday: 0 for holiday in HOLIDAYS} for share in share_roster.shares}
+    for assignment in plan.values():
+        for holiday, share in assignment.items():
+            counts.setdefault(share, {h: 0 for h in HOLIDAYS})[holiday] += 1
+    max_excess = 0.0
+    for share_id, share in enumerate(share_roster.shares):
+        expected = len(plan) * share_roster.weeks[share_id] / roster.WEEKS_PER_YEAR
+        for n in counts[share].values():
+            max_excess = max(max_excess, abs(n - expected))
+    return {"repeats": repeat_violations(plan), "counts": counts, "max_excess": round(max_excess, 2)}
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{len(report['repeats'])} repeats, max excess {report['max_excess']}"]
+    for year, holiday, share in report["repeats"]:
+        lines.append(f"  {year} {holiday}: {share} again")
+    lines.append("")
+    lines.append(f"{'share':<16} " + " ".join(f"{h[:12]:>12}" for h in HOLIDAYS))
+    for share, counts in report["counts"].items():
+        lines.append(f"{share:<16} " + " ".join(f"{counts[h]:>12}" for h in HOLIDAYS))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan holidays across years")
+    parser.add_argument("--roster", default=None, help="roster.json (default: the repo's)")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--plan", default=None, help="write the plan as JSON here")
+    args = parser.parse_args(argv)
+
+    share_roster = roster.load_roster(args.roster) if args.roster else roster.default_roster()
+    print("rotation:")
+    print(format_report(plan_report(rotation_plan(args.start_year, args.years, share_roster), share_roster)))
+    plan = plan_holidays(args.start_year, args.years, share_roster)
+    print("\noptimized:")
+    print(format_report(plan_report(plan, share_roster)))
+    if args.plan:
+        with open(args.plan, "w") as f:
+            json.dump({str(year): assignment for year, assignment in plan.items()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+iCalendar (.ics) export of the schedule.
+Streams VEVENTs built from winship_calendar_core.week_to_event, one year at a
+time, so a 100-year feed is written in one pass without building it in
+memory.  UIDs come from the (year, week index) event IDs, so a subscribed
+client updates events in place when the schedule changes.
+
+    python ics_export.py --start-year 2025 --years 20 -o winship.ics
+"""
+
+import argparse
+import datetime
+import sys
+from typing import Iterable, Iterator, Optional, TextIO
+
+from winship_calendar_core import CalendarEvent, week_to_event
+
+PRODID = "-//Winship House//Schedule//EN"
+UID_DOMAIN = "winship-house"
+CALENDAR_NAME = "Winship House"
+TIMEZONE = "America/New_York"
+
+# RFC 5545 lines are at most 75 octets, continued with CRLF + space
+MAX_LINE_OCTETS = 75
+
+
+def ics_escape(text: str) -> str:
+    r"""Escape a TEXT value.
+
+    >>> ics_escape("Holiday: July 4th; Week type: hot, warm\nSecond line")
+    'Holiday: July 4th\\; Week type: hot\\, warm\\nSecond line'
+    """
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75-octet pieces, never splitting a UTF-8 character.
+
+    >>> fold_line("SUMMARY:" + "x" * 80)
+    'SUMMARY:xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx\\r\\n xxxxxxxxxxxxx'
+    """
+    if len(line) <= MAX_LINE_OCTETS and line.isascii():
+        return line
+    pieces = []
+    current = []
+    size = 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        octets = len(char.encode("utf-8"))
+        if size + octets > limit:
+            pieces.append("".join(current))
+            current = []
+            size = 0
+            # continuation lines start with a space, which counts
+            limit = MAX_LINE_OCTETS - 1
+        current.append(char)
+        size += octets
+    pieces.append("".join(current))
+    return "\r\n ".join(pieces)
+
+
+def format_date(day: datetime.date) -> str:
+    return day.strftime("%Y%m%d")
+
+
+def format_timestamp(moment: datetime.datetime) -> str:
+    return moment.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_uid(event: CalendarEvent) -> str:
+    """Stable UID: the event's schedule-slot ID, or its start date for events
+    that didn't come from a schedule."""
+    slot = event.event_id or f"d{format_date(event.start_date)}"
+    return f"{slot}@{UID_DOMAIN}"
+
+
+def vevent_lines(event: CalendarEvent, dtstamp: str) -> Iterator[str]:
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event_uid(event)}"
+    yield f"DTSTAMP:{dtstamp}"
+    yield f"DTSTART;VALUE=DATE:{format_date(event.start_date)}"
+    yield f"DTEND;VALUE=DATE:{format_date(event.end_date)}"
+    yield fold_line(f"SUMMARY:{ics_escape(event.summary)}")
+    yield fold_line(f"LOCATION:{ics_escape(event.location)}")
+    yield fold_line(f"DESCRIPTION:{ics_escape(event.description)}")
+    yield "TRANSP:TRANSPARENT"
+    yield "END:VEVENT"
+
+
+def schedule_events(schedule: Iterable, week_format: str = "monday-sunday") -> Iterator[CalendarEvent]:
+    """CalendarEvents for every week of every HouseYear, lazily."""
+    for house_year in schedule:
+        for week_index, week in enumerate(house_year.weeks):
+            yield week_to_event(week, week_format, house_year.year, week_index)
+
+
+def iter_ics(events: Iterable[CalendarEvent], calendar_name: str = CALENDAR_NAME,
+             dtstamp: Optional[datetime.datetime] = None) -> Iterator[str]:
+    """The feed as CRLF-terminated chunks, one per calendar component."""
+    stamp = format_timestamp(dtstamp or datetime.datetime.now(datetime.timezone.utc))
+    yield "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        fold_line(f"X-WR-CALNAME:{ics_escape(calendar_name)}"),
+        f"X-WR-TIMEZONE:{TIMEZONE}",
+    ]) + "\r\n"
+    for event in events:
+        yield "\r\n".join(vevent_lines(event, stamp)) + "\r\n"
+    yield "END:VCALENDAR\r\n"
+
+
+def write_ics(schedule: Iterable, stream: TextIO, week_format: str = "monday-sunday",
+              calendar_name: str = CALENDAR_NAME,
+              dtstamp: Optional[datetime.datetime] = None) -> int:
+    """Write the schedule's weeks as an iCalendar feed, returning the number
+    of events written.  Open files with newline="" so CRLFs survive."""
+    count = -2  # header and footer chunks
+    for chunk in iter_ics(schedule_events(schedule, week_format), calendar_name, dtstamp):
+        stream.write(chunk)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the schedule as an iCalendar feed")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--week-format", choices=["monday-sunday", "sunday-saturday"],
+                        default="monday-sunday")
+    parser.add_argument("--no-rebalance", action="store_true",
+                        help="the multi-year take2 schedule without rebalancing")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    import take2
+
+    # generated as a whole so the 5% shares alternate across years
+    schedule = take2.generate_multi_year_schedule(args.start_year, args.years)
+    if not args.no_rebalance:
+        import rebalance2
+
+        schedule = rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+
+    if args.output == "-":
+        count = write_ics(schedule, sys.stdout, args.week_format)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            count = write_ics(schedule, f, args.week_format)
+        print(f"Wrote {count} events to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Opt-in instrumentation for the schedule pipeline.
+Per-phase timers and counters, a summary table and a Chrome trace file
+(open it at chrome://tracing or https://ui.perfetto.dev).
+
+Everything is a no-op until enabled, so the hooks can stay in hot loops:
+
+    import instrumentation
+    instrumentation.enable()
+    ...
+    instrumentation.write_summary()
+    instrumentation.write_trace("trace.json")
+
+Setting WINSHIP_PROFILE=trace.json does the same for any entry point that
+calls enable_from_environment().
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO
+
+PROFILE_ENV_VAR = "WINSHIP_PROFILE"
+
+
+class _NullTimer:
+    """Returned by timer() while disabled; entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """Collects phase timings, counters and trace events."""
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # name -> [calls, total seconds, max seconds]
+        self.timings: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.trace_events: List[Dict] = []
+        self.origin = time.perf_counter()
+
+    def timer(self, name: str):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name: str, start: float, end: float):
+        elapsed = end - start
+        with self.lock:
+            timing = self.timings.setdefault(name, [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += elapsed
+            timing[2] = max(timing[2], elapsed)
+            self.trace_events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary_table(self) -> str:
+        lines = []
+        if self.timings:
+            width = max(len(name) for name in self.timings)
+            lines.append(f"{'phase':<{width}}  {'calls':>8}  {'total ms':>10}  {'mean ms':>10}  {'max ms':>10}")
+            lines.append("-" * (width + 48))
+            for name, (calls, total, longest) in sorted(
+                self.timings.items(), key=lambda item: item[1][1], reverse=True
+            ):
+                lines.append(
+                    f"{name:<{width}}  {calls:>8}  {total * 1e3:>10.2f}  "
+                    f"{total / calls * 1e3:>10.3f}  {longest * 1e3:>10.3f}"
+                )
+        if self.counters:
+            if lines:
+                lines.append("")
+            width = max(len(name) for name in self.counters)
+            lines.append(f"{'counter':<{width}}  {'count':>10}")
+            lines.append("-" * (width + 12))
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<{width}}  {value:>10}")
+        return "\n".join(lines)
+
+    def write_summary(self, stream: Optional[TextIO] = None):
+        print(self.summary_table(), file=stream or sys.stderr)
+
+    def write_trace(self, path: str):
+        with self.lock:
+            events = list(self.trace_events)
+        # counters show up as one final sample each
+        end_ts = (time.perf_counter() - self.origin) * 1e6
+        for name, value in self.counters.items():
+            events.append({"name": name, "ph": "C", "ts": end_ts, "pid": os.getpid(), "args": {name: value}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+PROFILER = Profiler()
+
+
+def enable():
+    PROFILER.reset()
+    PROFILER.enabled = True
+
+
+def disable():
+    PROFILER.enabled = False
+
+
+def is_enabled() -> bool:
+    return PROFILER.enabled
+
+
+def timer(name: str):
+    """Context manager timing a phase; `with timer("compute_schedule"): ...`"""
+    return PROFILER.timer(name)
+
+
+def count(name: str, n: int = 1):
+    PROFILER.count(name, n)
+
+
+def write_summary(stream: Optional[TextIO] = None):
+    PROFILER.write_summary(stream)
+
+
+def write_trace(path: str):
+    PROFILER.write_trace(path)
+
+
+def enable_from_environment():
+    """Enable instrumentation if WINSHIP_PROFILE is set, printing the summary
+    to stderr and writing the trace to that path when the process exits."""
+    trace_path = os.environ.get(PROFILE_ENV_VAR)
+    if not trace_path:
+        return
+    enable()
+
+    def _report():
+        write_summary()
+        write_trace(trace_path)
+        print(f"Wrote trace to {trace_path}", file=sys.stderr)
+
+    atexit.register(_report)
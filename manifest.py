@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Reproducible schedule runs.
+run_schedule() generates (and by default rebalances) a schedule from an
+explicit seed and returns it with a manifest recording everything needed to
+make it again: the seed, a hash of the roster, the algorithm version and a
+digest of the scheduling code, the rebalancer's pass and swap counts, and a
+checksum of the output.  verify_manifest() re-runs it serially and checks the
+result is bit-identical, so a cached or process-pool result can be trusted.
+
+    python manifest.py --years 20 --seed 7 -o manifest.json
+    python manifest.py --verify manifest.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import rebalance2
+import roster
+import take2
+
+MANIFEST_VERSION = 1
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# bump when a change to the scheduling code is meant to change its output
+ALGORITHM_VERSION = "take2-rebalance2/3"
+
+# the modules whose code decides the schedule
+ALGORITHM_MODULES = [
+    "date_finders.py",
+    "roster.py",
+    "take2.py",
+    "rebalance2.py",
+    "spacing_index.py",
+    "week_masks.py",
+]
+
+
+def roster_hash(share_roster: roster.Roster) -> str:
+    """sha256 of the roster's canonical JSON."""
+    canonical = json.dumps(share_roster.to_dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def algorithm_digest() -> str:
+    """sha256 over the source of ALGORITHM_MODULES."""
+    digest = hashlib.sha256()
+    for name in ALGORITHM_MODULES:
+        digest.update(name.encode())
+        with open(os.path.join(REPO_DIR, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def relative_roster_path(path: Optional[str]) -> Optional[str]:
+    """path relative to the repo, so a manifest verifies in another checkout."""
+    return os.path.relpath(path, REPO_DIR) if path else None
+
+
+def manifest_roster(path: Optional[str]) -> roster.Roster:
+    """The roster a manifest names, or the default roster when it names none
+    or the file isn't here; verify_manifest's hash check catches a mismatch."""
+    if path:
+        path = os.path.join(REPO_DIR, path)
+        if os.path.exists(path):
+            return roster.load_roster(path)
+    return roster.default_roster()
+
+
+def schedule_checksum(schedule) -> str:
+    """sha256 over every week's year, index, start, kind, holiday and share."""
+    digest = hashlib.sha256()
+    for house_year in schedule:
+        for w_idx, week in enumerate(house_year.weeks):
+            digest.update(
+                f"{house_year.year},{w_idx},{week.start.isoformat()},{week.kind},"
+                f"{week.holiday or ''},{week.share or ''}\n".encode()
+            )
+    return digest.hexdigest()
+
+
+def make_manifest(
+    schedule,
+    start_year: int,
+    num_years: int,
+    share_roster: roster.Roster,
+    seed: Optional[int] = None,
+    rebalance: bool = True,
+    stats: Optional[Dict] = None,
+) -> Dict:
+    """The manifest for a schedule made with these arguments; stats are
+    rebalance_global's pass and swap counts."""
+    stats = stats or {}
+    return {
+        "manifest_version": MANIFEST_VERSION,
+        "algorithm_version": ALGORITHM_VERSION,
+        "algorithm_digest": algorithm_digest(),
+        "start_year": start_year,
+        "num_years": num_years,
+        "seed": seed,
+        "rebalance": rebalance,
+        "roster_hash": roster_hash(share_roster),
+        "roster_path": relative_roster_path(share_roster.path),
+        "passes": stats.get("passes", 0),
+        "swaps": stats.get("swaps", 0),
+        "checksum": schedule_checksum(schedule),
+    }
+
+
+def run_schedule(
+    start_year: int = 2025,
+    num_years: int = 20,
+    share_roster: Optional[roster.Roster] = None,
+    seed: Optional[int] = None,
+    rebalance: bool = True,
+) -> Tuple[List, Dict]:
+    """
+    Generate a schedule, rebalance it with the seed, and return
+    (schedule, manifest).  Generation itself is deterministic and uses no
+    randomness; the seed only breaks the rebalancer's ties (see
+    rebalance2.rebalance_global), and None keeps its canonical order.
+    """
+    share_roster = share_roster or roster.default_roster()
+    schedule = take2.generate_multi_year_schedule(start_year, num_years, roster=share_roster)
+    stats = {}
+    if rebalance:
+        schedule = rebalance2.rebalance_global(schedule, share_roster.owner_percent, seed=seed, stats=stats)
+    return schedule, make_manifest(schedule, start_year, num_years, share_roster, seed, rebalance, stats)
+
+
+def verify_manifest(manifest: Dict, schedule=None, share_roster: Optional[roster.Roster] = None) -> List[str]:
+    """
+    Check a manifest against this code, the roster and (if given) a schedule
+    claimed to come from it, then re-run the schedule serially and compare.
+    Returns a list of problems, empty when everything matches.
+    """
+    problems = []
+    if share_roster is None:
+        share_roster = manifest_roster(manifest.get("roster_path"))
+    if roster_hash(share_roster) != manifest["roster_hash"]:
+        problems.append("roster differs from the one the manifest was made with")
+    if manifest["algorithm_version"] != ALGORITHM_VERSION:
+        problems.append(
+            f"algorithm version {manifest['algorithm_version']} != current {ALGORITHM_VERSION}"
+        )
+    elif manifest["algorithm_digest"] != algorithm_digest():
+        problems.append("scheduling code has changed since the manifest was made")
+    if schedule is not None and schedule_checksum(schedule) != manifest["checksum"]:
+        problems.append("schedule checksum does not match the manifest")
+
+    _, rerun = run_schedule(
+        manifest["start_year"], manifest["num_years"], share_roster, manifest["seed"], manifest["rebalance"]
+    )
+    for key in ("passes", "swaps", "checksum"):
+        if rerun[key] != manifest[key]:
+            problems.append(f"serial re-run gives {key} {rerun[key]}, manifest has {manifest[key]}")
+    return problems
+
+
+def write_manifest(manifest: Dict, path: str):
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def load_manifest(path: str) -> Dict:
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("manifest_version") != MANIFEST_VERSION:
+        raise ValueError(f"{path}: unsupported manifest version {manifest.get('manifest_version')}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Make or verify a reproducible schedule run")
+    parser.add_argument("--roster", default=None, help="roster.json (default: the repo's)")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-rebalance", action="store_true")
+    parser.add_argument("-o", "--output", default="manifest.json")
+    parser.add_argument("--verify", metavar="MANIFEST", default=None, help="re-run and check a manifest")
+    args = parser.parse_args(argv)
+
+    share_roster = roster.load_roster(args.roster) if args.roster else None
+    if args.verify:
+        problems = verify_manifest(load_manifest(args.verify), share_roster=share_roster)
+        for problem in problems:
+            print(problem)
+        print("reproduced" if not problems else "NOT reproduced")
+        return 1 if problems else 0
+
+    _, manifest = run_schedule(args.start_year, args.years, share_roster, args.seed, not args.no_rebalance)
+    write_manifest(manifest, args.output)
+    print(f"Wrote {args.output}: checksum {manifest['checksum'][:12]}, {manifest['swaps']} swaps")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Per-owner views of the schedule.
+OwnerIndex walks the schedule once and keeps each share's (year, week index,
+week) entries in order, so a report, an ICS feed or an Excel sheet for one
+owner reads that owner's list instead of rescanning every year.
+
+    python owner_index.py eddie
+    python owner_index.py eddie --year 2031 --ics eddie.ics
+"""
+
+import argparse
+import sys
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+import roster
+from winship_calendar_core import CalendarEvent, week_to_event
+
+# (year, week index, AllocatedWeek)
+OwnerWeek = Tuple[int, int, object]
+
+
+class OwnerIndex:
+    def __init__(self, schedule):
+        self.weeks: Dict[str, List[OwnerWeek]] = {}
+        self.by_year: Dict[str, Dict[int, List[OwnerWeek]]] = {}
+        self.years: List[int] = []
+        for house_year in schedule:
+            self.years.append(house_year.year)
+            for week_index, week in enumerate(house_year.weeks):
+                entry = (house_year.year, week_index, week)
+                self.weeks.setdefault(week.share, []).append(entry)
+                self.by_year.setdefault(week.share, {}).setdefault(house_year.year, []).append(entry)
+
+    def shares(self) -> List[str]:
+        return sorted(share for share in self.weeks if share and share != "everyone")
+
+    def weeks_of(self, share: str, year: Optional[int] = None) -> List[OwnerWeek]:
+        """The share's weeks in schedule order, only year's if given."""
+        if year is None:
+            return self.weeks.get(share, [])
+        return self.by_year.get(share, {}).get(year, [])
+
+    def kind_counts(self, share: str) -> Counter:
+        return Counter(week.kind for _, _, week in self.weeks_of(share))
+
+    def holiday_counts(self, share: str) -> Counter:
+        return Counter(week.holiday for _, _, week in self.weeks_of(share) if week.holiday)
+
+    def events(self, share: str, week_format: str = "monday-sunday",
+               year: Optional[int] = None) -> Iterator[CalendarEvent]:
+        """CalendarEvents for the share's weeks, with the same IDs as in the
+        full feed."""
+        for y, week_index, week in self.weeks_of(share, year):
+            yield week_to_event(week, week_format, y, week_index)
+
+
+def format_owner_report(index: OwnerIndex, share: str, share_roster: Optional[roster.Roster] = None,
+                        year: Optional[int] = None) -> str:
+    share_roster = share_roster or roster.default_roster()
+    weeks = index.weeks_of(share, year)
+    span = f"{year}" if year is not None else f"{index.years[0]}-{index.years[-1]}"
+    lines = [f"{share_roster.display_name(share)}: {len(weeks)} weeks in {span}"]
+    if year is None:
+        kinds = index.kind_counts(share)
+        lines.append("  " + ", ".join(f"{kind} {kinds[kind]}" for kind in ("hot", "warm", "cool", "cold")))
+        holidays = index.holiday_counts(share)
+        if holidays:
+            lines.append("  " + ", ".join(f"{h} {n}" for h, n in sorted(holidays.items())))
+    current = None
+    for y, week_index, week in weeks:
+        if y != current:
+            current = y
+            lines.append("")
+            lines.append(str(y))
+        holiday = f" ({week.holiday})" if week.holiday else ""
+        lines.append(f"\t{week.start.strftime('%A, %x')} - {week.kind} (week {week_index + 1}){holiday}")
+    return "\n".join(lines)
+
+
+def write_owner_ics(index: OwnerIndex, share: str, stream: TextIO, week_format: str = "monday-sunday",
+                    share_roster: Optional[roster.Roster] = None, year: Optional[int] = None) -> int:
+    """Write one owner's weeks as an iCalendar feed, returning the number of
+    events written."""
+    from ics_export import CALENDAR_NAME, iter_ics
+
+    share_roster = share_roster or roster.default_roster()
+    name = f"{CALENDAR_NAME}: {share_roster.display_name(share)}"
+    count = -2  # header and footer chunks
+    for chunk in iter_ics(index.events(share, week_format, year), name):
+        stream.write(chunk)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="One owner's weeks")
+    parser.add_argument("share", nargs="?", help="share id (default: every share)")
+    parser.add_argument("--year", type=int, default=None)
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--ics", default=None, help="write the share's weeks as an iCalendar feed")
+    parser.add_argument("--xlsx", default=None, help="write a workbook with a sheet per owner")
+    args = parser.parse_args(argv)
+
+    import schedule_cache
+
+    schedule, _ = schedule_cache.load_schedule(
+        args.start_year, args.years, cache=schedule_cache.ScheduleCache()
+    )
+    index = OwnerIndex(schedule)
+    shares = [args.share] if args.share else index.shares()
+    for share in shares:
+        if share not in index.weeks:
+            print(f"No share {share!r}", file=sys.stderr)
+            return 1
+        print(format_owner_report(index, share, year=args.year))
+        print("-" * 80)
+    if args.ics:
+        if not args.share:
+            parser.error("--ics needs a share")
+        with open(args.ics, "w", newline="", encoding="utf-8") as f:
+            count = write_owner_ics(index, args.share, f, year=args.year)
+        print(f"Wrote {count} events to {args.ics}", file=sys.stderr)
+    if args.xlsx:
+        import export_to_excel
+
+        export_to_excel.export_owner_sheets(args.xlsx, index, shares)
+        print(f"Wrote {args.xlsx}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
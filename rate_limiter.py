@@ -0,0 +1,173 @@
+"""
+Adaptive rate limiting for Google Calendar calls.
+An AIMD limiter: the request rate climbs additively while calls succeed and is
+cut multiplicatively on a rate-limit error, which is retried with jittered
+exponential backoff.  One limiter is shared by every calendar operation so
+creates, updates, lists and deletes all draw on the same budget.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import instrumentation
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of an API error from either client, None for other errors."""
+    if hasattr(error, "status"):
+        return error.status
+    # googleapiclient.errors.HttpError keeps the httplib2 response in .resp
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return int(status) if status is not None else None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for quota errors from either client: a 429, or a 403 whose reason
+    is one of RATE_LIMIT_REASONS (a plain 403 is a permissions problem)."""
+    if hasattr(error, "is_rate_limit"):
+        return error.is_rate_limit
+    # the async client (and asyncio with it) is only imported when an error
+    # from the other client needs its reason parsed
+    from async_calendar_client import RATE_LIMIT_REASONS, error_reason
+
+    status = error_status(error)
+    if status == 429:
+        return True
+    return status == 403 and error_reason(getattr(error, "content", b"")) in RATE_LIMIT_REASONS
+
+
+class AdaptiveRateLimiter:
+    """Additive-increase/multiplicative-decrease request pacing.
+
+    Args:
+        rate: starting requests per second
+        min_rate, max_rate: bounds for the adapted rate
+        increase: requests/second added after each success
+        decrease: factor the rate is multiplied by after a rate-limit error
+        max_retries: rate-limit retries per call before the error is raised
+        backoff_base, backoff_max: retry delay is uniform(0, min(max, base * 2**attempt))
+        clock, sleep, rng: injectable for tests
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        max_retries: int = 6,
+        backoff_base: float = 1.0,
+        backoff_max: float = 32.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.lock = threading.Lock()
+        self.next_time = clock()
+        self.started = self.next_time
+        self.successes = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.waited = 0.0
+
+    @classmethod
+    def from_delay(cls, delay: float, **kwargs) -> "AdaptiveRateLimiter":
+        """Limiter starting at one call per `delay` seconds (0 starts at max_rate)."""
+        max_rate = kwargs.get("max_rate", 20.0)
+        return cls(rate=1.0 / delay if delay > 0 else max_rate, **kwargs)
+
+    def _reserve(self) -> float:
+        """Claim the next send slot, returning how long to wait for it."""
+        with self.lock:
+            now = self.clock()
+            slot = max(now, self.next_time)
+            self.next_time = slot + 1.0 / self.rate
+            wait = slot - now
+            self.waited += wait
+            return wait
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    async def acquire_async(self):
+        import asyncio
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self.lock:
+            self.successes += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self):
+        with self.lock:
+            self.rate_limited += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        instrumentation.count("calendar.rate_limited")
+
+    def backoff_delay(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def execute(self, call: Callable[[], object]):
+        """Run call() once a slot is free, retrying rate-limit errors with
+        backoff.  Other errors are raised immediately."""
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.on_rate_limited()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                with self.lock:
+                    self.retries += 1
+                instrumentation.count("calendar.retries")
+                self.sleep(delay)
+                continue
+            self.on_success()
+            return result
+
+    def metrics(self) -> Dict[str, float]:
+        """Throughput and retry counters since the limiter was created."""
+        with self.lock:
+            elapsed = self.clock() - self.started
+            return {
+                "rate": round(self.rate, 3),
+                "successes": self.successes,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries,
+                "waited_seconds": round(self.waited, 3),
+                "elapsed_seconds": round(elapsed, 3),
+                "throughput": round(self.successes / elapsed, 3) if elapsed > 0 else 0.0,
+            }
+
+    def summary(self) -> str:
+        m = self.metrics()
+        return (
+            f"{m['successes']} calls in {m['elapsed_seconds']:.1f}s "
+            f"({m['throughput']:.2f}/s), {m['rate_limited']} rate limited, "
+            f"{m['retries']} retries, now {m['rate']:.2f}/s"
+        )
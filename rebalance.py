@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import datetime
 
+import roster
 import take2
 from date_finders import holiday_to_emoji
 
@@ -277,25 +278,7 @@ def try_swap(schedule, s, w_give, w_get, owner_percent, recent_swaps):
 # owner_percent: dictionary of share -> percentage (5 or 10)
 # new_schedule = rebalance_global(schedule, owner_percent)
 
-owner_percent = {
-    # 10% owners
-    "frank_may": 10,
-    "hankey": 10,
-    "eddie": 10,
-    "richard": 10,
-    "frank_latimer": 10,
-    # 5% owners
-    "joe": 5,
-    "lane": 5,
-    "hayley": 5,
-    "david": 5,
-    "jim": 5,
-    "myers": 5,
-    "jordan": 5,
-    "becca": 5,
-    "hugh": 5,
-    "will": 5,
-}
+owner_percent = roster.default_roster().owner_percent
 
 
 def share_name_to_printable(share_name):
@@ -1,6 +1,16 @@
 #!/usr/bin/env python3
 
+import copy
 import logging
+import random
+
+import instrumentation
+import roster
+from fairness import FairnessMetrics
+from season_layout import SEASON_WEEKS
+from take2 import MIN_TEN_PERCENT_SPACING
+from week_masks import ScheduleMasks, bit, well_spaced
+
 
 def count_weeks_by_share_global(schedule):
     """
@@ -36,7 +46,7 @@ def check_10_percent_spacing_in_year(year, owner_percent):
         if owner_percent.get(s, 0) == 10:
             positions.sort()
             for i in range(len(positions)-1):
-                if positions[i+1] - positions[i] < 8:
+                if positions[i+1] - positions[i] < MIN_TEN_PERCENT_SPACING:
                     return False
     return True
 
@@ -46,31 +56,37 @@ def allowed_week_difference(s1, s2, owner_percent):
         return 1
     return 10
 
-def compute_ideal_allocation(owner_percent):
+def compute_ideal_allocation(owner_percent, num_years=20):
+    """
+    {share: {week_index: count}}: how often each share should hold each week
+    index over num_years.  A share's weeks per year spread evenly over the
+    year's weeks, so over 20 years a 10% share should hold each index twice
+    and a 5% share once; other horizons can give fractional counts.  Every
+    index of the season (SEASON_WEEKS, Tate Annual's included) gets a target.
+    """
     ideal_allocation = {}
-    # For the entire 20-year horizon:
-    # - 10% owners: ideally 2 occurrences per week index total over 20 years
-    # - 5% owners: ideally 1 occurrence per week index total over 20 years
     for share, pct in owner_percent.items():
-        if pct == 10:
-            target = 2
-        elif pct == 5:
-            target = 1
-        else:
+        if pct not in roster.WEEKS_PER_PERCENT:
             raise ValueError("Unexpected owner percentage.")
-        ideal_allocation[share] = {w: target for w in range(40)}
+        target = roster.WEEKS_PER_PERCENT[pct] * num_years / roster.WEEKS_PER_YEAR
+        if target == int(target):
+            target = int(target)
+        ideal_allocation[share] = {w: target for w in range(SEASON_WEEKS)}
     return ideal_allocation
 
-def find_global_imbalance(surplus_deficit):
+def find_global_imbalance(surplus_deficit, rng=None):
     """
     Given surplus_deficit {share: {week_index: diff}}, find a list of (share, week_index, diff) 
-    sorted by the magnitude of imbalance.
+    sorted by the magnitude of imbalance.  Equal magnitudes stay in share and
+    week order unless rng (a seeded random.Random) shuffles them.
     """
     imbalances = []
     for s, sd in surplus_deficit.items():
         for w, d in sd.items():
             if d != 0:
                 imbalances.append((s, w, d))
+    if rng is not None:
+        rng.shuffle(imbalances)
     # sort by absolute imbalance, descending
     imbalances.sort(key=lambda x: abs(x[2]), reverse=True)
     return imbalances
@@ -126,48 +142,104 @@ def attempt_swap_for_global_imbalance(schedule, owner_percent, surplus_deficit,
     return improved
 
 
-def rebalance_global(schedule, owner_percent):
-    ideal_allocation = compute_ideal_allocation(owner_percent)
+def add_counts(history_counts, current_counts):
+    """Sum two {share: {week_index: count}} tables into a new one."""
+    total = {share: dict(counts) for share, counts in history_counts.items()}
+    for share, counts in current_counts.items():
+        share_total = total.setdefault(share, {})
+        for w_idx, count in counts.items():
+            share_total[w_idx] = share_total.get(w_idx, 0) + count
+    return total
+
+
+def rebalance_global(schedule, owner_percent, pinned_before=None, seed=None, stats=None):
+    """
+    Swap weeks between shares until every share holds each week index as
+    close to its ideal count (compute_ideal_allocation over every year of
+    schedule) as we can get.
+
+    Years before pinned_before are left untouched; their counts are fixed
+    history in the ledger and only later years are re-optimized.
+
+    With seed None, ties between equally imbalanced week indices are broken
+    by share and week order; a seed breaks them with random.Random(seed)
+    instead, so different seeds explore different (reproducible) outcomes.
+    A swap is only made if it lowers the fairness objective
+    (fairness.FairnessMetrics.objective) of the whole schedule.
+    stats, if given, gets the pass and swap counts and the final objective.
+    """
+    ideal_allocation = compute_ideal_allocation(owner_percent, len(schedule))
     max_passes = 5000
     improved = True
     pass_count = 0
 
+    if pinned_before is None:
+        history, active = [], schedule
+    else:
+        history = [year for year in schedule if year.year < pinned_before]
+        active = [year for year in schedule if year.year >= pinned_before]
+    # pinned years never change, so count them once
+    history_counts = count_weeks_by_share_global(history)
+
     # Keep track of recent swaps (using a set of tuples)
     recent_swaps = set()
+    masks = ScheduleMasks(active)
+    metrics = FairnessMetrics(schedule)
+    rng = random.Random(seed) if seed is not None else None
+    swaps = 0
+
+    with instrumentation.timer("rebalance_global"):
+        while improved and pass_count < max_passes:
+            pass_count += 1
+            improved = False
+            with instrumentation.timer("rebalance_pass"):
+                improved = rebalance_pass(
+                    active, owner_percent, ideal_allocation, history_counts, recent_swaps, masks, rng, metrics
+                )
+            if improved:
+                swaps += 1
+    instrumentation.count("rebalance.passes", pass_count)
+    if stats is not None:
+        stats.update({"passes": pass_count, "swaps": swaps, "objective": metrics.objective()})
 
-    while improved and pass_count < max_passes:
-        pass_count += 1
-        improved = False
-
-        # Compute global surplus/deficit
-        current_counts = count_weeks_by_share_global(schedule)
-        surplus_deficit = {}
-        for share in ideal_allocation:
-            surplus_deficit[share] = {}
-            for w_idx in range(40):
-                current = current_counts.get(share, {}).get(w_idx, 0)
-                ideal = ideal_allocation[share][w_idx]
-                surplus_deficit[share][w_idx] = current - ideal
-
-        imbalances = find_global_imbalance(surplus_deficit)
-        if not imbalances:
-            # Perfect distribution globally
-            break
-
-        for (s, w_idx, diff) in imbalances:
-            if diff == 0:
-                continue
+    return schedule
 
-            # Attempt to fix this imbalance
-            # Modify attempt_swap_for_global_imbalance to take recent_swaps as a parameter
-            if attempt_swap_for_global_imbalance(schedule, owner_percent, surplus_deficit, s, w_idx, diff, ideal_allocation, recent_swaps):
-                improved = True
-                # Break to re-check surpluses after a single improvement
-                break
 
-    return schedule
+def rebalance_pass(
+    active, owner_percent, ideal_allocation, history_counts, recent_swaps, masks=None, rng=None, metrics=None
+):
+    """One rebalancing pass: make the single best swap we can find.
+    Returns True if a swap was made."""
+    # Compute global surplus/deficit
+    current_counts = add_counts(history_counts, count_weeks_by_share_global(active))
+    surplus_deficit = {}
+    for share, ideal_counts in ideal_allocation.items():
+        surplus_deficit[share] = {}
+        for w_idx, ideal in ideal_counts.items():
+            current = current_counts.get(share, {}).get(w_idx, 0)
+            surplus_deficit[share][w_idx] = current - ideal
+
+    imbalances = find_global_imbalance(surplus_deficit, rng)
+    if not imbalances:
+        # Perfect distribution globally
+        return False
+
+    for (s, w_idx, diff) in imbalances:
+        if diff == 0:
+            continue
+
+        # Attempt to fix this imbalance
+        if attempt_swap_for_global_imbalance(
+            active, owner_percent, surplus_deficit, s, w_idx, diff, ideal_allocation, recent_swaps, masks, metrics
+        ):
+            # Stop to re-check surpluses after a single improvement
+            return True
+
+    return False
 
-def attempt_swap_for_global_imbalance(schedule, owner_percent, surplus_deficit, s, w_idx, diff, ideal_allocation, recent_swaps):
+def attempt_swap_for_global_imbalance(
+    schedule, owner_percent, surplus_deficit, s, w_idx, diff, ideal_allocation, recent_swaps, masks=None, metrics=None
+):
     s_deficit = [(w, -d) for w, d in surplus_deficit[s].items() if d < 0]
     s_surplus = [(w, d) for w, d in surplus_deficit[s].items() if d > 0]
 
@@ -177,7 +249,7 @@ def attempt_swap_for_global_imbalance(schedule, owner_percent, surplus_deficit,
         for (w_need, needed_amount) in s_deficit:
             if needed_amount <= 0:
                 continue
-            if try_swap(schedule, s, w_idx, w_need, owner_percent, recent_swaps):
+            if try_swap(schedule, s, w_idx, w_need, owner_percent, recent_swaps, masks, metrics):
                 return True
     else:
         # Deficit at w_idx, need a surplus
@@ -185,81 +257,150 @@ def attempt_swap_for_global_imbalance(schedule, owner_percent, surplus_deficit,
         for (w_have, have_amount) in s_surplus:
             if have_amount <= 0:
                 continue
-            if try_swap(schedule, s, w_have, w_idx, owner_percent, recent_swaps):
+            if try_swap(schedule, s, w_have, w_idx, owner_percent, recent_swaps, masks, metrics):
                 return True
 
     return False
 
-def try_swap(schedule, s, w_give, w_get, owner_percent, recent_swaps):
-    for y_idx, year in enumerate(schedule):
+def try_swap(schedule, s, w_give, w_get, owner_percent, recent_swaps, masks=None, metrics=None):
+    """Swap s's week w_give for another share's w_get in the first year where
+    that's allowed.  masks (ScheduleMasks of schedule), when given, picks the
+    candidate years and checks spacing with bit operations, and is kept up
+    to date.  metrics (fairness.FairnessMetrics of the whole schedule), when
+    given, turns down swaps that don't lower its objective, and is kept up
+    to date too."""
+    count = instrumentation.count
+    if masks is not None:
+        years = masks.swap_years(s, w_give, w_get)
+    else:
+        years = range(len(schedule))
+    for y_idx in years:
+        year = schedule[y_idx]
         if w_give < len(year.weeks) and w_get < len(year.weeks):
             caw = year.weeks[w_give]
             aw2 = year.weeks[w_get]
             if (caw.share == s and caw.holiday is None and
                 aw2.share != s and aw2.holiday is None and
                 aw2.kind == caw.kind):
+                count("swap.attempts")
 
                 # Compute circular difference
                 raw_diff = abs(w_give - w_get)
-                circular_diff = min(raw_diff, 40 - raw_diff)
+                circular_diff = min(raw_diff, len(year.weeks) - raw_diff)
 
                 diff_limit = allowed_week_difference(s, aw2.share, owner_percent)
-                if circular_diff <= diff_limit:
-                    # Check if we recently did this swap (or its inverse)
-                    swap_key = (y_idx, w_give, w_get, caw.share, aw2.share)
-                    inverse_swap_key = (y_idx, w_get, w_give, aw2.share, caw.share)
-                    if swap_key in recent_swaps or inverse_swap_key in recent_swaps:
-                        # Already tried this swap recently
-                        continue
-
-                    # Only swap the share attributes
-                    original_share_give = year.weeks[w_give].share
-                    original_share_get = year.weeks[w_get].share
-
-                    # Perform the share swap
-                    year.weeks[w_give].share = aw2.share
-                    year.weeks[w_get].share = s
-
-                    # Check spacing for 10% shares
-                    if check_10_percent_spacing_in_year(year, owner_percent):
-                        logging.debug(f"Swapping shares in year {y_idx}:\n"
-                                     f"  Week {w_give}: {caw} now owned by {aw2.share}\n"
-                                     f"  Week {w_get}: {aw2} now owned by {s}\n")
-
-                        # Record this swap so we don't undo it immediately
-                        recent_swaps.add(swap_key)
-                        return True
-                    else:
-                        # Revert if spacing check fails
-                        year.weeks[w_give].share = original_share_give
-                        year.weeks[w_get].share = original_share_get
+                if circular_diff > diff_limit:
+                    count("swap.rejected.distance")
+                    continue
+
+                # Check if we recently did this swap (or its inverse)
+                swap_key = (y_idx, w_give, w_get, caw.share, aw2.share)
+                inverse_swap_key = (y_idx, w_get, w_give, aw2.share, caw.share)
+                if swap_key in recent_swaps or inverse_swap_key in recent_swaps:
+                    # Already tried this swap recently
+                    count("swap.rejected.recent")
+                    continue
+
+                if metrics is not None and metrics.swap_delta(s, w_give, aw2.share, w_get) >= 0:
+                    count("swap.rejected.objective")
+                    continue
+
+                # Only swap the share attributes
+                original_share_give = year.weeks[w_give].share
+                original_share_get = year.weeks[w_get].share
+
+                # Perform the share swap
+                year.weeks[w_give].share = aw2.share
+                year.weeks[w_get].share = s
+
+                # Check spacing for 10% shares
+                if masks is not None:
+                    year_masks = masks.years[y_idx]
+                    spaced = all(
+                        well_spaced((year_masks.held(share) & ~bit(old)) | bit(new), MIN_TEN_PERCENT_SPACING)
+                        for share, old, new in ((s, w_give, w_get), (original_share_get, w_get, w_give))
+                        if owner_percent.get(share) == 10
+                    )
+                else:
+                    spaced = check_10_percent_spacing_in_year(year, owner_percent)
+                if spaced:
+                    logging.debug("Swapping shares in year %s:\n"
+                                  "  Week %s: %s now owned by %s\n"
+                                  "  Week %s: %s now owned by %s\n",
+                                  y_idx, w_give, caw, aw2.share, w_get, aw2, s)
+                    count("swap.accepted")
+
+                    # Record this swap so we don't undo it immediately
+                    recent_swaps.add(swap_key)
+                    if masks is not None:
+                        masks.move(y_idx, s, w_give, w_get)
+                        masks.move(y_idx, original_share_get, w_get, w_give)
+                    if metrics is not None:
+                        metrics.apply_swap(s, w_give, original_share_get, w_get)
+                    return True
+                else:
+                    # Revert if spacing check fails
+                    count("swap.rejected.spacing")
+                    year.weeks[w_give].share = original_share_give
+                    year.weeks[w_get].share = original_share_get
     return False
 
+def reschedule_from(schedule, cutoff_year, owner_percent=None, share_roster=None, regenerate=False, seed=None):
+    """
+    Re-optimize only the years from cutoff_year onward, keeping every earlier
+    (already published) year exactly as it is.
+
+    By default the later years start from their current assignments, so a
+    traded or sold week only moves what it has to.  Pass regenerate=True (and
+    the new share_roster) when the roster itself changed and the later years
+    need to be built again from scratch.
+
+    Returns a new list of HouseYears; the input schedule is not modified.
+    """
+    import take2
+
+    share_roster = share_roster or roster.default_roster()
+    if owner_percent is None:
+        owner_percent = share_roster.owner_percent
+
+    new_schedule = []
+    for house_year in schedule:
+        if house_year.year < cutoff_year:
+            new_schedule.append(house_year)
+        elif regenerate:
+            previous_year = new_schedule[-1] if new_schedule else None
+            new_schedule.append(
+                take2.generate_following_year(house_year.year, previous_year, share_roster)
+            )
+        else:
+            new_schedule.append(copy.deepcopy(house_year))
+
+    return rebalance_global(new_schedule, owner_percent, pinned_before=cutoff_year, seed=seed)
+
+
+def schedule_churn(old_schedule, new_schedule):
+    """
+    List the weeks whose share changed between two schedules, as
+    (year, week_index, old_share, new_share).
+    """
+    old_years = {house_year.year: house_year for house_year in old_schedule}
+    changes = []
+    for house_year in new_schedule:
+        old_year = old_years.get(house_year.year)
+        if old_year is None:
+            continue
+        for w_idx, (old_week, new_week) in enumerate(zip(old_year.weeks, house_year.weeks)):
+            if old_week.share != new_week.share:
+                changes.append((house_year.year, w_idx, old_week.share, new_week.share))
+    return changes
+
+
 # Example usage:
 # schedule: list of HouseYear instances (20 years)
 # owner_percent: dictionary of share -> percentage (5 or 10)
 # new_schedule = rebalance_global(schedule, owner_percent)
 
-owner_percent = {
-    # 10% owners
-    "frank_may": 10,
-    "hankey": 10,
-    "eddie": 10,
-    "richard": 10,
-    "frank_latimer": 10,
-    
-    # 5% owners
-    "joe": 5,
-    "lane": 5,
-    "hayley": 5,
-    "david": 5,
-    "jim": 5,
-    "myers": 5,
-    "jordan": 5,
-    "becca": 5,
-    "hugh": 5,
-    "will": 5
-}
+owner_percent = roster.default_roster().owner_percent
 
 if __name__ == "__main__":
     import take2
@@ -267,6 +408,7 @@ if __name__ == "__main__":
     
     # Set logging level to INFO to suppress debug messages
     logging.basicConfig(level=logging.INFO)
+    instrumentation.enable_from_environment()
 
     schedule = []
 
@@ -0,0 +1,180 @@
+"""
+Share roster for the Winship House.
+Loads who owns what (percentages, pairings, holiday rotation lists and colors)
+from roster.json and builds the lookup tables the scheduling modules share.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_ROSTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "roster.json")
+
+# weeks of the year we schedule, not counting Tate Annual week
+WEEKS_PER_YEAR = 40
+
+# a 5% share gets 2 weeks, a 10% share gets 4
+WEEKS_PER_PERCENT = {5: 2, 10: 4}
+
+HOLIDAY_ROTATION_LENGTH = 10
+
+DEFAULT_COLOR = ("FFFFFF", "000000")
+
+_COLOR_RE = re.compile(r"^[0-9A-Fa-f]{6}$")
+
+
+class Roster:
+    """Validated share roster with precomputed lookup tables.
+
+    Every share gets a small integer ID (its position in the roster file),
+    which indexes `shares` and `weeks`.
+    """
+
+    def __init__(self, data: Dict, path: Optional[str] = None):
+        self.path = path
+        self.data = data
+        validate_roster_data(data)
+
+        entries = data["shares"]
+        # share name -> share ID, and back
+        self.shares: List[str] = [entry["id"] for entry in entries]
+        self.share_ids: Dict[str, int] = {share: i for i, share in enumerate(self.shares)}
+        # indexed by share ID
+        self.weeks: List[int] = [WEEKS_PER_PERCENT[entry["percent"]] for entry in entries]
+
+        self.owner_percent: Dict[str, int] = {entry["id"]: entry["percent"] for entry in entries}
+        self.ten_percent_shares: List[str] = [s for s in self.shares if self.owner_percent[s] == 10]
+        self.five_percent_shares: List[str] = [s for s in self.shares if self.owner_percent[s] == 5]
+        self.ten_percent_set = frozenset(self.ten_percent_shares)
+        self.five_percent_set = frozenset(self.five_percent_shares)
+
+        self.names: Dict[str, str] = {
+            entry["id"]: entry.get("name") or default_display_name(entry["id"])
+            for entry in entries
+        }
+        self.colors: Dict[str, Tuple[str, str]] = {
+            entry["id"]: tuple(color.upper() for color in entry.get("color", DEFAULT_COLOR))
+            for entry in entries
+        }
+
+        self.shares_pairs: List[Tuple[str, str]] = [tuple(pair) for pair in data["pairs"]]
+        self.pair_of: Dict[str, str] = {}
+        for first, second in self.shares_pairs:
+            self.pair_of[first] = second
+            self.pair_of[second] = first
+
+        rotation = data["holiday_rotation"]
+        self.odd_holiday_shares: List[List[str]] = [list(lst) for lst in rotation["odd"]]
+        self.even_holiday_shares: List[List[str]] = [list(lst) for lst in rotation["even"]]
+
+    def is_ten_percent(self, share: Optional[str]) -> bool:
+        return share in self.ten_percent_set
+
+    def is_five_percent(self, share: Optional[str]) -> bool:
+        return share in self.five_percent_set
+
+    def display_name(self, share: str) -> str:
+        return self.names.get(share) or default_display_name(share)
+
+    def color(self, share: str) -> Tuple[str, str]:
+        return self.colors.get(share, DEFAULT_COLOR)
+
+    def to_dict(self) -> Dict:
+        return json.loads(json.dumps(self.data))
+
+    def __repr__(self):
+        return f"Roster(path={self.path!r}, shares={len(self.shares)})"
+
+
+def default_display_name(share: str) -> str:
+    return share.replace("_", " ").title()
+
+
+def validate_roster_data(data: Dict) -> None:
+    """Raise ValueError describing the first problem found in the roster data."""
+    for key in ("shares", "pairs", "holiday_rotation"):
+        if key not in data:
+            raise ValueError(f"Roster is missing '{key}'")
+
+    percents = {}
+    for entry in data["shares"]:
+        share = entry.get("id")
+        if not share or not isinstance(share, str):
+            raise ValueError(f"Roster share without an id: {entry}")
+        if share in percents:
+            raise ValueError(f"Share listed twice: {share}")
+        if share == "everyone":
+            raise ValueError("'everyone' is reserved for Tate Annual week")
+        pct = entry.get("percent")
+        if pct not in WEEKS_PER_PERCENT:
+            raise ValueError(f"Unexpected owner percentage for {share}: {pct}")
+        color = entry.get("color", DEFAULT_COLOR)
+        if len(color) != 2 or not all(_COLOR_RE.match(c) for c in color):
+            raise ValueError(f"Color for {share} should be [background, font] hex pairs: {color}")
+        percents[share] = pct
+
+    total_weeks = sum(WEEKS_PER_PERCENT[pct] for pct in percents.values())
+    if total_weeks != WEEKS_PER_YEAR:
+        raise ValueError(f"Shares add up to {total_weeks} weeks, expected {WEEKS_PER_YEAR}")
+
+    paired = {}
+    for pair in data["pairs"]:
+        if len(pair) != 2:
+            raise ValueError(f"Pair should have two shares: {pair}")
+        first, second = pair
+        for share in pair:
+            if share not in percents:
+                raise ValueError(f"Unknown share in pair: {share}")
+            if share in paired:
+                raise ValueError(f"Share paired twice: {share}")
+        if first == second:
+            if percents[first] != 10:
+                raise ValueError(f"Only a 10% share can be paired with itself: {first}")
+        elif percents[first] != 5 or percents[second] != 5:
+            raise ValueError(f"Only 5% shares can be paired together: {first}, {second}")
+        paired[first] = second
+        paired[second] = first
+    unpaired = [share for share in percents if share not in paired]
+    if unpaired:
+        raise ValueError(f"Shares without a pair: {unpaired}")
+
+    for parity in ("odd", "even"):
+        lists = data["holiday_rotation"].get(parity)
+        if not lists or len(lists) != 2:
+            raise ValueError(f"holiday_rotation.{parity} should have two lists")
+        seen = {}
+        for lst in lists:
+            if len(lst) != HOLIDAY_ROTATION_LENGTH:
+                raise ValueError(
+                    f"holiday_rotation.{parity} lists should have {HOLIDAY_ROTATION_LENGTH} shares: {lst}"
+                )
+            for share in lst:
+                if share not in percents:
+                    raise ValueError(f"Unknown share in holiday_rotation.{parity}: {share}")
+                seen[share] = seen.get(share, 0) + 1
+        for share, pct in percents.items():
+            expected = 2 if pct == 10 else 1
+            if seen.get(share, 0) != expected:
+                raise ValueError(
+                    f"{share} should appear {expected} time(s) in holiday_rotation.{parity}, "
+                    f"got {seen.get(share, 0)}"
+                )
+
+
+def load_roster(path: str = DEFAULT_ROSTER_PATH) -> Roster:
+    """Load and validate a roster file."""
+    with open(path) as f:
+        data = json.load(f)
+    return Roster(data, path=path)
+
+
+_default_roster = None
+
+
+def default_roster() -> Roster:
+    """The roster in roster.json, loaded once per process."""
+    global _default_roster
+    if _default_roster is None:
+        _default_roster = load_roster()
+    return _default_roster
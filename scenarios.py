@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+What-if roster scenarios.
+Applies share sales, splits and merges to the roster, generates and rebalances
+a schedule for each variant on a process pool, and prints a comparison table
+built from the take2.test_schedule metrics.
+
+    python scenarios.py scenarios.example.json --workers 4
+"""
+
+import argparse
+import copy
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import fairness
+import manifest
+import rebalance2
+import roster
+import take2
+
+
+def rename_share(data: Dict, old: str, new: str) -> None:
+    """Replace a share ID everywhere in roster data (e.g. a share is sold)."""
+    for entry in data["shares"]:
+        if entry["id"] == old:
+            entry["id"] = new
+            entry["name"] = roster.default_display_name(new)
+    data["pairs"] = [[new if s == old else s for s in pair] for pair in data["pairs"]]
+    for lists in data["holiday_rotation"].values():
+        for lst in lists:
+            lst[:] = [new if s == old else s for s in lst]
+
+
+def split_share(data: Dict, share: str, into: List[str]) -> None:
+    """Split a 10% share into two paired 5% shares."""
+    first, second = into
+    entries = data["shares"]
+    index = next(i for i, entry in enumerate(entries) if entry["id"] == share)
+    entry = entries[index]
+    if entry["percent"] != 10:
+        raise ValueError(f"Only a 10% share can be split: {share}")
+    color = entry.get("color", list(roster.DEFAULT_COLOR))
+    entries[index : index + 1] = [
+        {"id": first, "name": roster.default_display_name(first), "percent": 5, "color": color},
+        {"id": second, "name": roster.default_display_name(second), "percent": 5, "color": color},
+    ]
+    data["pairs"] = [[first, second] if pair == [share, share] else pair for pair in data["pairs"]]
+    # a 10% share is in both rotation lists; like other 5% pairs, the two
+    # halves trade lists between odd and even years
+    for parity, lists in data["holiday_rotation"].items():
+        halves = (first, second) if parity == "odd" else (second, first)
+        for lst, half in zip(lists, halves):
+            lst[:] = [half if s == share else s for s in lst]
+
+
+def merge_shares(data: Dict, shares: List[str], into: str) -> None:
+    """Merge two paired 5% shares into one 10% share."""
+    first, second = shares
+    if sorted([first, second]) not in [sorted(pair) for pair in data["pairs"]]:
+        raise ValueError(f"Only paired shares can be merged: {first}, {second}")
+    entries = data["shares"]
+    entries[:] = [entry for entry in entries if entry["id"] != second]
+    index = next(i for i, entry in enumerate(entries) if entry["id"] == first)
+    color = entries[index].get("color", list(roster.DEFAULT_COLOR))
+    entries[index] = {
+        "id": into,
+        "name": roster.default_display_name(into),
+        "percent": 10,
+        "color": color,
+    }
+    data["pairs"] = [
+        [into, into] if sorted(pair) == sorted([first, second]) else pair for pair in data["pairs"]
+    ]
+    for lists in data["holiday_rotation"].values():
+        for lst in lists:
+            lst[:] = [into if s in (first, second) else s for s in lst]
+
+
+def apply_changes(base: Dict, changes: List[Dict]) -> Dict:
+    """Return a copy of the roster data with the scenario's changes applied.
+
+    Each change is one of:
+        {"sell": {"share": "eddie", "to": "new_owner"}}
+        {"split": {"share": "eddie", "into": ["eddie_a", "eddie_b"]}}
+        {"merge": {"shares": ["joe", "jim"], "into": "joe_jim"}}
+    """
+    data = copy.deepcopy(base)
+    for change in changes:
+        if "sell" in change:
+            rename_share(data, change["sell"]["share"], change["sell"]["to"])
+        elif "split" in change:
+            split_share(data, change["split"]["share"], change["split"]["into"])
+        elif "merge" in change:
+            merge_shares(data, change["merge"]["shares"], change["merge"]["into"])
+        else:
+            raise ValueError(f"Unknown scenario change: {change}")
+    return data
+
+
+def score_schedule(schedule, share_roster) -> Dict:
+    """Summarize the schedule as numbers for comparison: fairness scores plus
+    the take2.test_schedule spacing metrics (which also validates it)."""
+    results = take2.test_schedule(schedule, share_roster)
+    scores = fairness.FairnessMetrics(schedule, share_roster).scores()
+
+    spacings = results["spacing_counts"]
+    return {
+        "anomalies": scores["anomalies"],
+        "index_deviation": scores["index_deviation"],
+        "holiday_spread": scores["holiday_spread"],
+        "holiday_repeats": scores["holiday_repeats"],
+        "min_spacing": min(spacings) if spacings else None,
+        "mean_spacing": (
+            round(sum(s * n for s, n in spacings.items()) / sum(spacings.values()), 2)
+            if spacings
+            else None
+        ),
+    }
+
+
+def run_scenario(name: str, data: Dict, start_year: int = 2025, num_years: int = 20, seed=None) -> Dict:
+    """Generate, rebalance and score one roster variant.  Never raises, so one
+    bad scenario doesn't take down the batch.  The result's checksum
+    (manifest.schedule_checksum) lets a pool result be checked against a
+    serial run."""
+    result = {"name": name, "valid": False, "error": None}
+    try:
+        share_roster = roster.Roster(data)
+        schedule = take2.generate_multi_year_schedule(start_year, num_years, roster=share_roster)
+        schedule = rebalance2.rebalance_global(schedule, share_roster.owner_percent, seed=seed)
+        result.update(score_schedule(schedule, share_roster))
+        result["checksum"] = manifest.schedule_checksum(schedule)
+        result["valid"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def load_scenarios(path: str, base: Optional[Dict] = None) -> List[Dict]:
+    """Read a scenario batch file: a list of {"name": ..., "changes": [...]}
+    or {"name": ..., "roster": "path/to/roster.json"}.  The unchanged roster
+    is always included first as "baseline"."""
+    if base is None:
+        base = roster.default_roster().to_dict()
+    with open(path) as f:
+        specs = json.load(f)
+    scenarios = [{"name": "baseline", "data": base}]
+    for spec in specs:
+        if "roster" in spec:
+            with open(spec["roster"]) as f:
+                data = json.load(f)
+        else:
+            data = apply_changes(base, spec.get("changes", []))
+        scenarios.append({"name": spec["name"], "data": data})
+    return scenarios
+
+
+def run_scenarios(scenarios: List[Dict], start_year=2025, num_years=20, workers=None, seed=None) -> List[Dict]:
+    """Run every scenario on a process pool, returning results in input order."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_scenario, s["name"], s["data"], start_year, num_years, seed)
+            for s in scenarios
+        ]
+        return [future.result() for future in futures]
+
+
+def print_comparison(results: List[Dict]) -> None:
+    columns = ["anomalies", "index_deviation", "holiday_spread", "holiday_repeats", "min_spacing", "mean_spacing"]
+    width = max([len("scenario")] + [len(r["name"]) for r in results])
+    print(f"{'scenario':<{width}}  " + "  ".join(f"{c:>14}" for c in columns))
+    print("-" * (width + 16 * len(columns)))
+    for r in results:
+        if not r["valid"]:
+            print(f"{r['name']:<{width}}  invalid: {r['error']}")
+            continue
+        print(f"{r['name']:<{width}}  " + "  ".join(f"{str(r[c]):>14}" for c in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare what-if roster scenarios")
+    parser.add_argument("scenarios", help="JSON file with a list of scenarios")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    scenarios = load_scenarios(args.scenarios)
+    results = run_scenarios(scenarios, args.start_year, args.years, args.workers)
+    print_comparison(results)
+
+
+if __name__ == "__main__":
+    main()
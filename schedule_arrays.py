@@ -0,0 +1,89 @@
+"""
+Flat, array-backed view of a multi-year schedule.
+One slot per (year, week index), stored column-wise in stdlib arrays of
+small integer codes, so whole horizons can be compared or exported without
+walking AllocatedWeek objects.
+"""
+
+from array import array
+from typing import Dict, List, Optional
+
+KINDS = ["hot", "warm", "cool", "cold"]
+
+# code for a slot a shorter year doesn't have
+NO_WEEK = -1
+
+
+class ScheduleArrays:
+    """
+    Columns, each with len(years) * weeks_per_year entries; slot
+    i * weeks_per_year + w is week w of years[i].
+
+        share   index into share_names, NO_WEEK for a missing slot
+        kind    index into KINDS
+        holiday index into holiday_names, 0 for no holiday
+        start   proleptic ordinal of the week's start date
+    """
+
+    def __init__(self, years: List[int], weeks_per_year: int):
+        self.years = years
+        self.weeks_per_year = weeks_per_year
+        self.year_index = {year: i for i, year in enumerate(years)}
+        size = len(years) * weeks_per_year
+        self.share = array("h", [NO_WEEK]) * size
+        self.kind = array("b", [0]) * size
+        self.holiday = array("b", [0]) * size
+        self.start = array("l", [0]) * size
+        self.share_names: List[str] = []
+        self.share_codes: Dict[str, int] = {}
+        self.holiday_names: List[Optional[str]] = [None]
+        self.holiday_codes: Dict[Optional[str], int] = {None: 0}
+
+    @classmethod
+    def from_schedule(cls, schedule) -> "ScheduleArrays":
+        years = [house_year.year for house_year in schedule]
+        arrays = cls(years, max(len(house_year.weeks) for house_year in schedule))
+        kind_codes = {kind: code for code, kind in enumerate(KINDS)}
+        for house_year in schedule:
+            base = arrays.slot(house_year.year, 0)
+            for w_idx, week in enumerate(house_year.weeks):
+                slot = base + w_idx
+                arrays.share[slot] = arrays.share_code(week.share)
+                arrays.kind[slot] = kind_codes[week.kind]
+                arrays.holiday[slot] = arrays.holiday_code(week.holiday)
+                arrays.start[slot] = week.start.toordinal()
+        return arrays
+
+    def share_code(self, share: str) -> int:
+        code = self.share_codes.get(share)
+        if code is None:
+            code = self.share_codes[share] = len(self.share_names)
+            self.share_names.append(share)
+        return code
+
+    def holiday_code(self, holiday: Optional[str]) -> int:
+        code = self.holiday_codes.get(holiday)
+        if code is None:
+            code = self.holiday_codes[holiday] = len(self.holiday_names)
+            self.holiday_names.append(holiday)
+        return code
+
+    def slot(self, year: int, week_index: int) -> int:
+        return self.year_index[year] * self.weeks_per_year + week_index
+
+    def year_slice(self, year: int) -> slice:
+        base = self.slot(year, 0)
+        return slice(base, base + self.weeks_per_year)
+
+    def recode_shares(self, share_names: List[str]) -> array:
+        """The share column with codes from another table of names (names
+        not in share_names get new codes past its end)."""
+        codes = {name: code for code, name in enumerate(share_names)}
+        extra = len(share_names)
+        mapping = []
+        for name in self.share_names:
+            if name not in codes:
+                codes[name] = extra
+                extra += 1
+            mapping.append(codes[name])
+        return array("h", [NO_WEEK if code == NO_WEEK else mapping[code] for code in self.share])
@@ -0,0 +1,125 @@
+"""
+On-disk cache of generated and rebalanced schedules.
+Each entry is a pickle of (schedule, manifest) named by a key over
+everything that decides the schedule: the run's arguments, the roster's hash
+and the digest of the scheduling code (see manifest.py), so editing the
+roster or the algorithm simply misses the cache instead of serving something
+stale.  Entries are checked against their manifest's checksum when loaded.
+
+A rebalanced schedule is built from the cached generated one, so asking for
+the generated horizon and then the rebalanced one generates it once.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Dict, List, Optional, Tuple
+
+import instrumentation
+import manifest
+import rebalance2
+import roster
+import take2
+
+DEFAULT_CACHE_DIR = ".schedule_cache"
+
+
+def cache_key(
+    start_year: int,
+    num_years: int,
+    share_roster: roster.Roster,
+    seed: Optional[int] = None,
+    rebalance: bool = True,
+) -> str:
+    parts = {
+        "manifest_version": manifest.MANIFEST_VERSION,
+        "algorithm_digest": manifest.algorithm_digest(),
+        "roster_hash": manifest.roster_hash(share_roster),
+        "start_year": start_year,
+        "num_years": num_years,
+        "seed": seed,
+        "rebalance": rebalance,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:32]
+
+
+class ScheduleCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def get(self, key: str) -> Optional[Tuple[List, Dict]]:
+        """The cached (schedule, manifest), or None if there isn't a usable
+        one.  A corrupt or mismatched entry counts as a miss."""
+        try:
+            with open(self.path(key), "rb") as f:
+                schedule, made = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            instrumentation.count("schedule_cache.corrupt")
+            return None
+        if manifest.schedule_checksum(schedule) != made["checksum"]:
+            instrumentation.count("schedule_cache.corrupt")
+            return None
+        return schedule, made
+
+    def put(self, key: str, schedule, made: Dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(key)
+        # write then rename, so a reader never sees half an entry
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((schedule, made), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def clear(self) -> int:
+        """Delete every entry, returning how many there were."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pickle"):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+
+def load_schedule(
+    start_year: int = 2025,
+    num_years: int = 20,
+    share_roster: Optional[roster.Roster] = None,
+    seed: Optional[int] = None,
+    rebalance: bool = True,
+    cache: Optional[ScheduleCache] = None,
+) -> Tuple[List, Dict]:
+    """
+    (schedule, manifest) for the arguments, the same as
+    manifest.run_schedule, from the cache when it has them.  With cache None
+    nothing is read or written.
+    """
+    share_roster = share_roster or roster.default_roster()
+    if not rebalance:
+        # the seed only affects rebalancing
+        seed = None
+    key = cache_key(start_year, num_years, share_roster, seed, rebalance)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            instrumentation.count("schedule_cache.hit")
+            return hit
+        instrumentation.count("schedule_cache.miss")
+
+    stats = {}
+    if rebalance:
+        schedule, _ = load_schedule(start_year, num_years, share_roster, rebalance=False, cache=cache)
+        schedule = rebalance2.rebalance_global(schedule, share_roster.owner_percent, seed=seed, stats=stats)
+    else:
+        schedule = take2.generate_multi_year_schedule(start_year, num_years, roster=share_roster)
+    made = manifest.make_manifest(schedule, start_year, num_years, share_roster, seed, rebalance, stats)
+    if cache is not None:
+        cache.put(key, schedule, made)
+    return schedule, made
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Diff two generated schedules.
+Aligns them by (year, week index) on ScheduleArrays and reports which weeks
+changed hands, per-owner gains and losses, holiday reassignments and the
+change in each owner's weeks/kinds/holidays.  The changed slots become the
+minimal set of calendar events for CalendarExporter.push_events.
+
+    python schedule_diff.py --old-roster roster.json --new-roster proposed.json --years 100
+"""
+
+import argparse
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from schedule_arrays import KINDS, NO_WEEK, ScheduleArrays
+from winship_calendar_core import CalendarEvent, make_event_id, week_to_event
+
+
+def as_arrays(schedule) -> ScheduleArrays:
+    return schedule if isinstance(schedule, ScheduleArrays) else ScheduleArrays.from_schedule(schedule)
+
+
+def owner_totals(arrays: ScheduleArrays, years: List[int], share_names: List[str], shares) -> Dict[str, Counter]:
+    """Per-owner counts of weeks, each kind and holidays over the given years."""
+    totals = {}
+    for year in years:
+        span = arrays.year_slice(year)
+        for code, kind, holiday in zip(shares[span], arrays.kind[span], arrays.holiday[span]):
+            if code == NO_WEEK:
+                continue
+            counts = totals.setdefault(share_names[code], Counter())
+            counts["weeks"] += 1
+            counts[KINDS[kind]] += 1
+            if holiday:
+                counts["holidays"] += 1
+    return totals
+
+
+def diff_schedules(old, new) -> Dict:
+    """
+    Compare two schedules (lists of HouseYear, or ScheduleArrays).
+
+    Returns a dict with:
+        changes          [(year, week_index, old_share, new_share)] for weeks that changed hands
+        changed_slots    [(year, week_index)] whose event differs in any way
+                         (owner, dates, kind or holiday), including every
+                         slot of a year only the new schedule has
+        removed_slots    [(year, week_index)] only the old schedule has,
+                         including every slot of a dropped year
+        by_owner         {share: {"gained": [(year, week_index)], "lost": [...]}}
+        holiday_changes  [(year, holiday, old_share, new_share)]
+        fairness         {share: {"weeks"|kind|"holidays": new - old}}, nonzero only
+        years_added, years_removed
+    """
+    a = as_arrays(old)
+    b = as_arrays(new)
+    share_names = list(a.share_names)
+    b_shares = b.recode_shares(share_names)
+    for name in b.share_names:
+        if name not in a.share_codes:
+            share_names.append(name)
+
+    common_years = [year for year in b.years if year in a.year_index]
+    changes: List[Tuple] = []
+    changed_slots: List[Tuple[int, int]] = []
+    removed_slots: List[Tuple[int, int]] = []
+    holiday_changes: List[Tuple] = []
+
+    for year in common_years:
+        a_span = a.year_slice(year)
+        b_span = b.year_slice(year)
+        a_share = a.share[a_span]
+        b_share = b_shares[b_span]
+        a_start = a.start[a_span]
+        b_start = b.start[b_span]
+        a_kind = a.kind[a_span]
+        b_kind = b.kind[b_span]
+        a_holiday = [a.holiday_names[h] for h in a.holiday[a_span]]
+        b_holiday = [b.holiday_names[h] for h in b.holiday[b_span]]
+
+        for w_idx in range(max(a.weeks_per_year, b.weeks_per_year)):
+            in_a = w_idx < a.weeks_per_year and a_share[w_idx] != NO_WEEK
+            in_b = w_idx < b.weeks_per_year and b_share[w_idx] != NO_WEEK
+            if in_a and not in_b:
+                removed_slots.append((year, w_idx))
+                changes.append((year, w_idx, share_names[a_share[w_idx]], None))
+                continue
+            if not in_b:
+                continue
+            if not in_a:
+                changed_slots.append((year, w_idx))
+                changes.append((year, w_idx, None, share_names[b_share[w_idx]]))
+                continue
+            if a_share[w_idx] != b_share[w_idx]:
+                changes.append((year, w_idx, share_names[a_share[w_idx]], share_names[b_share[w_idx]]))
+                changed_slots.append((year, w_idx))
+            elif (a_start[w_idx] != b_start[w_idx] or a_kind[w_idx] != b_kind[w_idx]
+                  or a_holiday[w_idx] != b_holiday[w_idx]):
+                changed_slots.append((year, w_idx))
+
+        # holidays are matched by name, since a holiday week can move
+        a_holidays = {h: share_names[s] for h, s in zip(a_holiday, a_share) if h}
+        b_holidays = {h: share_names[s] for h, s in zip(b_holiday, b_share) if h}
+        for holiday in sorted(set(a_holidays) | set(b_holidays)):
+            if a_holidays.get(holiday) != b_holidays.get(holiday):
+                holiday_changes.append((year, holiday, a_holidays.get(holiday), b_holidays.get(holiday)))
+
+    # a whole year on one side only is created or deleted slot by slot
+    years_added = [year for year in b.years if year not in a.year_index]
+    years_removed = [year for year in a.years if year not in b.year_index]
+    for year in years_added:
+        b_share = b_shares[b.year_slice(year)]
+        changed_slots.extend((year, w_idx) for w_idx, code in enumerate(b_share) if code != NO_WEEK)
+    for year in years_removed:
+        a_share = a.share[a.year_slice(year)]
+        removed_slots.extend((year, w_idx) for w_idx, code in enumerate(a_share) if code != NO_WEEK)
+
+    by_owner: Dict[str, Dict[str, List]] = {}
+    for year, w_idx, old_share, new_share in changes:
+        if old_share is not None:
+            by_owner.setdefault(old_share, {"gained": [], "lost": []})["lost"].append((year, w_idx))
+        if new_share is not None:
+            by_owner.setdefault(new_share, {"gained": [], "lost": []})["gained"].append((year, w_idx))
+
+    old_totals = owner_totals(a, common_years, share_names, a.share)
+    new_totals = owner_totals(b, common_years, share_names, b_shares)
+    fairness = {}
+    for share in sorted(set(old_totals) | set(new_totals)):
+        delta = Counter(new_totals.get(share, {}))
+        delta.subtract(old_totals.get(share, {}))
+        nonzero = {metric: n for metric, n in delta.items() if n}
+        if nonzero:
+            fairness[share] = nonzero
+
+    return {
+        "changes": changes,
+        "changed_slots": changed_slots,
+        "removed_slots": removed_slots,
+        "by_owner": by_owner,
+        "holiday_changes": holiday_changes,
+        "fairness": fairness,
+        "years_added": years_added,
+        "years_removed": years_removed,
+    }
+
+
+def changed_events(diff: Dict, new_schedule, week_format: str = "monday-sunday") -> List[CalendarEvent]:
+    """Calendar events for just the slots the diff found changed."""
+    house_years = {house_year.year: house_year for house_year in new_schedule}
+    return [
+        week_to_event(house_years[year].weeks[w_idx], week_format, year, w_idx)
+        for year, w_idx in diff["changed_slots"]
+    ]
+
+
+def removed_event_ids(diff: Dict) -> List[str]:
+    """IDs of exported events whose slots no longer exist."""
+    return [make_event_id(year, w_idx) for year, w_idx in diff["removed_slots"]]
+
+
+def format_report(diff: Dict) -> str:
+    lines = [
+        f"{len(diff['changes'])} weeks changed hands, "
+        f"{len(diff['changed_slots'])} calendar events to update, "
+        f"{len(diff['removed_slots'])} to delete"
+    ]
+    if diff["years_added"] or diff["years_removed"]:
+        lines.append(f"years added: {diff['years_added']}  removed: {diff['years_removed']}")
+    if diff["by_owner"]:
+        lines.append("")
+        lines.append(f"{'owner':<16} {'gained':>7} {'lost':>7}")
+        for share, moves in sorted(diff["by_owner"].items()):
+            lines.append(f"{share:<16} {len(moves['gained']):>7} {len(moves['lost']):>7}")
+    if diff["holiday_changes"]:
+        lines.append("")
+        lines.append("holiday reassignments:")
+        for year, holiday, old_share, new_share in diff["holiday_changes"]:
+            lines.append(f"  {year} {holiday}: {old_share} -> {new_share}")
+    if diff["fairness"]:
+        lines.append("")
+        lines.append("fairness deltas (new - old):")
+        for share, delta in diff["fairness"].items():
+            lines.append(f"  {share}: " + ", ".join(f"{m} {n:+d}" for m, n in sorted(delta.items())))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff schedules from two rosters")
+    parser.add_argument("--old-roster", default=None, help="roster.json for the old schedule")
+    parser.add_argument("--new-roster", default=None, help="roster.json for the new schedule")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--no-rebalance", action="store_true")
+    args = parser.parse_args(argv)
+
+    import rebalance2
+    import roster
+    import take2
+
+    def build(path):
+        share_roster = roster.load_roster(path) if path else roster.default_roster()
+        schedule = take2.generate_multi_year_schedule(args.start_year, args.years, roster=share_roster)
+        if args.no_rebalance:
+            return schedule
+        return rebalance2.rebalance_global(schedule, share_roster.owner_percent)
+
+    print(format_report(diff_schedules(build(args.old_roster), build(args.new_roster))))
+
+
+if __name__ == "__main__":
+    main()
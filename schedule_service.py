@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Local HTTP service answering "whose week is it on date X?" and "when are my
+weeks in 2031?" without running scripts.
+
+The rebalanced schedule is loaded once (through schedule_cache) into a
+ScheduleIndex: dicts by date, by share and by year, so a query is a couple of
+dict lookups.  A watcher thread polls the roster file and, when it changes,
+rebuilds the index in the background and swaps it in; queries keep being
+answered from the old index until the new one is ready, and a roster that
+fails to load leaves the old one in place.
+
+    python schedule_service.py --port 8047
+
+    GET /week?date=2031-07-04        the week containing a date
+    GET /shares/eddie/weeks?year=2031 a share's weeks (all years without year)
+    GET /years/2031                  every week of a year
+    GET /status                      what's loaded and when
+"""
+
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import instrumentation
+import roster
+import schedule_cache
+
+DAYS_PER_WEEK = 7
+
+
+def week_to_json(share_roster: roster.Roster, year: int, week_index: int, week) -> Dict:
+    end = week.end or week.start + datetime.timedelta(days=DAYS_PER_WEEK)
+    return {
+        "year": year,
+        "week_index": week_index,
+        "start": week.start.isoformat(),
+        "end": end.isoformat(),
+        "kind": week.kind,
+        "holiday": week.holiday,
+        "share": week.share,
+        "name": share_roster.display_name(week.share) if week.share else None,
+    }
+
+
+class ScheduleIndex:
+    """A schedule's weeks as JSON-ready dicts, indexed by every date they
+    cover, by share and by year."""
+
+    def __init__(self, schedule, share_roster: roster.Roster, manifest: Optional[Dict] = None):
+        self.manifest = manifest or {}
+        self.by_date: Dict[datetime.date, Dict] = {}
+        self.by_year: Dict[int, List[Dict]] = {}
+        self.by_share: Dict[str, Dict[int, List[Dict]]] = {}
+        for house_year in schedule:
+            weeks = self.by_year.setdefault(house_year.year, [])
+            for week_index, week in enumerate(house_year.weeks):
+                entry = week_to_json(share_roster, house_year.year, week_index, week)
+                weeks.append(entry)
+                self.by_share.setdefault(week.share, {}).setdefault(house_year.year, []).append(entry)
+                for day in range(DAYS_PER_WEEK):
+                    self.by_date[week.start + datetime.timedelta(days=day)] = entry
+
+    def on_date(self, date: datetime.date) -> Optional[Dict]:
+        return self.by_date.get(date)
+
+    def share_weeks(self, share: str, year: Optional[int] = None) -> Optional[List[Dict]]:
+        """The share's weeks in year (every year if None), or None for an
+        unknown share."""
+        years = self.by_share.get(share)
+        if years is None:
+            return None
+        if year is not None:
+            return years.get(year, [])
+        return [entry for weeks in years.values() for entry in weeks]
+
+    def year_weeks(self, year: int) -> Optional[List[Dict]]:
+        return self.by_year.get(year)
+
+
+class ScheduleService:
+    """
+    Holds the current ScheduleIndex and rebuilds it when the roster file
+    changes.  Readers take self.index once per query; rebuilds replace it
+    with a single assignment, so a query never sees half a rebuild.
+    """
+
+    def __init__(
+        self,
+        roster_path: str = roster.DEFAULT_ROSTER_PATH,
+        start_year: int = 2025,
+        num_years: int = 20,
+        seed: Optional[int] = None,
+        cache: Optional[schedule_cache.ScheduleCache] = None,
+        poll_interval: float = 2.0,
+    ):
+        self.roster_path = roster_path
+        self.start_year = start_year
+        self.num_years = num_years
+        self.seed = seed
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.index: Optional[ScheduleIndex] = None
+        self.roster_mtime: Optional[int] = None
+        self.built_at: Optional[float] = None
+        self.generation = 0
+        self.last_error: Optional[str] = None
+        self.rebuild_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.watcher: Optional[threading.Thread] = None
+
+    def current_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.roster_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def rebuild(self) -> bool:
+        """Load the roster and build a fresh index, keeping the old one (and
+        recording last_error) if that fails.  Returns True on success."""
+        with self.rebuild_lock:
+            mtime = self.current_mtime()
+            try:
+                with instrumentation.timer("service.rebuild"):
+                    share_roster = roster.load_roster(self.roster_path)
+                    schedule, made = schedule_cache.load_schedule(
+                        self.start_year, self.num_years, share_roster, self.seed, cache=self.cache
+                    )
+                    index = ScheduleIndex(schedule, share_roster, made)
+            except Exception as e:
+                self.roster_mtime = mtime
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.index = index
+            self.roster_mtime = mtime
+            self.built_at = time.time()
+            self.generation += 1
+            self.last_error = None
+            return True
+
+    def check_roster(self) -> bool:
+        """Rebuild if the roster file changed since the last build."""
+        if self.current_mtime() != self.roster_mtime:
+            return self.rebuild()
+        return False
+
+    def watch(self):
+        while not self.stopped.wait(self.poll_interval):
+            self.check_roster()
+
+    def start(self):
+        """Build the first index, then watch the roster in the background."""
+        if self.index is None and not self.rebuild():
+            raise ValueError(f"could not build the schedule: {self.last_error}")
+        self.watcher = threading.Thread(target=self.watch, name="roster-watcher", daemon=True)
+        self.watcher.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.watcher is not None:
+            self.watcher.join()
+
+    def status(self) -> Dict:
+        index = self.index
+        return {
+            "generation": self.generation,
+            "built_at": self.built_at,
+            "roster_path": self.roster_path,
+            "start_year": self.start_year,
+            "num_years": self.num_years,
+            "checksum": index.manifest.get("checksum") if index else None,
+            "last_error": self.last_error,
+        }
+
+
+class ScheduleRequestHandler(BaseHTTPRequestHandler):
+    # set on the subclass make_server builds
+    service: ScheduleService = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        index = self.service.index
+        try:
+            if parts == ["status"]:
+                return self.send_json(200, self.service.status())
+            if parts == ["week"]:
+                date = datetime.date.fromisoformat(query["date"])
+                return self.send_found(index.on_date(date), f"no house week on {date}")
+            if len(parts) == 3 and parts[0] == "shares" and parts[2] == "weeks":
+                year = int(query["year"]) if "year" in query else None
+                return self.send_found(index.share_weeks(parts[1], year), f"no share {parts[1]!r}")
+            if len(parts) == 2 and parts[0] == "years":
+                return self.send_found(index.year_weeks(int(parts[1])), f"{parts[1]} is not scheduled")
+        except (KeyError, ValueError) as e:
+            return self.send_json(400, {"error": f"bad request: {e}"})
+        self.send_json(404, {"error": f"no such endpoint {url.path}"})
+
+    def send_found(self, result, missing: str):
+        if result is None:
+            self.send_json(404, {"error": missing})
+        else:
+            self.send_json(200, result)
+
+    def send_json(self, status: int, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        instrumentation.count("service.requests")
+
+
+def make_server(service: ScheduleService, host: str = "127.0.0.1", port: int = 8047) -> ThreadingHTTPServer:
+    """An HTTP server answering from service (port 0 picks a free port)."""
+    handler = type("BoundScheduleRequestHandler", (ScheduleRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve schedule queries over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8047)
+    parser.add_argument("--roster", default=roster.DEFAULT_ROSTER_PATH)
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache-dir", default=schedule_cache.DEFAULT_CACHE_DIR)
+    parser.add_argument("--poll", type=float, default=2.0, help="seconds between roster checks")
+    args = parser.parse_args(argv)
+
+    service = ScheduleService(
+        args.roster, args.start_year, args.years, args.seed,
+        schedule_cache.ScheduleCache(args.cache_dir), args.poll,
+    )
+    service.start()
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {args.start_year}-{args.start_year + args.years - 1} on "
+          f"http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Check the season layout rules for every year in a range.
+The layout (cold, 5 cool, 5 warm, hot weeks, Tate Annual week, hot, 5 warm,
+5 cool, 9 cold) hangs off a handful of anchor dates.  Here each anchor is a
+column of day ordinals, one entry per year, computed in closed form (no
+stepping day by day), and each rule is checked down the columns:
+
+    sunday       every season start and holiday week starts on a Sunday
+    contiguous   each season starts the week the previous one ends
+    holidays     each holiday week is in the layout, in its season's kind,
+                 and no two holidays (or Tate Annual) share a week
+    year_end     the last cold week ends by Dec 31
+
+Generation relies on the first three (REQUIRED_RULES), and with 8 hot weeks
+before Tate Annual week every year keeps them.  year_end is what sets 2021
+apart: Aug 1 was a Sunday, so Tate Annual week starts as late as it can and
+with 8 hot weeks the last cold week runs to Jan 1.  It is reported but not
+required, since nothing breaks; --strict includes it, and then the exception
+table lists every 2021-style year.  The Gregorian calendar repeats every 400
+years, so checking one cycle checks every year.
+
+    python season_layout.py --start 1900 --end 2300
+    python season_layout.py --table --strict
+"""
+
+import argparse
+import datetime
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+import date_finders
+
+# weeks in each season, in order, around the hot weeks
+EARLY_COLD_WEEKS = 1
+COOL_WEEKS = 5
+WARM_WEEKS = 5
+HOT_WEEKS = 10  # not counting Tate Annual week
+LATE_COLD_WEEKS = 9
+SEASON_WEEKS = EARLY_COLD_WEEKS + 2 * COOL_WEEKS + 2 * WARM_WEEKS + HOT_WEEKS + 1 + LATE_COLD_WEEKS
+
+# the kind of week each holiday has to land in
+HOLIDAY_KINDS = {
+    "Memorial Day": "warm",
+    "Independence Day": "hot",
+    "Labor Day": "warm",
+    "Thanksgiving": "cold",
+    "Christmas": "cold",
+}
+
+RULES = ("sunday", "contiguous", "holidays", "year_end")
+REQUIRED_RULES = ("sunday", "contiguous", "holidays")
+
+GREGORIAN_CYCLE = 400
+
+# hot-week counts tried, in order, for a year the default breaks
+ALTERNATIVE_HOT_WEEKS = [9, 7, 10, 6]
+
+
+def weekday(ordinal: int) -> int:
+    """date.weekday() of a day ordinal (Monday 0 ... Sunday 6)."""
+    return (ordinal - 1) % 7
+
+
+def ordinals(years: Iterable[int], month: int, day: int) -> array:
+    return array("l", (datetime.date(year, month, day).toordinal() for year in years))
+
+
+def layout_kinds(hot_before: int) -> List[str]:
+    """Kind of every layout week, Tate Annual week included."""
+    return (
+        ["cold"] * EARLY_COLD_WEEKS + ["cool"] * COOL_WEEKS + ["warm"] * WARM_WEEKS
+        + ["hot"] * hot_before + ["hot"] + ["hot"] * (HOT_WEEKS - hot_before)
+        + ["warm"] * WARM_WEEKS + ["cool"] * COOL_WEEKS + ["cold"] * LATE_COLD_WEEKS
+    )
+
+
+def anchor_columns(years: List[int], hot_weeks: List[int]) -> Dict[str, array]:
+    """
+    Every anchor date as a column of day ordinals, one per year, given the
+    hot weeks before Tate Annual week for each year.  These mirror the
+    date_finders functions in closed form.
+    """
+    aug1 = ordinals(years, 8, 1)
+    may31 = ordinals(years, 5, 31)
+    jul4 = ordinals(years, 7, 4)
+    sep1 = ordinals(years, 9, 1)
+    nov1 = ordinals(years, 11, 1)
+    dec25 = ordinals(years, 12, 25)
+
+    tate_meeting = array("l", (d + (5 - weekday(d)) % 7 for d in aug1))  # first Saturday
+    tate = array("l", (d - 6 for d in tate_meeting))
+    hot_start = array("l", (t - 7 * h for t, h in zip(tate, hot_weeks)))
+    early_warm = array("l", (d - 7 * WARM_WEEKS for d in hot_start))
+    early_cool = array("l", (d - 7 * COOL_WEEKS for d in early_warm))
+    early_cold = array("l", (d - 7 * EARLY_COLD_WEEKS for d in early_cool))
+    late_warm = array("l", (t + 7 * (HOT_WEEKS - h + 1) for t, h in zip(tate, hot_weeks)))
+    late_cool = array("l", (d + 7 * WARM_WEEKS for d in late_warm))
+    late_cold = array("l", (d + 7 * COOL_WEEKS for d in late_cool))
+    season_end = array("l", (d + 7 * LATE_COLD_WEEKS for d in late_cold))  # exclusive
+
+    return {
+        "tate_annual_week_start": tate,
+        "hot_weeks_start": hot_start,
+        "early_warm_weeks_start": early_warm,
+        "early_cool_weeks_start": early_cool,
+        "early_cold_weeks_start": early_cold,
+        "late_warm_weeks_start": late_warm,
+        "late_cool_weeks_start": late_cool,
+        "late_cold_weeks_start": late_cold,
+        "season_end": season_end,
+        "year_end": ordinals(years, 12, 31),
+        "Memorial Day": array("l", (d - weekday(d) - 8 for d in may31)),
+        "Independence Day": array("l", (d - weekday(d) - 1 for d in jul4)),
+        "Labor Day": array("l", (d + (7 - weekday(d)) % 7 - 8 for d in sep1)),
+        "Thanksgiving": array("l", (d + (3 - weekday(d)) % 7 + 21 - 4 for d in nov1)),
+        "Christmas": array("l", (d - weekday(d) - 1 for d in dec25)),
+    }
+
+
+# consecutive season starts and the weeks between them
+SEASON_CHAIN = [
+    ("early_cold_weeks_start", "early_cool_weeks_start", EARLY_COLD_WEEKS),
+    ("early_cool_weeks_start", "early_warm_weeks_start", COOL_WEEKS),
+    ("early_warm_weeks_start", "hot_weeks_start", WARM_WEEKS),
+    ("late_warm_weeks_start", "late_cool_weeks_start", WARM_WEEKS),
+    ("late_cool_weeks_start", "late_cold_weeks_start", COOL_WEEKS),
+    ("late_cold_weeks_start", "season_end", LATE_COLD_WEEKS),
+]
+
+
+def check_years(years: Iterable[int], hot_weeks: Optional[int] = None,
+                rules: Iterable[str] = RULES) -> Dict[int, List[str]]:
+    """
+    Problems with each year's layout under rules, for the years that have
+    any, each prefixed with its rule's name.  Uses date_finders' hot-week
+    count for each year unless hot_weeks is given.
+    """
+    rules = set(rules)
+    years = list(years)
+    if hot_weeks is None:
+        counts = [date_finders.hot_weeks_before_tate_annual_week_start(year) for year in years]
+    else:
+        counts = [hot_weeks] * len(years)
+    columns = anchor_columns(years, counts)
+    problems: Dict[int, List[str]] = {}
+
+    def flag(i, message):
+        if message.split(":")[0] in rules:
+            problems.setdefault(years[i], []).append(message)
+
+    for name in ["early_cold_weeks_start", "tate_annual_week_start", *HOLIDAY_KINDS]:
+        for i, d in enumerate(columns[name]):
+            if weekday(d) != 6:
+                flag(i, f"sunday: {name} is a {datetime.date.fromordinal(d):%A}")
+
+    for first, then, weeks in SEASON_CHAIN:
+        for i, (a, b) in enumerate(zip(columns[first], columns[then])):
+            if b - a != 7 * weeks:
+                flag(i, f"contiguous: {then} is {b - a} days after {first}, not {7 * weeks}")
+    for i, (hot, tate, h) in enumerate(zip(columns["hot_weeks_start"], columns["tate_annual_week_start"], counts)):
+        if tate - hot != 7 * h:
+            flag(i, f"contiguous: Tate Annual week is {tate - hot} days after the hot weeks start")
+
+    kinds_for = {h: layout_kinds(h) for h in set(counts)}
+    for i, start in enumerate(columns["early_cold_weeks_start"]):
+        kinds = kinds_for[counts[i]]
+        taken = {(columns["tate_annual_week_start"][i] - start) // 7: "Tate Annual"}
+        for holiday, kind in HOLIDAY_KINDS.items():
+            offset = columns[holiday][i] - start
+            index = offset // 7
+            if offset % 7 or not 0 <= index < len(kinds):
+                flag(i, f"holidays: {holiday} week is outside the season")
+                continue
+            if kinds[index] != kind:
+                flag(i, f"holidays: {holiday} week is {kinds[index]}, not {kind}")
+            if index in taken:
+                flag(i, f"holidays: {holiday} shares week {index} with {taken[index]}")
+            taken[index] = holiday
+
+    for i, (end, year_end) in enumerate(zip(columns["season_end"], columns["year_end"])):
+        if end - 1 > year_end:
+            flag(i, f"year_end: the last cold week runs to {datetime.date.fromordinal(end - 1)}")
+    return problems
+
+
+def exception_table(years: Iterable[int], default: int = date_finders.HOT_WEEKS_BEFORE_TATE_ANNUAL,
+                    rules: Iterable[str] = REQUIRED_RULES) -> Dict[int, int]:
+    """
+    {year: hot weeks before Tate Annual week} for every year where the
+    default count breaks one of rules, using the first of
+    ALTERNATIVE_HOT_WEEKS that doesn't.  Raises ValueError for a year
+    nothing fixes.
+    """
+    rules = tuple(rules)
+    broken = sorted(check_years(years, default, rules))
+    table = {}
+    remaining = broken
+    for count in ALTERNATIVE_HOT_WEEKS:
+        if not remaining:
+            break
+        still = check_years(remaining, count, rules)
+        for year in remaining:
+            if year not in still:
+                table[year] = count
+        remaining = sorted(still)
+    if remaining:
+        raise ValueError(f"no hot-week count gives a valid layout for {remaining}")
+    return table
+
+
+def format_table(table: Dict[int, int], per_line: int = 8) -> str:
+    """The table as a Python dict literal for date_finders."""
+    items = [f"{year}: {count}," for year, count in sorted(table.items())]
+    if not items:
+        return "HOT_WEEKS_EXCEPTIONS = {}"
+    lines = ["    " + " ".join(items[i:i + per_line]) for i in range(0, len(items), per_line)]
+    return "HOT_WEEKS_EXCEPTIONS = {\n" + "\n".join(lines) + "\n}"
+
+
+def format_report(problems: Dict[int, List[str]], start: int, end: int) -> str:
+    if not problems:
+        return f"{start}-{end}: every year's layout follows the rules"
+    required = sum(
+        any(p.split(":")[0] in REQUIRED_RULES for p in year_problems) for year_problems in problems.values()
+    )
+    lines = [f"{start}-{end}: {len(problems)} years break a rule, {required} a required one"]
+    for year in sorted(problems):
+        for problem in problems[year]:
+            note = "" if problem.split(":")[0] in REQUIRED_RULES else " (advisory)"
+            lines.append(f"  {year}: {problem}{note}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the season layout rules for a range of years")
+    parser.add_argument("--start", type=int, default=1900)
+    parser.add_argument("--end", type=int, default=2300)
+    parser.add_argument("--hot-weeks", type=int, default=None,
+                        help="check with this many hot weeks before Tate Annual week for every year")
+    parser.add_argument("--table", action="store_true",
+                        help="print date_finders.HOT_WEEKS_EXCEPTIONS plus the years of one Gregorian "
+                             "cycle from --start that the default count breaks")
+    parser.add_argument("--strict", action="store_true",
+                        help="make the table keep every season inside its calendar year too")
+    args = parser.parse_args(argv)
+
+    if args.table:
+        rules = RULES if args.strict else REQUIRED_RULES
+        table = exception_table(range(args.start, args.start + GREGORIAN_CYCLE), rules=rules)
+        table.update(date_finders.HOT_WEEKS_EXCEPTIONS)
+        print(format_table(table))
+        return 0
+    problems = check_years(range(args.start, args.end + 1), args.hot_weeks)
+    print(format_report(problems, args.start, args.end))
+    required = check_years(range(args.start, args.end + 1), args.hot_weeks, REQUIRED_RULES)
+    return 1 if required else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,64 @@
+"""
+Spacing between a share's weeks across year boundaries.
+Within a year take2 and rebalance2 keep a 10% share's weeks at least
+MIN_TEN_PERCENT_SPACING apart, but the last week of one year and the first
+of the next were never compared.  SpacingIndex puts every week on one
+continuous axis of calendar weeks (the week's start date in weeks since
+0001-01-01), so the closed season between December and March counts like
+any other time, and lists the pairs of consecutive weeks that are too close
+across a boundary.
+
+Within a year the house weeks are consecutive, so the gap in calendar weeks
+is the gap in week indices.  Across a boundary the closed season puts at
+least 12 weeks between the last week of one year and the first of the next,
+more than MIN_TEN_PERCENT_SPACING, so this is a check that the season
+layout still guarantees that, not a constraint generation has to search
+around.
+"""
+
+import datetime
+from bisect import insort
+from typing import Dict, Iterable, List, Tuple
+
+DAYS_PER_WEEK = 7
+
+
+class SpacingIndex:
+    def __init__(self, shares: Iterable[str], min_spacing: int):
+        self.min_spacing = min_spacing
+        self.positions: Dict[str, List[int]] = {share: [] for share in shares}
+
+    @classmethod
+    def from_schedule(cls, schedule, shares: Iterable[str], min_spacing: int) -> "SpacingIndex":
+        index = cls(shares, min_spacing)
+        for house_year in schedule:
+            index.add_year(house_year)
+        return index
+
+    @staticmethod
+    def position(start: datetime.date) -> int:
+        """Calendar weeks from 0001-01-01 to the week starting on start (a Sunday)."""
+        return start.toordinal() // DAYS_PER_WEEK
+
+    @staticmethod
+    def start_of(pos: int) -> datetime.date:
+        return datetime.date.fromordinal(pos * DAYS_PER_WEEK)
+
+    def add_year(self, house_year):
+        for week in house_year.weeks:
+            if week.share in self.positions:
+                self.add(week.share, self.position(week.start))
+
+    def add(self, share: str, pos: int):
+        insort(self.positions[share], pos)
+
+    def violations(self) -> List[Tuple[str, datetime.date, datetime.date]]:
+        """(share, week start, next week start) for every pair of consecutive
+        weeks less than min_spacing apart in different calendar years."""
+        found = []
+        for share, positions in self.positions.items():
+            for a, b in zip(positions, positions[1:]):
+                start_a, start_b = self.start_of(a), self.start_of(b)
+                if start_a.year != start_b.year and b - a < self.min_spacing:
+                    found.append((share, start_a, start_b))
+        return found
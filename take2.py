@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
-import pprint
-
 from date_finders import *
+from itertools import islice
+import instrumentation
+import roster
+from spacing_index import SpacingIndex
+from week_masks import WeekMasks, bit, has_bit, iter_bits
 
 
 # build a schedule for the Winship House.  We only use 40 weeks of the year.  10% shares get 4 weeks,
@@ -31,94 +34,76 @@ Jordan              5%
 David               5%
 Hugh & Ann Laurel   5%
 Lane C              5%
+
+The roster itself lives in roster.json.
 """
 
-ten_precent_shares = [
-    "frank_may",
-    "hankey",
-    "eddie",
-    "richard",
-    "frank_latimer",
-]
+ROSTER = roster.default_roster()
 
-five_percent_shares = [
-    "joe",
-    "lane",
-    "hayley",
-    "david",
-    "jim",
-    "myers",
-    "jordan",
-    "becca",
-    "hugh",
-    "will",
-]
+ten_precent_shares = ROSTER.ten_percent_shares
 
-shares_pairs = [
-    ("hankey", "hankey"),
-    ("joe", "jim"),
-    ("eddie", "eddie"),
-    ("lane", "myers"),
-    ("richard", "richard"),
-    ("will", "becca"),
-    ("frank_latimer", "frank_latimer"),
-    ("hayley", "jordan"),
-    ("frank_may", "frank_may"),
-    ("david", "hugh"),
-]
+five_percent_shares = ROSTER.five_percent_shares
 
-odd_holiday_shares = [
-    [
-        "frank_may",
-        "jim",
-        "hankey",
-        "myers",
-        "eddie",
-        "jordan",
-        "richard",
-        "david",
-        "frank_latimer",
-        "becca",
-    ],
-    [
-        "hankey",
-        "lane",
-        "frank_may",
-        "joe",
-        "eddie",
-        "hayley",
-        "richard",
-        "hugh",
-        "frank_latimer",
-        "will",
-    ],
-]
-even_holiday_shares = [
-    [
-        "richard",
-        "lane",
-        "frank_latimer",
-        "joe",
-        "frank_may",
-        "hugh",
-        "hankey",
-        "hayley",
-        "eddie",
-        "will",
-    ],
-    [
-        "richard",
-        "jim",
-        "frank_latimer",
-        "becca",
-        "frank_may",
-        "david",
-        "hankey",
-        "jordan",
-        "eddie",
-        "myers",
-    ],
+shares_pairs = ROSTER.shares_pairs
+
+odd_holiday_shares = ROSTER.odd_holiday_shares
+
+even_holiday_shares = ROSTER.even_holiday_shares
+
+
+def pretty_print(obj):
+    # pprint drags in dataclasses and inspect, so only import it for the
+    # debugging output that uses it
+    import pprint
+
+    pprint.pprint(obj)
+
+# which entry of HouseYear.rotated_shares gets each holiday
+HOLIDAY_ROTATION_INDEX = {
+    "Memorial Day": 5,
+    "Independence Day": 10,
+    "Labor Day": 6,
+    "Thanksgiving": 11,
+    "Christmas": 12,
+}
+
+# how far a 10% share's week may be nudged from every tenth week before we
+# search the rest of the year
+MAX_NUDGE_WEEKS = 2
+
+# how many placements compute_initial_shares' search in step order tries
+# before it searches again most constrained step first, and how many that
+# one tries before placing shares one by one
+MAX_INITIAL_PLACEMENTS = 200
+MAX_CONSTRAINED_PLACEMENTS = 2000
+
+# the most_constrained_step search only needs to tell the step with the
+# fewest placements from the others, so it stops counting at this many
+MAX_PLACEMENTS_COUNTED = 20
+
+# fewest weeks allowed between two weeks of a 10% share in the same year;
+# across a year boundary the closed season always keeps them further apart
+MIN_TEN_PERCENT_SPACING = 8
+
+# (max_nudge, min_spacing, one_of_each_kind) for a 10% share's weeks: first
+# stay within a couple of weeks of every tenth week, then search the whole
+# year; only a relaxed year gives up on the spacing and last of all the kinds
+TEN_PERCENT_ATTEMPTS = [
+    (MAX_NUDGE_WEEKS, MIN_TEN_PERCENT_SPACING, True),
+    (None, MIN_TEN_PERCENT_SPACING, True),
 ]
+RELAXED_TEN_PERCENT_ATTEMPTS = [(None, 0, True), (None, 0, False)]
+
+
+class ScheduleGenerationError(Exception):
+    """A year of a multi-year schedule couldn't be generated; the cause is
+    the original exception."""
+
+    def __init__(self, year, reason):
+        super().__init__(f"{year}: {reason}")
+        self.year = year
+        self.reason = reason
+
 
 class AllocatedWeek:
     def __init__(self, start, kind, end=None, holiday=None, share=None):
@@ -152,6 +137,11 @@ def rotate_list(lst, n):
     return lst[n:] + lst[:n]
 
 
+# a 5% share's two weeks are one of these pairs, and the other one next year
+HOT_COLD = frozenset({"hot", "cold"})
+WARM_COOL = frozenset({"warm", "cool"})
+
+
 def opposite_kind(kind):
     if kind == "cool":
         return "warm"
@@ -175,26 +165,38 @@ def uniq_list(lst):
 
 
 class HouseYear:
-    def __init__(self, year, debug=False):
+    def __init__(self, year, debug=False, roster=None, holidays=None, allow_relaxed=False, previous_year=None):
         self.year = year
         self.debug = debug
+        # with allow_relaxed, a week that can't be placed under the rules is
+        # placed anyway and described in self.relaxed; otherwise it raises
+        self.allow_relaxed = allow_relaxed
+        self.relaxed = []
+        self.roster = roster or ROSTER
+        # {holiday: share} overriding the rotation, e.g. from holiday_rotation.plan_holidays
+        self.holidays = holidays
+        # {share: kinds} each 5% share needs this year to alternate with previous_year
+        self.required_kinds = (
+            alternating_kinds(five_percent_kinds(previous_year, self.roster))
+            if previous_year is not None else {}
+        )
         self.rotated_shares = self.get_holiday_shares()
         if self.debug:
             print(f"rotated_shares: {self.rotated_shares}")
         self.weeks = []
+        self.free = None
 
     def get_holiday_shares(self):
         year_offset = self.year_offset()
         if self.debug:
             print(f"year_offset: {year_offset}")
         if self.year % 2 == 0:
-            return rotate_list(even_holiday_shares[0], year_offset) + rotate_list(
-                even_holiday_shares[1], year_offset
-            )
+            holiday_shares = self.roster.even_holiday_shares
         else:
-            return rotate_list(odd_holiday_shares[0], year_offset) + rotate_list(
-                odd_holiday_shares[1], year_offset
-            )
+            holiday_shares = self.roster.odd_holiday_shares
+        return rotate_list(holiday_shares[0], year_offset) + rotate_list(
+            holiday_shares[1], year_offset
+        )
             # return rotate_list(odd_holiday_shares[0] + odd_holiday_shares[1], year_offset)
 
     def year_offset(self):
@@ -250,12 +252,13 @@ class HouseYear:
                     late_cold_weeks_start(self.year) + timedelta(weeks=i), "cold"
                 )
             )
+        self.free = WeekMasks(self.weeks)
 
     def is_ten_percent_share(self, share):
-        return share in ten_precent_shares
+        return self.roster.is_ten_percent(share)
 
     def is_five_percent_share(self, share):
-        return share in five_percent_shares
+        return self.roster.is_five_percent(share)
 
     def holiday_weeks(self):
         return {
@@ -266,79 +269,217 @@ class HouseYear:
             christmas_week_start(self.year): "Christmas",
         }
 
-    def compute_holidays(self):
-        for index, week in enumerate(self.weeks):
-            if week.start == memorial_day_week_start(self.year):
-                week.holiday = "Memorial Day"
-                self.allocate_week(index, self.rotated_shares[5])
-
-            if week.start == independence_day_week_start(self.year):
-                week.holiday = "Independence Day"
-                self.allocate_week(index, self.rotated_shares[10])
-
-            if week.start == labor_day_week_start(self.year):
-                week.holiday = "Labor Day"
-                self.allocate_week(index, self.rotated_shares[6])
-
-            if week.start == thanksgiving_week_start(self.year):
-                week.holiday = "Thanksgiving"
-                self.allocate_week(index, self.rotated_shares[11])
-
-            if week.start == christmas_week_start(self.year):
-                week.holiday = "Christmas"
-                self.allocate_week(index, self.rotated_shares[12])
-
-        # now that we have the holidays allocated, let's give the 10 percenters their other weeks
-        for index, week in enumerate(self.weeks):
-            if week.start in self.holiday_weeks().keys():
-                if self.is_ten_percent_share(week.share):
-                    self.allocate_weeks_ten_percent(index)
+    def holiday_shares(self):
+        """Who gets each holiday this year: the plan passed in, or else the
+        roster's rotation."""
+        if self.holidays is not None:
+            return self.holidays
+        return {
+            holiday: self.rotated_shares[index]
+            for holiday, index in HOLIDAY_ROTATION_INDEX.items()
+        }
 
-        # now the 5 percenters their other weeks
-        if self.debug:
-            print(f"compute_remaining_five_percent_shares")
-        skip_index = 20
+    def compute_holidays(self):
+        holiday_shares = self.holiday_shares()
+        holiday_weeks = self.holiday_weeks()
+        if self.holidays is None:
+            holiday_shares = self.alternating_holiday_shares(holiday_shares, holiday_weeks)
+        else:
+            self.check_planned_holidays(holiday_shares, holiday_weeks)
         for index, week in enumerate(self.weeks):
-            if index < skip_index:
+            if week.start in holiday_weeks:
+                week.holiday = holiday_weeks[week.start]
+                self.free.holidays |= bit(index)
+                self.allocate_week(index, holiday_shares[week.holiday])
+
+    def may_take(self, share, kind):
+        """Whether the share can hold a week of this kind and still alternate."""
+        return kind in self.required_kinds.get(share, (kind,))
+
+    def alternating_holiday_shares(self, holiday_shares, holiday_weeks):
+        """The rotation's holiday shares, except that a 5% share whose holiday
+        is of a kind it can't have this year hands it to its pair partner, or
+        failing that to the first 5% share in the rotation that can take it."""
+        kinds = {holiday_weeks[week.start]: week.kind for week in self.weeks if week.start in holiday_weeks}
+        shares = dict(holiday_shares)
+        for holiday, share in holiday_shares.items():
+            if self.may_take(share, kinds[holiday]):
                 continue
-            if week.start in self.holiday_weeks().keys():
-                if self.is_five_percent_share(week.share):
-                    self.allocate_weeks_five_percent(index)
+            for candidate in [self.roster.pair_of.get(share)] + self.rotated_shares:
+                if (self.is_five_percent_share(candidate) and candidate not in shares.values()
+                        and self.may_take(candidate, kinds[holiday])):
+                    instrumentation.count("allocate.holidays_handed_on")
+                    if self.debug:
+                        print(f"{holiday} goes to {candidate} so {share} can alternate")
+                    shares[holiday] = candidate
+                    break
+        return shares
+
+    def check_planned_holidays(self, holiday_shares, holiday_weeks):
+        """A holiday plan is followed as given, so a 5% share it gives a
+        holiday of the wrong kind can't alternate this year: raise, or with
+        allow_relaxed place every 5% share without alternating."""
+        for week in self.weeks:
+            holiday = holiday_weeks.get(week.start)
+            share = holiday_shares.get(holiday)
+            if holiday is not None and not self.may_take(share, week.kind):
+                if not self.allow_relaxed:
+                    raise Exception(
+                        f"{self.year} can't keep the 5% shares alternating: "
+                        f"the holiday plan gives {share} {holiday}, a {week.kind} week"
+                    )
+                self.required_kinds = {}
+                return
 
     def compute_initial_shares(self):
         if self.debug:
             print(f"compute_initial_shares")
-        allocated_shares = set(
-            [
-                share
-                for share in [week.share for week in self.weeks]
-                if share is not None
-            ]
-        )
-        # print(f"allocated_shares: {allocated_shares}")
-
-        remaining_shares = uniq_list(
-            [share for share in self.rotated_shares if share not in allocated_shares]
-        )
+        steps = self.placement_steps()
         if self.debug:
-            print(f"remaining_shares: {remaining_shares}")
+            print(f"placement_steps: {steps}")
 
-        for share in remaining_shares:
+        # search for weeks that let every 10% share keep its spacing and
+        # every 5% share alternate; if there are none, place the shares one
+        # by one, which relaxes the rules (allow_relaxed) or raises
+        if self.place_steps(steps):
+            return
+        instrumentation.count("allocate.initial_search_failed")
+        for share, index in steps:
+            if index is not None:
+                self.allocate_weeks(index)
+                continue
+            index = self.free.next_open(1, mask=self.initial_mask(share))
+            if index is None or index == 0:
+                continue
+            self.claim_week(index, share)
+            if self.is_ten_percent_share(share):
+                self.allocate_weeks(index)
+
+    def placement_steps(self):
+        """(share, index) for every share placed before the leftover 5% weeks,
+        in order: each 10% holiday holder's other weeks run on from its first
+        holiday, each 5% holiday holder from index 20 on gets a week after its
+        holiday, and each share without a holiday (index None) starts on the
+        first open week from index 1."""
+        holiday_weeks = self.holiday_weeks()
+        steps = []
+        for index, week in enumerate(self.weeks):
+            if (week.start in holiday_weeks and self.is_ten_percent_share(week.share)
+                    and week.share not in dict(steps)):
+                steps.append((week.share, index))
+        for index, week in enumerate(self.weeks):
+            if index >= 20 and week.start in holiday_weeks and self.is_five_percent_share(week.share):
+                steps.append((week.share, index))
+        allocated_shares = {week.share for week in self.weeks if week.share is not None}
+        steps += [
+            (share, None)
+            for share in uniq_list([share for share in self.rotated_shares if share not in allocated_shares])
+        ]
+        return steps
+
+    def initial_mask(self, share):
+        """Weeks the share may start on: a 5% share starts on one of the kinds
+        it needs this year, and allocate_weeks_five_percent gives it the other."""
+        kinds = self.required_kinds.get(share)
+        return self.free.of_kinds(kinds) if kinds else None
+
+    def place_steps(self, steps):
+        """Place every step the first way, in search order, that lets the
+        steps after it be placed too.  If MAX_INITIAL_PLACEMENTS placements
+        don't find one, search again placing the most constrained 10% step
+        next, which packs rosters with more 10% shares.  Returns False, with
+        nothing placed, if neither search does."""
+        saved = self.save_placements()
+        searches = [(first_step, MAX_INITIAL_PLACEMENTS), (self.most_constrained_step, MAX_CONSTRAINED_PLACEMENTS)]
+        for choose, budget in searches:
+            if self.search_steps(steps, [budget], choose):
+                return True
+            instrumentation.count("allocate.search_out_of_budget")
+            # running out of budget leaves the deeper placements claimed
+            self.restore_placements(saved)
+        return False
+
+    def save_placements(self):
+        return [week.share for week in self.weeks], self.free.open, dict(self.free.shares)
+
+    def restore_placements(self, saved):
+        shares, self.free.open, shares_masks = saved
+        self.free.shares = dict(shares_masks)
+        for week, share in zip(self.weeks, shares):
+            week.share = share
+
+    def search_steps(self, steps, budget, choose):
+        if not steps:
+            return True
+        position = choose(steps)
+        (share, index), rest = steps[position], steps[:position] + steps[position + 1:]
+        for _ in self.placements(share, index):
+            budget[0] -= 1
+            if self.kinds_suffice() and self.search_steps(rest, budget, choose):
+                return True
+            # out of budget: stop before resuming any placement, since the
+            # ones below this step are still claimed
+            if budget[0] <= 0:
+                return False
+            instrumentation.count("allocate.initial_backtracks")
             if self.debug:
-                print(f"share: {share}")
-            for index, week in enumerate(self.weeks):
-                if index == 0:
-                    continue
-                if week.share is not None:
-                    continue
-                week.share = share
+                print(f"backtracked {share}")
+        return False
+
+    def most_constrained_step(self, steps):
+        """Position of the 10% step with the fewest placements left, or of
+        the first step once they are all placed."""
+        counts = []
+        for position, (share, index) in enumerate(steps):
+            if self.is_ten_percent_share(share):
+                saved = self.save_placements()
+                found = len(list(islice(self.placements(share, index), MAX_PLACEMENTS_COUNTED)))
+                self.restore_placements(saved)
+                counts.append((found, position))
+        return min(counts)[1] if counts else 0
+
+    def kinds_suffice(self):
+        """Whether each kind still has an open week for every share that
+        needs one: a 10% share for each kind it lacks, a 5% share for each
+        kind of its pair it lacks.  Lets the search back out of a dead end
+        before placing the shares that would run into it."""
+        needed = dict.fromkeys(self.free.kind_masks, 0)
+        for share in self.roster.shares:
+            held = {kind for kind in self.free.kind_masks if self.free.has_kind(share, kind)}
+            if self.is_ten_percent_share(share):
+                kinds = set(self.free.kind_masks)
+            elif self.is_five_percent_share(share) and self.free.count(share) < 2:
+                kinds = set(self.required_kinds.get(share, ())) or {opposite_kind(kind) for kind in held}
+            else:
+                continue
+            for kind in kinds - held:
+                needed[kind] += 1
+        return all(
+            (self.free.open & self.free.kind_masks[kind]).bit_count() >= count for kind, count in needed.items()
+        )
+
+    def placements(self, share, index):
+        """Yield once per way to place one step, nearest the greedy choice
+        first, with the weeks claimed while suspended; resuming releases them."""
+        if index is None:
+            candidates = self.free.open & ~bit(0)
+            mask = self.initial_mask(share)
+            if mask is not None:
+                candidates &= mask
+            for start in iter_bits(candidates):
+                self.claim_week(start, share)
                 if self.is_ten_percent_share(share):
-                    self.allocate_weeks(index)
-                break
-        # for share in remaining_shares:
-        #     weeks = allocate_weeks(weeks, share)
-        # remove all the people that have weeks already allocated
-        # for week in weeks:
+                    yield from self.ten_percent_placements(share, start)
+                else:
+                    yield True
+                self.release_week(start)
+        elif self.is_ten_percent_share(share):
+            yield from self.ten_percent_placements(share, index)
+        else:
+            for candidate in self.free.open_from(index + 10, opposite_kind(self.weeks[index].kind)):
+                self.claim_week(candidate, share)
+                yield True
+                self.release_week(candidate)
 
     def compute_remaining_five_percent_shares(self):
         if self.debug:
@@ -347,7 +488,7 @@ class HouseYear:
         share_counts = self.get_share_count()
 
         # Find all 5% shares that only have one week
-        for share in five_percent_shares:
+        for share in self.roster.five_percent_shares:
             if share not in share_counts:
                 continue
             if len(share_counts[share]) == 1:
@@ -359,10 +500,10 @@ class HouseYear:
 
     def allocate_weeks(self, index):
         share = self.weeks[index].share
-        if share in ten_precent_shares:
+        if self.is_ten_percent_share(share):
             self.allocate_weeks_ten_percent(index)
             return
-        elif share in five_percent_shares:
+        elif self.is_five_percent_share(share):
             self.allocate_weeks_five_percent(index)
             return
         raise Exception(f"Unknown share: {share}")
@@ -374,44 +515,42 @@ class HouseYear:
         if self.debug:
             print(f"allocate_weeks_five_percent: {self.weeks[index]}")
         share = self.weeks[index].share
-        # idx = index
-        # current_kind = weeks[idx].kind
-        # while True:
-        #     if weeks[idx-1].kind != current_kind:
-        #         break
-        #     idx = idx - 1
 
         looking_for = opposite_kind(self.weeks[index].kind)
-        idx = wrap_around(self.weeks, index + 10)
-        counter = 0
-        while True:
+        idx = self.free.next_open(index + 10, looking_for)
+        if idx is None and self.allow_relaxed:
+            # every week of the opposite kind is taken, so no choice keeps the
+            # kinds balanced; fall back to the next open week of any kind
             if self.debug:
-                print(
-                    f"share: {share}, looking_for: {looking_for}, idx: {idx}, kind: {self.weeks[idx].kind}"
-                )
-            if self.weeks[idx].kind == looking_for and self.weeks[idx].share is None:
-                if self.debug:
-                    print(f"found it {idx}")
-                self.weeks[idx].share = share
-                if self.debug:
-                    print(f"weeks[{idx}]: {self.weeks[idx]}")
-                break
-            counter += 1
-            if counter > 41:
-                if self.debug:
-                    pprint.pprint(self.weeks)
-                    self.print_share_count()
-                    print(f"couldn't find a week for {share}")
-                # break
-                raise Exception(f"counter: {counter}")
-            idx = wrap_around(self.weeks, idx + 1)
+                print(f"no {looking_for} week left for {share}, taking any open week")
+            idx = self.free.next_open(index + 10)
+            if idx is not None:
+                self.record_relaxed(f"{share} has no {looking_for} week")
+        if idx is None:
+            if self.debug:
+                pretty_print(self.weeks)
+                self.print_share_count()
+            raise Exception(f"No {looking_for} week left for {share}")
+        if self.debug:
+            print(f"found it {idx}")
+        self.claim_week(idx, share)
+        if self.debug:
+            print(f"weeks[{idx}]: {self.weeks[idx]}")
 
     def allocate_week(self, index, share):
         self.assert_everyone_has_the_right_number_of_weeks_or_less()
         if self.debug:
             print(f"allocate_week: {self.weeks[index]}, {share}")
         assert self.weeks[index].share is None, f"weeks[{index}]: {self.weeks[index]}"
+        self.claim_week(index, share)
+
+    def claim_week(self, index, share):
         self.weeks[index].share = share
+        self.free.take(index, share)
+
+    def release_week(self, index):
+        self.free.release(index, self.weeks[index].share)
+        self.weeks[index].share = None
 
     def skip_forward_ten_weeks(self, start_index):
         """Skip forward 10 weeks, not counting Tate annual week
@@ -433,37 +572,82 @@ class HouseYear:
         return next_index
 
     def allocate_weeks_ten_percent(self, index):
+        if self.try_allocate_weeks_ten_percent(index, relax=self.allow_relaxed):
+            return
+        if self.debug:
+            pretty_print(self.weeks)
+        raise Exception(f"No weeks available for {self.weeks[index].share}")
+
+    def try_allocate_weeks_ten_percent(self, index, relax):
+        """Place the other three weeks of the 10% share holding index.
+        Returns False, with nothing placed, if they don't fit."""
         if self.debug:
             print(f"allocate_weeks_ten_percent: {self.weeks[index]}")
         share = self.weeks[index].share
-        for i in range(0, 3):
+        attempts = TEN_PERCENT_ATTEMPTS + (RELAXED_TEN_PERCENT_ATTEMPTS if relax else [])
+        for max_nudge, min_spacing, one_of_each_kind in attempts:
+            if next(self.ten_percent_weeks(
+                share, index, self.ten_percent_weeks_left(share), max_nudge, min_spacing, one_of_each_kind
+            ), False):
+                if min_spacing < MIN_TEN_PERCENT_SPACING:
+                    kinds = "" if one_of_each_kind else " or one week of each kind"
+                    self.record_relaxed(f"{share} placed without the spacing{kinds}")
+                return True
+            instrumentation.count("allocate.ten_percent_backtracks")
             if self.debug:
-                print(f"share: {share}, i: {i}")
-
-            next_index = self.skip_forward_ten_weeks(index)
-
-            if self.weeks[next_index].share is None:
-                self.allocate_week(next_index, share)
-            elif self.weeks[wrap_around(self.weeks, next_index + 1)].share is None:
-                if self.debug:
-                    print(f"nudged it forward a week")
-                self.allocate_week(wrap_around(self.weeks, next_index + 1), share)
-            elif self.weeks[next_index - 1].share is None:
-                if self.debug:
-                    print(f"nudged it back a week")
-                self.allocate_week(next_index - 1, share)
-            elif self.weeks[wrap_around(self.weeks, next_index + 2)].share is None:
-                if self.debug:
-                    print(f"nudged it forward two weeks")
-                self.allocate_week(wrap_around(self.weeks, next_index + 2), share)
-            elif self.weeks[next_index - 2].share is None:
-                if self.debug:
-                    print(f"nudged it back two weeks")
-                self.allocate_week(next_index - 2, share)
-            else:
-                pprint.pprint(self.weeks)
-                raise Exception(f"No share available for week {next_index} for {share}")
-            index = next_index
+                print(
+                    f"backtracked {share} (max_nudge={max_nudge}, "
+                    f"min_spacing={min_spacing}, one_of_each_kind={one_of_each_kind})"
+                )
+        return False
+
+    def ten_percent_placements(self, share, index):
+        """Each way to place the rest of a 10% share's weeks after index
+        without relaxing, as ten_percent_weeks yields them."""
+        for max_nudge, min_spacing, one_of_each_kind in TEN_PERCENT_ATTEMPTS:
+            yield from self.ten_percent_weeks(
+                share, index, self.ten_percent_weeks_left(share), max_nudge, min_spacing, one_of_each_kind
+            )
+
+    def ten_percent_weeks(
+        self, share, index, remaining, max_nudge, min_spacing, one_of_each_kind
+    ):
+        """Place the remaining weeks for a 10% share, each as close as possible to
+        ten weeks after the last, yielding True once per way that fits with the
+        weeks claimed; resuming releases them and backtracks to the next."""
+        if remaining == 0:
+            yield True
+            return
+        next_index = self.skip_forward_ten_weeks(index)
+        # open weeks far enough from the share's others and, if asked, of a
+        # kind it doesn't have yet
+        allowed = ~self.free.too_close(share, min_spacing)
+        if one_of_each_kind:
+            allowed &= self.free.missing_kinds(share)
+        for candidate in self.free.nearest(next_index, mask=allowed):
+            nudge = (candidate - next_index) % len(self.weeks)
+            if max_nudge is not None and min(nudge, len(self.weeks) - nudge) > max_nudge:
+                break
+            if self.debug and candidate != next_index:
+                print(f"nudged {share} from {next_index} to {candidate}")
+            self.allocate_week(candidate, share)
+            yield from self.ten_percent_weeks(
+                share, next_index, remaining - 1, max_nudge, min_spacing, one_of_each_kind
+            )
+            self.release_week(candidate)
+
+    def ten_percent_weeks_left(self, share):
+        return roster.WEEKS_PER_PERCENT[10] - self.free.count(share)
+
+    def record_relaxed(self, description):
+        instrumentation.count("allocate.relaxed")
+        self.relaxed.append(description)
+
+    def has_kind(self, share, kind):
+        return self.free.has_kind(share, kind)
+
+    def far_enough_apart(self, share, index, min_spacing):
+        return not has_bit(self.free.too_close(share, min_spacing), index)
 
     def get_share_count(self):
         share_counts = {}
@@ -491,48 +675,113 @@ class HouseYear:
 
     def print_share_count(self):
         share_counts = self.get_share_count()
-        pprint.pprint(share_counts)
+        pretty_print(share_counts)
 
     def print_kind_count(self):
         kind_counts = {}
         for week in self.weeks:
             kind_counts[week.kind] = kind_counts.get(week.kind, 0) + 1
-        pprint.pprint(kind_counts)
+        pretty_print(kind_counts)
 
     def assert_everyone_has_the_right_number_of_weeks_or_less(self):
-        for share in ten_precent_shares:
-            assert len([week for week in self.weeks if week.share == share]) <= 4
-        for share in five_percent_shares:
-            assert len([week for week in self.weeks if week.share == share]) <= 2
+        for share_id, share in enumerate(self.roster.shares):
+            assert self.free.count(share) <= self.roster.weeks[share_id]
 
     def compute_all(self):
-        self.compute_schedule()
-        self.compute_holidays()
-        self.compute_initial_shares()
-        self.compute_remaining_five_percent_shares()
-
-
-def generate_schedule(year, debug=False):
-    """Generate a single year's schedule and return it"""
-    house_year = HouseYear(year, debug=debug)
+        with instrumentation.timer("compute_schedule"):
+            self.compute_schedule()
+        with instrumentation.timer("compute_holidays"):
+            self.compute_holidays()
+        with instrumentation.timer("compute_initial_shares"):
+            self.compute_initial_shares()
+        with instrumentation.timer("compute_remaining_five_percent_shares"):
+            self.compute_remaining_five_percent_shares()
+
+
+def generate_schedule(year, debug=False, roster=None, holidays=None, allow_relaxed=False, previous_year=None):
+    """Generate a single year's schedule and return it.  With previous_year,
+    every 5% share is placed on the kinds that alternate with it."""
+    house_year = HouseYear(
+        year, debug=debug, roster=roster, holidays=holidays, allow_relaxed=allow_relaxed,
+        previous_year=previous_year,
+    )
     house_year.compute_all()
     house_year.assert_share_count()
     return house_year
 
-def generate_multi_year_schedule(start_year=2025, num_years=20):
-    """Generate a list of schedules for multiple years"""
+def generate_following_year(year, previous_year, roster, holidays=None, allow_relaxed=False):
+    """Generate a year after previous_year, placing each 5% share on the
+    hot/cold or warm/cool pair it didn't have last year.  A year that still
+    can't alternate (a holiday plan giving a 5% share the wrong kind) raises,
+    or with allow_relaxed is recorded in its relaxed list."""
+    house_year = generate_schedule(
+        year, roster=roster, holidays=holidays, allow_relaxed=allow_relaxed, previous_year=previous_year
+    )
+    if previous_year is None or kinds_alternate(previous_year, house_year, roster):
+        return house_year
+    if not allow_relaxed:
+        raise Exception(f"{year} can't keep the 5% shares alternating with {previous_year.year}")
+    house_year.record_relaxed(f"5% shares don't alternate with {previous_year.year}")
+    return house_year
+
+def generate_multi_year_schedule(start_year=2025, num_years=20, roster=None, holiday_plan=None, allow_relaxed=False):
+    """Generate a list of schedules for multiple years.
+    holiday_plan is {year: {holiday: share}}; years it leaves out use the rotation.
+    A year that can't keep the rules raises, unless allow_relaxed, when it is
+    generated anyway with what was given up in its HouseYear.relaxed."""
+    share_roster = roster or ROSTER
     schedules = []
     for year in range(start_year, start_year + num_years):
+        holidays = holiday_plan.get(year) if holiday_plan else None
         try:
-            schedule = generate_schedule(year)
+            previous_year = schedules[-1] if schedules else None
+            schedule = generate_following_year(year, previous_year, share_roster, holidays, allow_relaxed)
             schedules.append(schedule)
         except Exception as e:
-            print(f"Error in year {year}: {e}")
-            raise e
+            instrumentation.count("generate.failed_years")
+            raise ScheduleGenerationError(year, e) from e
     return schedules
 
-def test_schedule(schedules):
+def five_percent_kinds(house_year, roster):
+    kinds = {share: set() for share in roster.five_percent_shares}
+    for week in house_year.weeks:
+        if week.share in kinds:
+            kinds[week.share].add(week.kind)
+    return kinds
+
+
+def first_step(steps):
+    return 0
+
+
+def alternating_kinds(previous_kinds):
+    """{share: the pair of kinds it needs this year} from last year's
+    five_percent_kinds; shares that didn't have a whole pair are left free."""
+    required = {}
+    for share, kinds in previous_kinds.items():
+        if HOT_COLD <= kinds:
+            required[share] = WARM_COOL
+        elif WARM_COOL <= kinds:
+            required[share] = HOT_COLD
+    return required
+
+
+def kinds_alternate(previous_year, house_year, roster):
+    """Whether every 5% share with hot and cold weeks last year has warm and
+    cool this year, and the other way round."""
+    previous = five_percent_kinds(previous_year, roster)
+    current = five_percent_kinds(house_year, roster)
+    for share, prev_kinds in previous.items():
+        if {"hot", "cold"}.issubset(prev_kinds) and not {"warm", "cool"}.issubset(current[share]):
+            return False
+        if {"warm", "cool"}.issubset(prev_kinds) and not {"hot", "cold"}.issubset(current[share]):
+            return False
+    return True
+
+
+def test_schedule(schedules, roster=None):
     """Test a multi-year schedule for validity"""
+    roster = roster or schedules[0].roster
     holiday_counts = {}
     kind_counts = {}
     total_holidays = 0
@@ -552,7 +801,7 @@ def test_schedule(schedules):
 
 
         # Track kinds for 5% shares
-        current_year_kinds = {share: set() for share in five_percent_shares}
+        current_year_kinds = {share: set() for share in roster.five_percent_shares}
 
         # Count holidays and kinds
         for week in house_year.weeks:
@@ -561,7 +810,7 @@ def test_schedule(schedules):
                     kind_counts[week.share] = {"hot": 0, "warm": 0, "cool": 0, "cold": 0}
                 kind_counts[week.share][week.kind] += 1
 
-                if week.share in five_percent_shares:
+                if roster.is_five_percent(week.share):
                     current_year_kinds[week.share].add(week.kind)
 
             if week.holiday and week.holiday != "Tate Annual":
@@ -574,7 +823,7 @@ def test_schedule(schedules):
 
         # Check alternating pattern for 5% shares
         if previous_year_kinds:
-            for share in five_percent_shares:
+            for share in roster.five_percent_shares:
                 if share in previous_year_kinds:
                     prev_kinds = previous_year_kinds[share]
                     curr_kinds = current_year_kinds[share]
@@ -588,7 +837,7 @@ def test_schedule(schedules):
                             f"Share {share} in year {year} has {curr_kinds} after having warm/cool in previous year"
 
         # Verify spacing for 10% shares
-        for share in ten_precent_shares:
+        for share in roster.ten_percent_shares:
             share_weeks = [
                 i for i, week in enumerate(house_year.weeks)
                 if week.share == share and week.holiday != "Tate Annual"
@@ -598,13 +847,20 @@ def test_schedule(schedules):
                 spacing = share_weeks[i + 1] - share_weeks[i]
                 spacing_counts[spacing] = spacing_counts.get(spacing, 0) + 1
                 
-                assert spacing >= 8, (
+                assert spacing >= MIN_TEN_PERCENT_SPACING, (
                     f"Year {year}: Share {share} has weeks too close together. "
                     f"Weeks at indices {share_weeks[i]} and {share_weeks[i + 1]} "
                     f"are only {spacing} weeks apart"
                 )
         previous_year_kinds = current_year_kinds
 
+    # the closed season should keep them apart across year boundaries too
+    cross_year = SpacingIndex.from_schedule(schedules, roster.ten_percent_shares, MIN_TEN_PERCENT_SPACING)
+    for share, start, next_start in cross_year.violations():
+        raise AssertionError(
+            f"Share {share} has weeks too close together across years: {start} and {next_start}"
+        )
+
     return {
         'holiday_counts': holiday_counts,
         'kind_counts': kind_counts,
@@ -613,9 +869,10 @@ def test_schedule(schedules):
         'week_index_counts': week_index_counts
     }
 
-def test_schedule_results(schedule):
+def test_schedule_results(schedule, roster=None):
     """Main function to generate and test schedules"""
-    results = test_schedule(schedule)
+    roster = roster or schedule[0].roster
+    results = test_schedule(schedule, roster)
     num_years = len(schedule)
     print(f"\nDistribution over {num_years} years (Total holidays: {results['total_holidays']}):")
     
@@ -665,7 +922,7 @@ def test_schedule_results(schedule):
     
     for share, indices in results['week_index_counts'].items():
         if share and share != "everyone":
-            expected_count = 2 if share in ten_precent_shares else 1
+            expected_count = 2 if roster.is_ten_percent(share) else 1
             # Count anomalies for all possible week indices
             anomalies = 0
             for week_index in range(total_weeks):
@@ -694,6 +951,7 @@ if __name__ == "__main__":
     import doctest
 
     doctest.testmod()
+    instrumentation.enable_from_environment()
     house_year_2025 = HouseYear(2025)
     print(house_year_2025.rotated_shares)
     house_year_2026 = HouseYear(2026)
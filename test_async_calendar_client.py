@@ -0,0 +1,234 @@
+"""
+End-to-end tests for the async calendar client against a local stub
+Calendar API server.
+"""
+
+import asyncio
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+from async_calendar_client import AsyncCalendarClient, CalendarHTTPError
+
+CALENDAR_ID = "test@group.calendar.google.com"
+
+
+class StubCalendar:
+    """In-memory calendar state shared with the request handler."""
+
+    def __init__(self):
+        self.events = {}
+        self.next_id = 0
+        self.connections = 0
+        self.requests = []
+        self.queries = []
+        # statuses (and reasons) to fail the next requests with
+        self.failures = []
+        self.lock = threading.Lock()
+
+
+def make_handler(stub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with stub.lock:
+                stub.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, payload=None):
+            body = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def handle_request(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length)) if length else None
+            with stub.lock:
+                stub.requests.append((self.command, url.path, self.headers.get("Authorization")))
+                failure = stub.failures.pop(0) if stub.failures else None
+            if failure:
+                status, reason = failure
+                return self.send_json(status, {"error": {"code": status, "errors": [{"reason": reason}]}})
+
+            parts = [unquote(p) for p in url.path.split("/") if p]
+            # /calendar/v3/calendars/{calendarId}/events[/{eventId}]
+            event_id = parts[5] if len(parts) > 5 else None
+            with stub.lock:
+                if self.command == "GET" and event_id is None:
+                    query = parse_qs(url.query)
+                    stub.queries.append(query)
+                    items = sorted(stub.events.values(), key=lambda e: e["start"]["date"])
+                    if "privateExtendedProperty" in query:
+                        name, _, value = query["privateExtendedProperty"][0].partition("=")
+                        items = [e for e in items
+                                 if e.get("extendedProperties", {}).get("private", {}).get(name) == value]
+                    start = int(query.get("pageToken", ["0"])[0])
+                    size = int(query["maxResults"][0])
+                    page = {"items": items[start:start + size]}
+                    if start + size < len(items):
+                        page["nextPageToken"] = str(start + size)
+                    else:
+                        page["nextSyncToken"] = f"sync{len(stub.requests)}"
+                    return self.send_json(200, page)
+                if self.command == "POST":
+                    stub.next_id += 1
+                    event = dict(body, id=body.get("id") or f"e{stub.next_id}")
+                    stub.events[event["id"]] = event
+                    return self.send_json(200, event)
+                if event_id not in stub.events:
+                    return self.send_json(404, {"error": {"code": 404, "errors": [{"reason": "notFound"}]}})
+                if self.command == "GET":
+                    return self.send_json(200, stub.events[event_id])
+                if self.command == "PUT":
+                    stub.events[event_id] = dict(body, id=event_id)
+                    return self.send_json(200, stub.events[event_id])
+                if self.command == "DELETE":
+                    del stub.events[event_id]
+                    return self.send_json(204)
+
+        do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    return Handler
+
+
+@pytest.fixture
+def stub_server():
+    stub = StubCalendar()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(stub))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.base_url = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3"
+    yield stub
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, **kwargs):
+    async def no_sleep(delay):
+        pass
+
+    kwargs.setdefault("sleep", no_sleep)
+    return AsyncCalendarClient(token="t0k3n", base_url=stub.base_url, rng=random.Random(1), **kwargs)
+
+
+def event(day):
+    return {"summary": f"Week {day}", "start": {"date": f"2027-03-{day:02d}"}, "end": {"date": f"2027-03-{day + 1:02d}"}}
+
+
+def test_create_list_update_delete(stub_server):
+    async def run():
+        async with make_client(stub_server) as client:
+            created = await client.create_event(CALENDAR_ID, event(1))
+            updated = await client.update_event(CALENDAR_ID, created["id"], dict(event(1), summary="Joe"))
+            listed = await client.list_events(CALENDAR_ID, "2027-01-01T00:00:00Z", "2028-01-01T00:00:00Z")
+            await client.delete_event(CALENDAR_ID, created["id"])
+            return updated, listed
+
+    updated, listed = asyncio.run(run())
+
+    assert updated["summary"] == "Joe"
+    assert [e["summary"] for e in listed["items"]] == ["Joe"]
+    assert stub_server.events == {}
+    assert all(auth == "Bearer t0k3n" for _, _, auth in stub_server.requests)
+
+
+def test_get_event_by_id(stub_server):
+    async def run():
+        async with make_client(stub_server) as client:
+            created = await client.create_event(CALENDAR_ID, dict(event(1), id="wk1"))
+            return created, await client.get_event(CALENDAR_ID, "wk1"), await client.get_event(CALENDAR_ID, "missing")
+
+    created, found, missing = asyncio.run(run())
+
+    assert found == created
+    assert missing is None
+
+
+def test_list_by_extended_property_and_sync_token(stub_server):
+    tagged = dict(event(2), extendedProperties={"private": {"winship_year": "2027"}})
+
+    async def run():
+        async with make_client(stub_server) as client:
+            await client.create_event(CALENDAR_ID, event(1))
+            await client.create_event(CALENDAR_ID, tagged)
+            filtered = await client.list_events(CALENDAR_ID, None, None,
+                                                private_extended_property="winship_year=2027")
+            changes = await client.list_events(CALENDAR_ID, None, None, sync_token=filtered["nextSyncToken"])
+            return filtered, changes
+
+    filtered, changes = asyncio.run(run())
+
+    assert [e["summary"] for e in filtered["items"]] == ["Week 2"]
+    assert stub_server.queries[0]["privateExtendedProperty"] == ["winship_year=2027"]
+    assert "timeMin" not in stub_server.queries[0]
+    assert stub_server.queries[1]["syncToken"] == [filtered["nextSyncToken"]]
+    assert "nextSyncToken" in changes
+
+
+def test_concurrent_requests_reuse_a_bounded_pool(stub_server):
+    async def run():
+        async with make_client(stub_server, max_connections=3) as client:
+            await asyncio.gather(*(client.create_event(CALENDAR_ID, event(day)) for day in range(1, 25)))
+            return await client.list_all_events(CALENDAR_ID, "2027-01-01T00:00:00Z", "2028-01-01T00:00:00Z", max_results=10)
+
+    events = asyncio.run(run())
+
+    assert len(events) == 24
+    assert stub_server.connections <= 3
+
+
+def test_retries_rate_limits_with_backoff(stub_server):
+    stub_server.failures = [(429, "rateLimitExceeded"), (403, "userRateLimitExceeded"), (503, "backendError")]
+    delays = []
+
+    async def record_sleep(delay):
+        delays.append(delay)
+
+    async def run():
+        async with make_client(stub_server, sleep=record_sleep, backoff_base=1.0) as client:
+            return await client.create_event(CALENDAR_ID, event(1)), client.retries
+
+    created, retries = asyncio.run(run())
+
+    assert created["summary"] == "Week 1"
+    assert retries == 3
+    # full jitter: each delay is under its doubling cap
+    assert all(0 <= d <= 2 ** i for i, d in enumerate(delays))
+
+
+def test_forbidden_is_not_retried(stub_server):
+    stub_server.failures = [(403, "forbidden")]
+
+    async def run():
+        async with make_client(stub_server) as client:
+            await client.create_event(CALENDAR_ID, event(1))
+
+    with pytest.raises(CalendarHTTPError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.status == 403
+    assert not excinfo.value.is_rate_limit
+    assert len(stub_server.requests) == 1
+
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.failures = [(429, "rateLimitExceeded")] * 3
+
+    async def run():
+        async with make_client(stub_server, max_retries=2) as client:
+            await client.delete_event(CALENDAR_ID, "missing")
+
+    with pytest.raises(CalendarHTTPError) as excinfo:
+        asyncio.run(run())
+    assert excinfo.value.status == 429
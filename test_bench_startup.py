@@ -0,0 +1,16 @@
+"""
+Pytest tests that the entry points leave their heavy dependencies unimported.
+"""
+
+import pytest
+
+from bench_startup import COMMANDS, heavy_modules_loaded
+
+
+@pytest.mark.parametrize("name", sorted(COMMANDS))
+def test_entry_point_imports_nothing_heavy(name):
+    assert heavy_modules_loaded(COMMANDS[name]) == []
+
+
+def test_probe_sees_a_heavy_import():
+    assert heavy_modules_loaded("import asyncio") == ["asyncio"]
@@ -12,11 +12,17 @@ import take2
 import rebalance2
 from winship_calendar_core import (
     get_events_for_year,
+    format_share_name,
+    make_event_id,
     CalendarEvent
 )
 from google_calendar_wrapper import GoogleCalendarService
+from async_calendar_client import CalendarHTTPError
+from calendar_snapshot import CalendarSnapshot
+from schedule_diff import changed_events, diff_schedules, removed_event_ids
 from export_winship_schedule_to_google_calender import (
     CalendarExporter,
+    export_year,
     generate_schedule,
     WINSHIP_HOUSE_CALENDER_ID
 )
@@ -473,4 +479,140 @@ def test_calendar_export_august_gap_debug(mock_google_service, real_schedule):
 
     last_day = will_week.end_date - timedelta(days=1)
     assert will_week.start_date <= august_16 <= last_day, \
-        f"Will's week should cover Aug 16 (week: {will_week.start_date} to {last_day})"
\ No newline at end of file
+        f"Will's week should cover Aug 16 (week: {will_week.start_date} to {last_day})"
+
+class InMemoryCalendar:
+    """Calendar service keeping events by ID, counting writes"""
+
+    def __init__(self):
+        self.events = {}
+        self.writes = 0
+        self.list_calls = 0
+
+    def list_events(self, calendar_id, time_min, time_max, page_token=None,
+                    max_results=100, fields=None, private_extended_property=None,
+                    sync_token=None):
+        self.list_calls += 1
+        if private_extended_property is None:
+            # sync listing; this fake only knows the full state
+            return {"items": list(self.events.values()), "nextSyncToken": "t"}
+        name, _, value = private_extended_property.partition("=")
+        items = [e for e in self.events.values()
+                 if e.get("extendedProperties", {}).get("private", {}).get(name) == value]
+        return {"items": items}
+
+    def get_event(self, calendar_id, event_id):
+        return self.events.get(event_id)
+
+    def create_event(self, calendar_id, event):
+        if event["id"] in self.events:
+            raise CalendarHTTPError(409, b'{"error": {"errors": [{"reason": "duplicate"}]}}')
+        self.writes += 1
+        self.events[event["id"]] = event
+        return event
+
+    def update_event(self, calendar_id, event_id, event):
+        self.writes += 1
+        self.events[event_id] = event
+        return event
+
+    def delete_event(self, calendar_id, event_id):
+        self.writes += 1
+        del self.events[event_id]
+
+
+def test_reexporting_unchanged_schedule_makes_no_writes(real_schedule):
+    """Deterministic IDs make a second export of the same year a no-op"""
+    calendar = InMemoryCalendar()
+    exporter = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID)
+    events = get_events_for_year(real_schedule, 2027, 'monday-sunday')
+
+    first = exporter.sync_year(events, 2027)
+    writes_after_first = calendar.writes
+    second = exporter.sync_year(events, 2027)
+
+    assert first["created"] == len(events)
+    assert second == {"created": 0, "updated": 0, "deleted": 0, "unchanged": len(events)}
+    assert calendar.writes == writes_after_first
+    assert calendar.list_calls == 2
+
+
+def test_reexport_updates_only_changed_weeks(real_schedule):
+    """A reassigned week is updated in place under the same ID"""
+    calendar = InMemoryCalendar()
+    exporter = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID)
+    events = get_events_for_year(real_schedule, 2027, 'monday-sunday')
+    exporter.sync_year(events, 2027)
+
+    changed = list(events)
+    changed[5] = CalendarEvent("New Owner", events[5].start_date, events[5].end_date,
+                               events[5].location, events[5].description,
+                               2027, 5, "new_owner")
+    counts = exporter.sync_year(changed[:-1], 2027)
+
+    assert counts == {"created": 0, "updated": 1, "deleted": 1, "unchanged": len(events) - 2}
+    assert calendar.events[events[5].event_id]["summary"] == "New Owner"
+    assert events[-1].event_id not in calendar.events
+
+
+def test_syncing_a_year_outside_the_schedule_deletes_nothing(real_schedule):
+    """A year the schedule doesn't cover leaves its exported events alone"""
+    calendar = InMemoryCalendar()
+    exporter = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID)
+    exporter.sync_year(get_events_for_year(real_schedule, 2027, 'monday-sunday'), 2027)
+    exported = dict(calendar.events)
+    writes = calendar.writes
+
+    short_schedule = real_schedule[:2]  # 2025-2026
+    with pytest.raises(ValueError):
+        exporter.sync_year(get_events_for_year(short_schedule, 2027, 'monday-sunday'), 2027)
+
+    service = Mock()
+    with pytest.raises(ValueError):
+        export_year(2027, service=service, snapshot_path=None, schedule=short_schedule)
+
+    assert service.mock_calls == []
+    assert calendar.events == exported
+    assert calendar.writes == writes
+
+
+def test_exporter_reconciles_against_the_snapshot(real_schedule, tmp_path):
+    """With a snapshot, a run reads remote state once and records its writes"""
+    calendar = InMemoryCalendar()
+    path = str(tmp_path / "snapshot.json")
+    events = get_events_for_year(real_schedule, 2027, 'monday-sunday')
+
+    first = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID, CalendarSnapshot.load(WINSHIP_HOUSE_CALENDER_ID, path))
+    first.sync_year(events, 2027)
+    first.sync_year(get_events_for_year(real_schedule, 2028, 'monday-sunday'), 2028)
+    assert calendar.list_calls == 1
+
+    snapshot = CalendarSnapshot.load(WINSHIP_HOUSE_CALENDER_ID, path)
+    assert set(snapshot.events) == set(calendar.events)
+
+    writes = calendar.writes
+    second = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID, snapshot)
+    counts = second.sync_year(events, 2027)
+    assert counts["unchanged"] == len(events)
+    assert calendar.writes == writes
+
+
+def test_diff_feeds_minimal_updates(real_schedule):
+    """Only the weeks a diff reports are written to the calendar"""
+    import copy
+
+    calendar = InMemoryCalendar()
+    exporter = CalendarExporter(calendar, WINSHIP_HOUSE_CALENDER_ID)
+    exporter.sync_year(get_events_for_year(real_schedule, 2027, 'monday-sunday'), 2027)
+    writes = calendar.writes
+
+    new_schedule = copy.deepcopy(real_schedule)
+    weeks = new_schedule[2].weeks
+    weeks[3].share, weeks[9].share = weeks[9].share, weeks[3].share
+    diff = diff_schedules(real_schedule, new_schedule)
+
+    counts = exporter.push_events(changed_events(diff, new_schedule), removed_event_ids(diff))
+
+    assert counts == {"created": 0, "updated": 2, "deleted": 0, "unchanged": 0}
+    assert calendar.writes == writes + 2
+    assert calendar.events[make_event_id(2027, 3)]["summary"] == format_share_name(weeks[3].share)
@@ -0,0 +1,148 @@
+"""
+Pytest tests for the local calendar snapshot and its incremental sync,
+against a fake calendar service that issues sync tokens.
+"""
+
+import json
+
+import pytest
+
+from async_calendar_client import CalendarHTTPError
+from calendar_snapshot import CalendarSnapshot, SNAPSHOT_VERSION
+
+CALENDAR_ID = "house@group.calendar.google.com"
+
+
+class SyncingCalendar:
+    """Fake CalendarServiceProtocol whose listings support sync tokens.
+
+    Every change is appended to a log; a sync token is a position in it.
+    """
+
+    def __init__(self, num_events=0, page_size=None):
+        self.log = []
+        self.expired_before = 0
+        self.page_size = page_size
+        self.listed = []
+        for i in range(num_events):
+            self.put({"id": f"e{i}", "summary": f"Week {i}"})
+
+    def put(self, event):
+        self.log.append(dict(event, status="confirmed"))
+
+    def remove(self, event_id):
+        self.log.append({"id": event_id, "status": "cancelled"})
+
+    def current(self):
+        events = {}
+        for change in self.log:
+            events[change["id"]] = change
+        return events
+
+    def list_events(self, calendar_id, time_min, time_max, page_token=None,
+                    max_results=100, private_extended_property=None,
+                    sync_token=None):
+        if sync_token is not None:
+            position = int(sync_token)
+            if position < self.expired_before:
+                raise CalendarHTTPError(410, b'{"error": {"errors": [{"reason": "fullSyncRequired"}]}}')
+            changes = {}
+            for change in self.log[position:]:
+                changes[change["id"]] = change
+            items = list(changes.values())
+        else:
+            # a full listing leaves out deleted events
+            items = [e for e in self.current().values() if e["status"] != "cancelled"]
+
+        start = int(page_token or 0)
+        size = min(max_results, self.page_size or max_results)
+        page = {"items": items[start:start + size]}
+        if start + size < len(items):
+            page["nextPageToken"] = str(start + size)
+        else:
+            page["nextSyncToken"] = str(len(self.log))
+        self.listed.append(len(page["items"]))
+        return page
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "snapshot.json")
+
+
+def test_first_refresh_lists_everything_then_only_changes(snapshot_path):
+    calendar = SyncingCalendar(num_events=40, page_size=15)
+    snapshot = CalendarSnapshot.load(CALENDAR_ID, snapshot_path)
+
+    assert snapshot.refresh(calendar) == 40
+    assert calendar.listed == [15, 15, 10]
+
+    calendar.put({"id": "e3", "summary": "Renamed"})
+    calendar.put({"id": "e99", "summary": "New"})
+    calendar.remove("e7")
+
+    assert snapshot.refresh(calendar) == 3
+    assert snapshot.events["e3"]["summary"] == "Renamed"
+    assert "e99" in snapshot.events
+    assert "e7" not in snapshot.events
+    assert len(snapshot.events) == 40
+
+
+def test_nothing_changed_fetches_nothing(snapshot_path):
+    calendar = SyncingCalendar(num_events=5)
+    CalendarSnapshot.load(CALENDAR_ID, snapshot_path).refresh(calendar)
+
+    assert CalendarSnapshot.load(CALENDAR_ID, snapshot_path).refresh(calendar) == 0
+    assert calendar.listed[-1] == 0
+
+
+def test_snapshot_round_trips_through_disk(snapshot_path):
+    calendar = SyncingCalendar(num_events=3)
+    CalendarSnapshot.load(CALENDAR_ID, snapshot_path).refresh(calendar)
+
+    with open(snapshot_path) as f:
+        data = json.load(f)
+    assert data["version"] == SNAPSHOT_VERSION
+    assert data["calendar_id"] == CALENDAR_ID
+    assert data["sync_token"] == "3"
+    assert sorted(data["events"]) == ["e0", "e1", "e2"]
+
+    reloaded = CalendarSnapshot.load(CALENDAR_ID, snapshot_path)
+    assert reloaded.sync_token == "3"
+    assert reloaded.events == data["events"]
+
+
+def test_snapshot_of_another_calendar_is_ignored(snapshot_path):
+    CalendarSnapshot.load("other", snapshot_path).refresh(SyncingCalendar(num_events=3))
+
+    snapshot = CalendarSnapshot.load(CALENDAR_ID, snapshot_path)
+    assert snapshot.sync_token is None
+    assert snapshot.events == {}
+
+
+def test_expired_sync_token_triggers_full_resync(snapshot_path):
+    calendar = SyncingCalendar(num_events=4)
+    snapshot = CalendarSnapshot.load(CALENDAR_ID, snapshot_path)
+    snapshot.refresh(calendar)
+    snapshot.events["stale"] = {"id": "stale"}
+
+    calendar.remove("e0")
+    calendar.expired_before = len(calendar.log)
+
+    assert snapshot.refresh(calendar) == 3
+    assert sorted(snapshot.events) == ["e1", "e2", "e3"]
+
+
+def test_other_errors_leave_the_snapshot_untouched(snapshot_path):
+    calendar = SyncingCalendar(num_events=2)
+    snapshot = CalendarSnapshot.load(CALENDAR_ID, snapshot_path)
+    snapshot.refresh(calendar)
+
+    def fail(*args, **kwargs):
+        raise CalendarHTTPError(500, b"")
+
+    calendar.list_events = fail
+    with pytest.raises(CalendarHTTPError):
+        snapshot.refresh(calendar)
+    assert snapshot.sync_token == "2"
+    assert sorted(snapshot.events) == ["e0", "e1"]
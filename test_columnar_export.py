@@ -0,0 +1,81 @@
+"""
+Pytest tests for the columnar schedule export.
+"""
+
+import datetime
+
+import pytest
+
+import columnar_export
+import take2
+from columnar_export import read_packed, resolve_format, schedule_columns, write_columns
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return [take2.generate_schedule(year) for year in range(2025, 2030)]
+
+
+def test_one_row_per_week(schedule):
+    columns = schedule_columns(schedule)
+
+    assert len(columns) == sum(len(house_year.weeks) for house_year in schedule)
+    first = schedule[0].weeks[0]
+    assert columns.decoded("start")[0] == first.start
+    assert columns.decoded("end")[0] == first.start + datetime.timedelta(days=7)
+    assert columns.decoded("share")[0] == first.share
+    assert columns.decoded("holiday").count(None) == sum(
+        1 for house_year in schedule for week in house_year.weeks if not week.holiday
+    )
+
+
+def test_count_by_matches_test_schedule(schedule):
+    columns = schedule_columns(schedule)
+    kind_counts = take2.test_schedule(schedule)["kind_counts"]
+
+    counts = columns.count_by("share", "kind")
+
+    for share, kinds in kind_counts.items():
+        for kind, n in kinds.items():
+            assert counts[(share, kind)] == n
+
+
+def test_packed_round_trip(schedule, tmp_path):
+    columns = schedule_columns(schedule)
+    path = write_columns(columns, str(tmp_path / "weeks"), "packed")
+
+    assert path.endswith(".wscol")
+    loaded = read_packed(path)
+    assert loaded.dictionaries == columns.dictionaries
+    for name, values in columns.data.items():
+        assert loaded[name] == values
+
+
+def test_read_packed_rejects_other_files(tmp_path):
+    path = tmp_path / "weeks.wscol"
+    path.write_bytes(b"PAR1 not ours")
+    with pytest.raises(ValueError, match="not a packed column file"):
+        read_packed(str(path))
+
+
+def test_falls_back_to_packed_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(columnar_export, "pyarrow", None)
+
+    assert resolve_format("weeks.parquet", None) == ("packed", "weeks.wscol")
+    assert resolve_format("weeks", "auto") == ("packed", "weeks.wscol")
+    with pytest.raises(RuntimeError, match="pyarrow is not installed"):
+        columnar_export.to_arrow_table(None)
+
+
+def test_parquet_round_trip(schedule, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    columns = schedule_columns(schedule)
+    path = write_columns(columns, str(tmp_path / "weeks.parquet"))
+
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == len(columns)
+    assert table.column("share").to_pylist() == columns.decoded("share")
+    assert table.column("holiday").to_pylist() == columns.decoded("holiday")
+    assert table.column("start").to_pylist() == columns.decoded("start")
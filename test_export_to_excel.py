@@ -0,0 +1,45 @@
+"""
+Pytest tests for the Excel export's week-row layout.
+"""
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+import take2
+from export_to_excel import (
+    FIRST_WEEK_ROW,
+    export_to_excel,
+    week_row_layout,
+)
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    # 2026 and 2032 have 53 ISO weeks
+    return [take2.generate_schedule(year) for year in range(2025, 2034)]
+
+
+def test_layout_gives_every_week_its_own_row(schedule):
+    layout, num_rows = week_row_layout(schedule)
+
+    assert num_rows == 41
+    for house_year in schedule:
+        rows = layout[house_year.year]
+        assert len(rows) == len(house_year.weeks)
+        assert len(set(rows)) == len(rows)
+        assert rows[0] == FIRST_WEEK_ROW
+
+
+def test_export_writes_one_cell_per_week(schedule, tmp_path):
+    path = tmp_path / "schedule.xlsx"
+    export_to_excel(str(path), schedule)
+
+    ws = openpyxl.load_workbook(path).active
+    assert [ws.cell(row=1, column=c).value for c in range(2, 11)] == list(range(2025, 2034))
+    assert ws.cell(row=FIRST_WEEK_ROW, column=1).value == "Week 1"
+    for column, house_year in enumerate(schedule, start=2):
+        values = [ws.cell(row=FIRST_WEEK_ROW + i, column=column).value for i in range(len(house_year.weeks))]
+        assert all(values)
+        comments = [ws.cell(row=FIRST_WEEK_ROW + i, column=column).comment.text for i in range(len(house_year.weeks))]
+        assert [c.split("\n")[0] for c in comments] == [w.start.isoformat() for w in house_year.weeks]
@@ -0,0 +1,92 @@
+"""
+Pytest tests for the fairness metrics engine.
+"""
+
+import copy
+
+import pytest
+
+import rebalance2
+import roster
+import take2
+from fairness import FairnessMetrics, fairness_scores, gini
+from schedule_arrays import ScheduleArrays
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return take2.generate_multi_year_schedule(2025, 20)
+
+
+def test_matrices_match_existing_counts(schedule):
+    results = take2.test_schedule(schedule)
+    global_counts = rebalance2.count_weeks_by_share_global(schedule)
+
+    metrics = FairnessMetrics(schedule)
+
+    kind_counts = {share: counts for share, counts in results["kind_counts"].items() if share != "everyone"}
+    assert metrics.share_kind.to_dict() == kind_counts
+    assert metrics.share_holiday.to_dict() == results["holiday_counts"]
+    assert metrics.share_index.to_dict() == results["week_index_counts"]
+    for share in metrics.share_index.rows:
+        assert metrics.share_index.to_dict()[share] == global_counts[share]
+
+
+def test_accepts_schedule_arrays(schedule):
+    share_roster = roster.default_roster()
+
+    from_arrays = fairness_scores(ScheduleArrays.from_schedule(schedule), share_roster)
+
+    assert from_arrays == fairness_scores(schedule, share_roster)
+
+
+def test_rebalancing_lowers_objective(schedule):
+    share_roster = roster.default_roster()
+    before = FairnessMetrics(schedule, share_roster)
+
+    rebalanced = rebalance2.rebalance_global(copy.deepcopy(schedule), share_roster.owner_percent)
+    after = FairnessMetrics(rebalanced, share_roster)
+
+    assert after.objective() < before.objective()
+    assert after.index_anomalies() < before.index_anomalies()
+
+
+def test_swap_delta_matches_a_recount(schedule):
+    schedule = copy.deepcopy(schedule)
+    metrics = FairnessMetrics(schedule)
+    weeks = schedule[3].weeks
+    a, b = next(
+        (i, j) for i, week in enumerate(weeks) for j, other in enumerate(weeks)
+        if week.kind == other.kind and week.share != other.share and not week.holiday and not other.holiday
+    )
+    share_a, share_b = weeks[a].share, weeks[b].share
+    before = metrics.objective()
+
+    delta = metrics.swap_delta(share_a, a, share_b, b)
+    metrics.apply_swap(share_a, a, share_b, b)
+    weeks[a].share, weeks[b].share = share_b, share_a
+
+    recounted = FairnessMetrics(schedule)
+    assert recounted.objective() == pytest.approx(before + delta)
+    assert metrics.share_index.to_dict() == recounted.share_index.to_dict()
+
+
+def test_holiday_repeats_and_gini(schedule):
+    schedule = copy.deepcopy(schedule)
+    # give frank_may Christmas two years running
+    for house_year in schedule[:2]:
+        christmas = next(w for w in house_year.weeks if w.holiday == "Christmas")
+        other = next(w for w in house_year.weeks if w.share == "frank_may" and not w.holiday)
+        christmas.share, other.share = other.share, christmas.share
+
+    metrics = FairnessMetrics(schedule)
+
+    assert metrics.holiday_repeats.get("frank_may", "Christmas") == 1
+    assert metrics.scores()["holiday_gini"] > 0
+    assert metrics.scores()["holiday_spread"] > 0
+
+
+def test_gini():
+    assert gini([]) == 0.0
+    assert gini([2, 2, 2]) == 0.0
+    assert gini([0, 0, 0, 4]) == pytest.approx(0.75)
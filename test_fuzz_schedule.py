@@ -0,0 +1,141 @@
+"""
+Pytest tests for the scheduler fuzz harness.
+"""
+
+import copy
+
+import pytest
+
+import instrumentation
+import manifest
+import roster
+import scenarios
+import take2
+from fuzz_schedule import (
+    FixtureCache,
+    check_schedule,
+    make_cases,
+    run_case,
+    run_fuzz,
+    shrink_case,
+)
+
+
+@pytest.fixture(scope="module")
+def fixtures():
+    return FixtureCache(max_years=20)
+
+
+@pytest.fixture(scope="module")
+def share_roster():
+    return roster.default_roster()
+
+
+def case(**kwargs):
+    return dict({"start_year": 2025, "num_years": 20, "changes": [], "seed": None, "rebalance": False}, **kwargs)
+
+
+def test_the_published_horizon_keeps_every_invariant(fixtures):
+    assert run_case(case(), fixtures) == {}
+    assert run_case(case(rebalance=True), fixtures) == {}
+
+
+def test_shorter_cases_are_slices_of_the_cached_run(fixtures, share_roster):
+    schedule, _ = fixtures.generated([], 2025, 6)
+
+    assert len(fixtures.runs[("[]", 2025)]) == 20
+    assert manifest.schedule_checksum(schedule) == manifest.schedule_checksum(
+        take2.generate_multi_year_schedule(2025, 6, roster=share_roster)
+    )
+
+
+def test_invariants_catch_broken_schedules(fixtures, share_roster):
+    schedule, _ = fixtures.generated([], 2025, 3)
+    schedule = copy.deepcopy(schedule)
+    weeks = schedule[1].weeks
+    christmas = next(week for week in weeks if week.holiday == "Christmas")
+    christmas.holiday = None
+    ten_percent = next(i for i, week in enumerate(weeks) if share_roster.is_ten_percent(week.share))
+    weeks[ten_percent + 1].share = weeks[ten_percent].share
+    weeks[5].share = None
+
+    failures = check_schedule(schedule, share_roster)
+
+    assert set(failures) == {"gaps", "share_counts", "spacing", "holidays"}
+    assert failures["gaps"] == [f"2026: week 5 ({weeks[5].start}) has no share"]
+    assert failures["holidays"] == ["2026: Christmas is in 0 weeks"]
+
+
+@pytest.mark.parametrize("start_year, num_years", [(2048, 3), (1900, 400)])
+def test_generation_keeps_alternating_past_the_published_horizon(share_roster, start_year, num_years):
+    instrumentation.PROFILER.reset()
+    instrumentation.enable()
+    try:
+        schedule = take2.generate_multi_year_schedule(start_year, num_years)
+        relaxed_count = instrumentation.PROFILER.counters.get("allocate.relaxed", 0)
+    finally:
+        instrumentation.disable()
+        instrumentation.PROFILER.reset()
+
+    assert [(house_year.year, house_year.relaxed) for house_year in schedule if house_year.relaxed] == []
+    assert relaxed_count == 0
+    assert check_schedule(schedule, share_roster) == {}
+
+
+def test_a_rotation_holiday_of_the_wrong_kind_is_handed_on(share_roster):
+    # against itself as the year before, every 5% share needs the other pair,
+    # so Thanksgiving (cold) can't stay with joe, who had hot and cold
+    previous = take2.generate_schedule(2049)
+    assert next(w.share for w in previous.weeks if w.holiday == "Thanksgiving") == "joe"
+
+    house_year = take2.generate_schedule(2049, previous_year=previous)
+
+    assert take2.kinds_alternate(previous, house_year, share_roster)
+    assert next(w.share for w in house_year.weeks if w.holiday == "Thanksgiving") != "joe"
+
+
+@pytest.mark.parametrize("allow_relaxed", [False, True])
+def test_the_published_horizon_has_no_relaxed_years(share_roster, allow_relaxed):
+    schedule = take2.generate_multi_year_schedule(2025, 20, allow_relaxed=allow_relaxed)
+
+    assert [(house_year.year, house_year.relaxed) for house_year in schedule if house_year.relaxed] == []
+
+
+def test_bad_roster_changes_are_reported(fixtures):
+    failures = run_case(case(changes=[{"merge": {"shares": ["joe", "lane"], "into": "x"}}]), fixtures)
+
+    assert list(failures) == ["roster"]
+
+
+def test_shrink_finds_a_minimal_case():
+    split = {"split": {"share": "eddie", "into": ["eddie_a", "eddie_b"]}}
+    sell = {"sell": {"share": "joe", "to": "joe_new"}}
+    big = case(start_year=2030, num_years=17, changes=[sell, split], seed=5, rebalance=True)
+
+    def fails(c):
+        return split in c["changes"] and c["start_year"] + c["num_years"] > 2040
+
+    assert shrink_case(big, fails) == case(start_year=2040, num_years=1, changes=[split])
+
+
+def test_make_cases_is_reproducible():
+    cases = make_cases(50, seed=3, variants=4)
+
+    assert cases == make_cases(50, seed=3, variants=4)
+    assert cases != make_cases(50, seed=4, variants=4)
+    for c in cases:
+        roster.Roster(scenarios.apply_changes(roster.default_roster().to_dict(), c["changes"]))
+        assert 1 <= c["num_years"] <= 20
+        assert c["rebalance"] or c["seed"] is None
+
+
+def test_run_fuzz_shrinks_failures():
+    bad_merge = {"merge": {"shares": ["joe", "lane"], "into": "x"}}
+    cases = [case(num_years=8), case(num_years=6, changes=[bad_merge], seed=2, rebalance=True)]
+
+    passed, failed = run_fuzz(cases, workers=1)
+
+    assert passed["failures"] == {}
+    assert failed["invariant"] == "roster"
+    assert failed["shrunk"] == case(num_years=1, changes=[bad_merge])
+    assert failed["shrunk_failures"] == failed["failures"]["roster"]
@@ -0,0 +1,181 @@
+"""
+Pytest tests for the batched, checkpointed calendar purge.
+"""
+
+import json
+import os
+
+import pytest
+
+from google_calendar_wrapper import GoogleCalendarService, MAX_BATCH_SIZE, PURGE_LIST_FIELDS
+from rate_limiter import AdaptiveRateLimiter
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status, reason):
+        self.resp = type("Response", (), {"status": status})()
+        self.content = json.dumps({"error": {"errors": [{"reason": reason}]}}).encode()
+        super().__init__(f"{status} {reason}")
+
+
+class Interrupted(Exception):
+    pass
+
+
+class FakeRequest:
+    def __init__(self, run):
+        self.run = run
+
+    def execute(self):
+        return self.run()
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request, request_id))
+
+    def execute(self):
+        assert len(self.requests) <= MAX_BATCH_SIZE
+        self.service.batches += 1
+        if self.service.batches == self.service.interrupt_at:
+            raise Interrupted()
+        for request, request_id in self.requests:
+            try:
+                response, exception = request.execute(), None
+            except FakeHttpError as e:
+                response, exception = None, e
+            self.callback(request_id, response, exception)
+
+
+class FakeService:
+    """In-memory calendar with paged listing and batch deletes."""
+
+    def __init__(self, num_events):
+        self.events_by_id = {f"e{i:04d}": {"id": f"e{i:04d}", "summary": "x"} for i in range(num_events)}
+        self.list_calls = []
+        self.batches = 0
+        self.interrupt_at = None
+        # event IDs whose next delete fails with a rate limit
+        self.rate_limit_once = set()
+        self.forbidden = set()
+
+    def events(self):
+        return self
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def list(self, calendarId, timeMin, timeMax, pageToken, maxResults, fields,
+             privateExtendedProperty, syncToken):
+        self.list_calls.append({"maxResults": maxResults, "fields": fields})
+
+        def run():
+            ids = sorted(self.events_by_id)
+            start = int(pageToken or 0)
+            page = {"items": [{"id": i} for i in ids[start:start + maxResults]]}
+            if start + maxResults < len(ids):
+                page["nextPageToken"] = str(start + maxResults)
+            return page
+
+        return FakeRequest(run)
+
+    def delete(self, calendarId, eventId, sendNotifications):
+        def run():
+            if eventId in self.rate_limit_once:
+                self.rate_limit_once.discard(eventId)
+                raise FakeHttpError(403, "rateLimitExceeded")
+            if eventId in self.forbidden:
+                raise FakeHttpError(403, "forbidden")
+            if eventId not in self.events_by_id:
+                raise FakeHttpError(410, "deleted")
+            del self.events_by_id[eventId]
+            return ""
+
+        return FakeRequest(run)
+
+
+@pytest.fixture
+def limiter():
+    return AdaptiveRateLimiter(rate=20.0, sleep=lambda seconds: None)
+
+
+def test_purge_lists_ids_in_large_pages_and_deletes_in_batches(limiter):
+    fake = FakeService(2600)
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    deleted = calendar.purge_events("cal")
+
+    assert deleted == 2600
+    assert fake.events_by_id == {}
+    assert fake.list_calls == [{"maxResults": 2500, "fields": PURGE_LIST_FIELDS}] * 2
+    assert fake.batches == 52
+
+
+def test_interrupted_purge_resumes_from_checkpoint(limiter, tmp_path):
+    fake = FakeService(120)
+    fake.interrupt_at = 2
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+    checkpoint = str(tmp_path / "purge.json")
+
+    with pytest.raises(Interrupted):
+        calendar.purge_events("cal", checkpoint_path=checkpoint)
+    with open(checkpoint) as f:
+        state = json.load(f)
+    assert state["deleted"] == 50
+    assert len(state["pending"]) == 70
+
+    deleted = calendar.purge_events("cal", checkpoint_path=checkpoint)
+
+    assert deleted == 120
+    assert fake.events_by_id == {}
+    # resuming didn't relist
+    assert len(fake.list_calls) == 1
+    assert not os.path.exists(checkpoint)
+
+
+def test_checkpoint_for_another_range_is_ignored(limiter, tmp_path):
+    checkpoint = tmp_path / "purge.json"
+    checkpoint.write_text(json.dumps(
+        {"calendar_id": "cal", "time_min": "2030-01-01T00:00:00Z", "time_max": None,
+         "pending": ["e0000"], "deleted": 0, "errors": {}}
+    ))
+    fake = FakeService(3)
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    assert calendar.purge_events("cal", checkpoint_path=str(checkpoint)) == 3
+    assert len(fake.list_calls) == 1
+
+
+def test_rate_limited_deletes_are_retried(limiter):
+    fake = FakeService(60)
+    fake.rate_limit_once = {"e0003", "e0055"}
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    assert calendar.purge_events("cal") == 60
+    assert fake.events_by_id == {}
+    # one retry rides along with the next batch, the last needs its own
+    assert limiter.rate_limited == 2
+    assert fake.batches == 3
+
+
+def test_other_errors_are_reported_not_retried(limiter, capsys):
+    fake = FakeService(5)
+    fake.forbidden = {"e0002"}
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    assert calendar.purge_events("cal") == 4
+    assert list(fake.events_by_id) == ["e0002"]
+    assert "Error deleting event e0002" in capsys.readouterr().out
+
+
+def test_delete_all_events_for_year_purges_the_year(limiter):
+    fake = FakeService(10)
+    calendar = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    assert calendar.delete_all_events_for_year("cal", 2027) == 10
+    assert fake.events_by_id == {}
@@ -0,0 +1,86 @@
+"""
+Pytest tests for the holiday assignment planner.
+"""
+
+import copy
+
+import pytest
+
+import roster
+import take2
+from holiday_rotation import (
+    HOLIDAYS,
+    plan_from_schedule,
+    plan_holidays,
+    plan_report,
+    repeat_violations,
+    rotation_plan,
+)
+
+
+@pytest.fixture
+def repeating_roster():
+    """A roster whose even-year rotation copies the odd one, so every share
+    keeps its holiday for two years running."""
+    data = copy.deepcopy(roster.default_roster().to_dict())
+    data["holiday_rotation"]["even"] = copy.deepcopy(data["holiday_rotation"]["odd"])
+    return roster.Roster(data)
+
+
+def test_no_one_gets_a_holiday_twice_in_a_row():
+    schedule = take2.generate_multi_year_schedule(2025, 20)
+
+    assert repeat_violations(plan_from_schedule(schedule)) == []
+
+
+def test_fair_rotation_is_kept():
+    assert plan_holidays(2025, 100) == rotation_plan(2025, 100)
+
+
+def test_repairs_repeating_rotation(repeating_roster):
+    rotation = plan_report(rotation_plan(2025, 100, repeating_roster), repeating_roster)
+    plan = plan_holidays(2025, 100, repeating_roster)
+    report = plan_report(plan, repeating_roster)
+
+    assert len(rotation["repeats"]) == 250
+    assert report["repeats"] == []
+    assert report["max_excess"] <= 1
+    for assignment in plan.values():
+        assert sorted(assignment) == sorted(HOLIDAYS)
+        assert len(set(assignment.values())) == len(HOLIDAYS)
+
+
+def test_schedule_follows_plan(repeating_roster):
+    plan = plan_holidays(2025, 20, repeating_roster)
+
+    # the plan gives some 5% shares a holiday of the kind they had the year
+    # before, so those years can't alternate; they only generate marked relaxed
+    with pytest.raises(Exception, match="alternating: the holiday plan gives"):
+        take2.generate_multi_year_schedule(2025, 20, roster=repeating_roster, holiday_plan=plan)
+    schedule = take2.generate_multi_year_schedule(
+        2025, 20, roster=repeating_roster, holiday_plan=plan, allow_relaxed=True
+    )
+
+    assert plan_from_schedule(schedule) == plan
+    assert any(house_year.relaxed for house_year in schedule)
+    for previous, house_year in zip(schedule, schedule[1:]):
+        assert bool(house_year.relaxed) != take2.kinds_alternate(previous, house_year, repeating_roster)
+
+
+def test_default_schedule_follows_plan():
+    plan = plan_holidays(2025, 20)
+
+    schedule = take2.generate_multi_year_schedule(2025, 20, holiday_plan=plan)
+
+    assert plan_from_schedule(schedule) == plan
+    assert not any(house_year.relaxed for house_year in schedule)
+
+
+def test_repeat_violations():
+    plan = {
+        2025: {"Christmas": "joe", "Thanksgiving": "jim"},
+        2026: {"Christmas": "joe", "Thanksgiving": "joe"},
+        2028: {"Christmas": "joe"},
+    }
+
+    assert repeat_violations(plan) == [(2026, "Christmas", "joe")]
@@ -0,0 +1,106 @@
+"""
+Pytest tests for the iCalendar export.
+"""
+
+import datetime
+import io
+
+import pytest
+
+import take2
+from ics_export import event_uid, fold_line, iter_ics, main, schedule_events, write_ics
+from winship_calendar_core import CalendarEvent
+
+DTSTAMP = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return [take2.generate_schedule(year) for year in (2027, 2028)]
+
+
+def export(schedule, **kwargs):
+    buffer = io.StringIO()
+    count = write_ics(schedule, buffer, dtstamp=DTSTAMP, **kwargs)
+    return count, buffer.getvalue()
+
+
+def unfold(text):
+    return text.replace("\r\n ", "")
+
+
+def test_feed_structure(schedule):
+    count, text = export(schedule)
+
+    assert count == 82
+    lines = text.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert lines[-2:] == ["END:VCALENDAR", ""]
+    assert text.count("BEGIN:VEVENT") == text.count("END:VEVENT") == 82
+    first_week = schedule[0].weeks[0].start + datetime.timedelta(days=1)
+    assert f"DTSTART;VALUE=DATE:{first_week:%Y%m%d}" in text
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert "\n" not in text.replace("\r\n", "")
+
+
+def test_uids_are_stable_and_unique(schedule):
+    _, first = export(schedule)
+    _, second = export([take2.generate_schedule(year) for year in (2027, 2028)])
+
+    uids = [line for line in first.split("\r\n") if line.startswith("UID:")]
+    assert len(set(uids)) == 82
+    assert first == second
+
+
+def test_changed_week_keeps_its_uid(schedule):
+    events = list(schedule_events(schedule))
+    event = events[3]
+    moved = CalendarEvent("Someone Else", event.start_date, event.end_date, event.location,
+                          event.description, event.year, event.week_index, "someone_else")
+
+    assert event_uid(moved) == event_uid(event)
+
+
+def test_events_are_generated_lazily():
+    def years():
+        yield take2.generate_schedule(2027)
+        raise AssertionError("second year requested before the first was written")
+
+    events = schedule_events(years())
+    assert next(events).year == 2027
+
+
+def test_unrebalanced_feed_keeps_the_cross_year_rules(tmp_path):
+    """--no-rebalance writes the multi-year schedule, whose 5% shares
+    alternate across years, not years generated one at a time"""
+    path = tmp_path / "winship.ics"
+    main(["--start-year", "2045", "--years", "6", "--no-rebalance", "-o", str(path)])
+
+    expected = [event.summary for event in schedule_events(take2.generate_multi_year_schedule(2045, 6))]
+    summaries = [line[len("SUMMARY:"):] for line in unfold(path.read_bytes().decode()).split("\r\n")
+                 if line.startswith("SUMMARY:")]
+    assert summaries == expected
+
+
+def test_text_is_escaped_and_folded():
+    event = CalendarEvent(
+        summary="Hugh & Ann, Laurel; guests",
+        start_date=datetime.date(2027, 7, 5),
+        end_date=datetime.date(2027, 7, 12),
+        location="Winship House",
+        description="Holiday: July 4th\nWeek type: hot " + "é" * 60,
+    )
+    text = "".join(iter_ics([event], dtstamp=DTSTAMP))
+    unfolded = unfold(text)
+
+    assert "SUMMARY:Hugh & Ann\\, Laurel\\; guests" in unfolded
+    assert "DESCRIPTION:Holiday: July 4th\\nWeek type: hot " + "é" * 60 in unfolded
+    assert all(len(line.encode("utf-8")) <= 75 for line in text.split("\r\n"))
+
+
+def test_fold_line_never_splits_multibyte_characters():
+    folded = fold_line("DESCRIPTION:" + "é" * 100)
+    for piece in folded.split("\r\n"):
+        piece.encode("utf-8").decode("utf-8")
+        assert len(piece.encode("utf-8")) <= 75
+    assert unfold(folded) == "DESCRIPTION:" + "é" * 100
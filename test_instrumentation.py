@@ -0,0 +1,56 @@
+"""
+Pytest tests for the opt-in instrumentation layer.
+"""
+
+import io
+import json
+
+import pytest
+
+import instrumentation
+import take2
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    instrumentation.disable()
+    instrumentation.PROFILER.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.PROFILER.reset()
+
+
+def test_disabled_records_nothing():
+    assert instrumentation.timer("phase") is instrumentation.NULL_TIMER
+    with instrumentation.timer("phase"):
+        instrumentation.count("things")
+
+    assert instrumentation.PROFILER.timings == {}
+    assert instrumentation.PROFILER.counters == {}
+
+
+def test_generation_phases_are_timed():
+    instrumentation.enable()
+    take2.generate_schedule(2027)
+
+    timings = instrumentation.PROFILER.timings
+    for phase in ("compute_schedule", "compute_holidays", "compute_initial_shares",
+                  "compute_remaining_five_percent_shares"):
+        assert timings[phase][0] == 1
+
+
+def test_summary_and_trace(tmp_path):
+    instrumentation.enable()
+    with instrumentation.timer("phase"):
+        instrumentation.count("things", 3)
+
+    out = io.StringIO()
+    instrumentation.write_summary(out)
+    assert "phase" in out.getvalue()
+    assert "things" in out.getvalue()
+
+    trace_path = tmp_path / "trace.json"
+    instrumentation.write_trace(str(trace_path))
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["phase"]
+    assert [e["args"] for e in events if e["ph"] == "C"] == [{"things": 3}]
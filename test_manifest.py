@@ -0,0 +1,94 @@
+"""
+Pytest tests for seeded, reproducible schedule runs.
+"""
+
+import pytest
+
+import manifest
+import rebalance2
+import roster
+import take2
+from scenarios import apply_changes, run_scenarios
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    return manifest.run_schedule(2025, 10, seed=7)
+
+
+def test_same_seed_same_schedule(seeded):
+    _, first = seeded
+    _, again = manifest.run_schedule(2025, 10, seed=7)
+
+    assert again == first
+
+
+def test_no_seed_is_the_plain_rebalance():
+    schedule = take2.generate_multi_year_schedule(2025, 10)
+    plain = rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+
+    _, run = manifest.run_schedule(2025, 10)
+
+    assert run["seed"] is None
+    assert run["checksum"] == manifest.schedule_checksum(plain)
+
+
+def test_verify_round_trip(seeded, tmp_path):
+    schedule, made = seeded
+    path = tmp_path / "manifest.json"
+    manifest.write_manifest(made, str(path))
+
+    loaded = manifest.load_manifest(str(path))
+
+    assert loaded == made
+    assert manifest.verify_manifest(loaded, schedule) == []
+
+
+def test_roster_path_is_stored_relative_to_the_repo(seeded):
+    _, made = seeded
+
+    assert made["roster_path"] == "roster.json"
+
+
+def test_verify_falls_back_to_the_default_roster(seeded, tmp_path):
+    schedule, made = seeded
+    moved = dict(made, roster_path=str(tmp_path / "elsewhere" / "roster.json"))
+
+    assert manifest.verify_manifest(moved, schedule) == []
+
+
+def test_verify_flags_tampering(seeded):
+    schedule, made = seeded
+    tampered = dict(made, checksum="0" * 64)
+
+    problems = manifest.verify_manifest(tampered, schedule)
+
+    assert "schedule checksum does not match the manifest" in problems
+    assert any(p.startswith("serial re-run gives checksum") for p in problems)
+
+
+def test_verify_flags_a_different_roster(seeded):
+    _, made = seeded
+    data = apply_changes(roster.default_roster().to_dict(), [{"sell": {"share": "eddie", "to": "new_owner"}}])
+
+    problems = manifest.verify_manifest(made, share_roster=roster.Roster(data))
+
+    assert "roster differs from the one the manifest was made with" in problems
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text('{"manifest_version": 99}')
+
+    with pytest.raises(ValueError):
+        manifest.load_manifest(str(path))
+
+
+def test_process_pool_matches_serial(seeded):
+    _, made = seeded
+    scenarios = [{"name": "baseline", "data": roster.default_roster().to_dict()}]
+
+    [result] = run_scenarios(scenarios, 2025, 10, workers=2, seed=7)
+
+    assert result["error"] is None
+    assert result["checksum"] == made["checksum"]
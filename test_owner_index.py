@@ -0,0 +1,78 @@
+"""
+Pytest tests for the per-owner index and its reports.
+"""
+
+import io
+
+import pytest
+
+import take2
+from ics_export import schedule_events
+from owner_index import OwnerIndex, format_owner_report, write_owner_ics
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return take2.generate_multi_year_schedule(2025, 6)
+
+
+@pytest.fixture(scope="module")
+def index(schedule):
+    return OwnerIndex(schedule)
+
+
+def test_index_matches_a_scan(schedule, index):
+    for share in index.shares() + ["everyone"]:
+        expected = [
+            (house_year.year, i, week)
+            for house_year in schedule
+            for i, week in enumerate(house_year.weeks)
+            if week.share == share
+        ]
+        assert index.weeks_of(share) == expected
+        assert index.weeks_of(share, 2027) == [e for e in expected if e[0] == 2027]
+    assert "everyone" not in index.shares()
+    assert index.weeks_of("nobody") == []
+
+
+def test_owner_events_match_the_full_feed(schedule, index):
+    full = {event.event_id: event for event in schedule_events(schedule) if event.share == "eddie"}
+
+    owner = list(index.events("eddie"))
+
+    assert [e.event_id for e in owner] == list(full)
+    assert [e.content_hash() for e in owner] == [e.content_hash() for e in full.values()]
+
+
+def test_owner_ics_feed(index):
+    stream = io.StringIO()
+
+    count = write_owner_ics(index, "eddie", stream, year=2026)
+
+    assert count == 4
+    assert stream.getvalue().count("BEGIN:VEVENT") == 4
+    assert "X-WR-CALNAME:Winship House: Eddie" in stream.getvalue()
+
+
+def test_report_lists_every_week(index):
+    report = format_owner_report(index, "jim")
+
+    assert report.startswith("Jim: 12 weeks in 2025-2030")
+    for _, _, week in index.weeks_of("jim"):
+        assert week.start.strftime("%A, %x") in report
+
+
+def test_owner_sheets(index, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    from export_to_excel import export_owner_sheets
+
+    path = tmp_path / "owners.xlsx"
+    export_owner_sheets(str(path), index, ["eddie", "jim"])
+
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == ["Eddie", "Jim"]
+    ws = wb["Eddie"]
+    assert ws.max_row == 1 + len(index.weeks_of("eddie"))
+    assert [ws.cell(row=r, column=1).value for r in range(2, ws.max_row + 1)] == [
+        year for year, _, _ in index.weeks_of("eddie")
+    ]
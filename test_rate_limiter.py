@@ -0,0 +1,165 @@
+"""
+Pytest tests for the adaptive calendar rate limiter, against a fake Calendar
+service that injects quota errors.
+"""
+
+import json
+import random
+
+import pytest
+
+from google_calendar_wrapper import GoogleCalendarService
+from rate_limiter import AdaptiveRateLimiter, is_rate_limit_error
+
+
+class FakeClock:
+    """Time that only moves when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse(dict):
+    def __init__(self, status):
+        super().__init__(status=str(status))
+        self.status = status
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient.errors.HttpError."""
+
+    def __init__(self, status, reason):
+        self.resp = FakeResponse(status)
+        self.content = json.dumps({"error": {"code": status, "errors": [{"reason": reason}]}}).encode()
+        super().__init__(f"{status} {reason}")
+
+
+class FakeRequest:
+    def __init__(self, service, result):
+        self.service = service
+        self.result = result
+
+    def execute(self):
+        self.service.calls += 1
+        if self.service.failures:
+            raise self.service.failures.pop(0)
+        return self.result
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def insert(self, calendarId, body):
+        return FakeRequest(self.service, dict(body, id=f"e{self.service.calls}"))
+
+    def delete(self, calendarId, eventId, sendNotifications):
+        return FakeRequest(self.service, "")
+
+
+class FakeService:
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def events(self):
+        return FakeEvents(self)
+
+
+def quota_error():
+    return FakeHttpError(403, "rateLimitExceeded")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return AdaptiveRateLimiter(rate=2.0, clock=clock, sleep=clock.sleep, rng=random.Random(1))
+
+
+def test_recognizes_rate_limit_errors():
+    assert is_rate_limit_error(quota_error())
+    assert is_rate_limit_error(FakeHttpError(429, "tooManyRequests"))
+    assert not is_rate_limit_error(FakeHttpError(403, "forbidden"))
+    assert not is_rate_limit_error(FakeHttpError(404, "notFound"))
+    assert not is_rate_limit_error(ValueError("boom"))
+
+
+def test_rate_increases_while_calls_succeed(limiter, clock):
+    service = GoogleCalendarService(FakeService(), rate_limiter=limiter)
+    for _ in range(20):
+        service.create_event("cal", {"summary": "x"})
+
+    assert limiter.rate == pytest.approx(2.0 + 20 * 0.25)
+    # gaps between calls shrink as the rate climbs
+    assert clock.sleeps[0] == pytest.approx(0.5)
+    assert clock.sleeps[-1] < 0.2
+    metrics = limiter.metrics()
+    assert metrics["successes"] == 20
+    assert metrics["retries"] == 0
+    assert metrics["throughput"] > 2.0
+
+
+def test_backs_off_and_retries_quota_errors(limiter, clock):
+    fake = FakeService(failures=[quota_error(), quota_error()])
+    service = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    created = service.create_event("cal", {"summary": "x"})
+
+    assert created["summary"] == "x"
+    assert fake.calls == 3
+    assert limiter.rate_limited == 2
+    assert limiter.retries == 2
+    # halved twice, then one success
+    assert limiter.rate == pytest.approx(2.0 * 0.5 * 0.5 + 0.25)
+
+
+def test_rate_never_drops_below_minimum(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.5, max_retries=10, clock=clock, sleep=clock.sleep)
+    service = GoogleCalendarService(FakeService(failures=[quota_error()] * 5), rate_limiter=limiter)
+
+    service.delete_event("cal", "e1")
+
+    assert limiter.rate == pytest.approx(0.5 + 0.25)
+
+
+def test_gives_up_after_max_retries(clock):
+    limiter = AdaptiveRateLimiter(max_retries=2, clock=clock, sleep=clock.sleep)
+    fake = FakeService(failures=[quota_error()] * 3)
+    service = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    with pytest.raises(FakeHttpError):
+        service.create_event("cal", {"summary": "x"})
+    assert fake.calls == 3
+
+
+def test_other_errors_are_not_retried(limiter):
+    fake = FakeService(failures=[FakeHttpError(403, "forbidden")])
+    service = GoogleCalendarService(fake, rate_limiter=limiter)
+
+    with pytest.raises(FakeHttpError):
+        service.create_event("cal", {"summary": "x"})
+    assert fake.calls == 1
+    assert limiter.rate == 2.0
+
+
+def test_services_share_one_limiter(limiter):
+    first = GoogleCalendarService(FakeService(failures=[quota_error()]), rate_limiter=limiter)
+    second = GoogleCalendarService(FakeService(), rate_limiter=limiter)
+
+    first.create_event("cal", {"summary": "x"})
+    second.create_event("cal", {"summary": "y"})
+
+    assert limiter.metrics()["successes"] == 2
+    assert limiter.metrics()["rate_limited"] == 1
@@ -0,0 +1,74 @@
+"""
+Pytest tests for incremental rescheduling in rebalance2.
+"""
+
+import copy
+
+import pytest
+
+import manifest
+import rebalance2
+import take2
+from season_layout import SEASON_WEEKS
+
+
+@pytest.fixture(scope="module")
+def published_schedule():
+    schedule = take2.generate_multi_year_schedule(2025, 20)
+    return rebalance2.rebalance_global(schedule, rebalance2.owner_percent)
+
+
+def test_reschedule_of_a_balanced_schedule_changes_nothing(published_schedule):
+    new_schedule = rebalance2.reschedule_from(published_schedule, 2035)
+
+    assert rebalance2.schedule_churn(published_schedule, new_schedule) == []
+
+
+def test_reschedule_keeps_pinned_years(published_schedule):
+    # owners trade two weeks of the same kind in 2038
+    traded = copy.deepcopy(published_schedule)
+    year = next(hy for hy in traded if hy.year == 2038)
+    first, second = [i for i, w in enumerate(year.weeks) if w.kind == "cool" and w.holiday is None][:2]
+    year.weeks[first].share, year.weeks[second].share = year.weeks[second].share, year.weeks[first].share
+
+    new_schedule = rebalance2.reschedule_from(traded, 2036)
+    churn = rebalance2.schedule_churn(traded, new_schedule)
+
+    assert all(year >= 2036 for year, _, _, _ in churn)
+    for old_year, new_year in zip(traded, new_schedule):
+        if old_year.year < 2036:
+            assert new_year is old_year
+
+
+def test_reschedule_does_not_modify_its_input(published_schedule):
+    before = [[w.share for w in hy.weeks] for hy in published_schedule]
+    rebalance2.reschedule_from(published_schedule, 2040, regenerate=True)
+
+    assert [[w.share for w in hy.weeks] for hy in published_schedule] == before
+
+
+def test_regenerating_leaves_pinned_years_byte_identical(published_schedule):
+    new_schedule = rebalance2.reschedule_from(published_schedule, 2035, regenerate=True)
+
+    pinned = [hy for hy in published_schedule if hy.year < 2035]
+    assert manifest.schedule_checksum(new_schedule[: len(pinned)]) == manifest.schedule_checksum(pinned)
+
+
+def test_ideal_allocation_scales_with_the_horizon():
+    twenty = rebalance2.compute_ideal_allocation(rebalance2.owner_percent)
+    ten = rebalance2.compute_ideal_allocation(rebalance2.owner_percent, 10)
+
+    assert twenty["eddie"][0] == 2 and twenty["will"][0] == 1
+    assert ten["eddie"][0] == 1 and ten["will"][0] == 0.5
+
+
+def test_the_last_week_of_the_season_is_balanced_too(published_schedule):
+    ideal = rebalance2.compute_ideal_allocation(rebalance2.owner_percent)
+    last = SEASON_WEEKS - 1
+
+    def deviation(schedule):
+        counts = rebalance2.count_weeks_by_share_global(schedule)
+        return sum(abs(counts[share].get(last, 0) - ideal[share][last]) for share in ideal)
+
+    assert len(ideal["eddie"]) == SEASON_WEEKS
+    assert deviation(published_schedule) < deviation(take2.generate_multi_year_schedule(2025, 20))
@@ -0,0 +1,71 @@
+"""
+Pytest tests for the roster loader.
+"""
+
+import json
+
+import pytest
+
+from roster import Roster, load_roster, DEFAULT_ROSTER_PATH
+
+
+@pytest.fixture
+def roster_data():
+    with open(DEFAULT_ROSTER_PATH) as f:
+        return json.load(f)
+
+
+def test_default_roster_tables():
+    roster = load_roster()
+
+    assert len(roster.shares) == 15
+    assert roster.ten_percent_shares == ["frank_may", "hankey", "eddie", "richard", "frank_latimer"]
+    assert roster.owner_percent["joe"] == 5
+    assert sum(roster.weeks) == 40
+
+    # IDs index the precomputed tables
+    eddie = roster.share_ids["eddie"]
+    assert roster.shares[eddie] == "eddie"
+    assert roster.weeks[eddie] == 4
+    assert roster.pair_of["eddie"] == "eddie"
+    assert roster.pair_of["joe"] == "jim"
+
+
+def test_display_names_and_colors():
+    roster = load_roster()
+
+    assert roster.display_name("hankey") == "Charlie"
+    assert roster.display_name("frank_may") == "Frank May"
+    assert roster.color("lane") == ("EAD203", "000000")
+    assert roster.color("nobody") == ("FFFFFF", "000000")
+
+
+def test_rejects_wrong_total_weeks(roster_data):
+    roster_data["shares"][0]["percent"] = 5
+    with pytest.raises(ValueError, match="add up to"):
+        Roster(roster_data)
+
+
+def test_rejects_unknown_share_in_pair(roster_data):
+    roster_data["pairs"][1] = ["joe", "jimmy"]
+    with pytest.raises(ValueError, match="Unknown share in pair"):
+        Roster(roster_data)
+
+
+def test_rejects_five_percent_paired_with_itself(roster_data):
+    roster_data["pairs"][1] = ["joe", "joe"]
+    with pytest.raises(ValueError, match="Only a 10% share"):
+        Roster(roster_data)
+
+
+def test_rejects_unbalanced_holiday_rotation(roster_data):
+    rotation = roster_data["holiday_rotation"]["odd"][0]
+    rotation[rotation.index("jim")] = "joe"
+    with pytest.raises(ValueError, match="holiday_rotation.odd"):
+        Roster(roster_data)
+
+
+def test_rejects_bad_color(roster_data):
+    roster_data["shares"][0]["color"] = ["brown", "000000"]
+    with pytest.raises(ValueError, match="Color"):
+        Roster(roster_data)
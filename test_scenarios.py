@@ -0,0 +1,106 @@
+"""
+Pytest tests for the what-if roster scenario runner.
+"""
+
+import os
+
+import pytest
+
+import roster
+import take2
+from fuzz_schedule import check_schedule
+from scenarios import apply_changes, load_scenarios, run_scenario
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.example.json")
+
+
+@pytest.fixture
+def base():
+    return roster.default_roster().to_dict()
+
+
+def test_sell_renames_everywhere(base):
+    data = apply_changes(base, [{"sell": {"share": "eddie", "to": "new_owner"}}])
+    share_roster = roster.Roster(data)
+
+    assert "eddie" not in share_roster.share_ids
+    assert share_roster.owner_percent["new_owner"] == 10
+    assert share_roster.pair_of["new_owner"] == "new_owner"
+
+
+def test_split_makes_two_paired_five_percent_shares(base):
+    data = apply_changes(base, [{"split": {"share": "eddie", "into": ["eddie_a", "eddie_b"]}}])
+    share_roster = roster.Roster(data)
+
+    assert share_roster.owner_percent["eddie_a"] == 5
+    assert share_roster.owner_percent["eddie_b"] == 5
+    assert share_roster.pair_of["eddie_a"] == "eddie_b"
+    assert "eddie_a" in share_roster.odd_holiday_shares[0]
+    assert "eddie_a" in share_roster.even_holiday_shares[1]
+
+
+def test_merge_makes_one_ten_percent_share(base):
+    data = apply_changes(base, [{"merge": {"shares": ["joe", "jim"], "into": "joe_jim"}}])
+    share_roster = roster.Roster(data)
+
+    assert share_roster.owner_percent["joe_jim"] == 10
+    assert "joe" not in share_roster.share_ids
+
+
+def test_merge_works_for_a_pair_listed_after_its_partner(base):
+    data = apply_changes(base, [{"merge": {"shares": ["will", "becca"], "into": "will_becca"}}])
+    share_roster = roster.Roster(data)
+
+    assert share_roster.owner_percent["will_becca"] == 10
+    assert "will" not in share_roster.share_ids
+    assert "becca" not in share_roster.share_ids
+
+
+def test_merge_requires_a_pair(base):
+    with pytest.raises(ValueError, match="Only paired shares"):
+        apply_changes(base, [{"merge": {"shares": ["joe", "lane"], "into": "x"}}])
+
+
+@pytest.mark.parametrize(
+    "pairs",
+    [
+        [["david", "hugh"]],
+        [["david", "hugh"], ["jim", "joe"]],
+        [["david", "hugh"], ["jim", "joe"], ["lane", "myers"]],
+    ],
+)
+def test_merged_rosters_generate_past_2040(base, pairs):
+    # david+hugh used to run out of weeks in 2040, and more 10% shares
+    # leave less room to place them
+    data = apply_changes(base, [{"merge": {"shares": pair, "into": "_".join(pair)}} for pair in pairs])
+    share_roster = roster.Roster(data)
+
+    schedule = take2.generate_multi_year_schedule(2025, 20, roster=share_roster)
+
+    assert check_schedule(schedule, share_roster) == {}
+    take2.test_schedule(schedule, share_roster)
+
+
+def test_run_scenario_scores_a_sale_like_the_baseline(base):
+    baseline = run_scenario("baseline", base)
+    sold = run_scenario("sold", apply_changes(base, [{"sell": {"share": "eddie", "to": "new_owner"}}]))
+
+    assert baseline["valid"], baseline["error"]
+    assert sold["valid"], sold["error"]
+    assert {k: v for k, v in sold.items() if k not in ("name", "checksum")} == {
+        k: v for k, v in baseline.items() if k not in ("name", "checksum")
+    }
+
+
+def test_run_scenario_reports_errors_instead_of_raising(base):
+    base["shares"][0]["percent"] = 5
+    result = run_scenario("broken", base)
+
+    assert not result["valid"]
+    assert "ValueError" in result["error"]
+
+
+def test_the_example_scenarios_all_run():
+    for scenario in load_scenarios(EXAMPLES):
+        result = run_scenario(scenario["name"], scenario["data"])
+        assert result["valid"], (scenario["name"], result["error"])
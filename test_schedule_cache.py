@@ -0,0 +1,67 @@
+"""
+Pytest tests for the on-disk schedule cache.
+"""
+
+import pytest
+
+import instrumentation
+import manifest
+import roster
+from scenarios import apply_changes
+from schedule_cache import ScheduleCache, cache_key, load_schedule
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScheduleCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def counts():
+    instrumentation.PROFILER.reset()
+    instrumentation.enable()
+    yield instrumentation.PROFILER.counters
+    instrumentation.disable()
+    instrumentation.PROFILER.reset()
+
+
+def test_cached_schedule_matches_a_fresh_run(cache):
+    _, fresh = manifest.run_schedule(2025, 5, seed=3)
+
+    _, first = load_schedule(2025, 5, seed=3, cache=cache)
+    schedule, again = load_schedule(2025, 5, seed=3, cache=cache)
+
+    assert first == again == fresh
+    assert manifest.schedule_checksum(schedule) == fresh["checksum"]
+
+
+def test_rebalancing_reuses_the_generated_schedule(cache, counts):
+    load_schedule(2025, 5, rebalance=False, cache=cache)
+    load_schedule(2025, 5, cache=cache)
+    load_schedule(2025, 5, seed=1, cache=cache)
+
+    # each rebalanced horizon misses once and finds the generated one
+    assert counts["schedule_cache.miss"] == 3
+    assert counts["schedule_cache.hit"] == 2
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    share_roster = roster.default_roster()
+    _, made = load_schedule(2025, 3, rebalance=False, cache=cache)
+    path = cache.path(cache_key(2025, 3, share_roster, rebalance=False))
+    with open(path, "wb") as f:
+        f.write(b"not a pickle")
+
+    assert cache.get(cache_key(2025, 3, share_roster, rebalance=False)) is None
+    _, again = load_schedule(2025, 3, rebalance=False, cache=cache)
+    assert again == made
+    assert cache.clear() == 1
+
+
+def test_key_follows_the_roster():
+    base = roster.default_roster()
+    sold = roster.Roster(apply_changes(base.to_dict(), [{"sell": {"share": "eddie", "to": "new_owner"}}]))
+
+    assert cache_key(2025, 20, base) == cache_key(2025, 20, roster.Roster(base.to_dict()))
+    assert cache_key(2025, 20, base) != cache_key(2025, 20, sold)
+    assert cache_key(2025, 20, base) != cache_key(2025, 20, base, seed=1)
@@ -0,0 +1,141 @@
+"""
+Pytest tests for the schedule diff engine.
+"""
+
+import copy
+import time
+
+import pytest
+
+import take2
+from schedule_arrays import ScheduleArrays
+from schedule_diff import changed_events, diff_schedules, removed_event_ids
+from winship_calendar_core import make_event_id
+
+
+@pytest.fixture(scope="module")
+def base_schedule():
+    return [take2.generate_schedule(year) for year in range(2025, 2030)]
+
+
+@pytest.fixture
+def schedule(base_schedule):
+    return copy.deepcopy(base_schedule)
+
+
+def swap(house_year, i, j):
+    weeks = house_year.weeks
+    weeks[i].share, weeks[j].share = weeks[j].share, weeks[i].share
+
+
+def test_identical_schedules_have_no_diff(base_schedule, schedule):
+    diff = diff_schedules(base_schedule, schedule)
+
+    assert diff["changes"] == []
+    assert diff["changed_slots"] == []
+    assert diff["holiday_changes"] == []
+    assert diff["fairness"] == {}
+
+
+def test_swap_reports_owners_and_fairness(base_schedule, schedule):
+    house_year = schedule[2]
+    hot = next(i for i, w in enumerate(house_year.weeks) if w.kind == "hot" and w.share != "everyone")
+    cold = next(i for i, w in enumerate(house_year.weeks)
+                if w.kind == "cold" and w.share not in (house_year.weeks[hot].share, "everyone"))
+    hot_share = house_year.weeks[hot].share
+    cold_share = house_year.weeks[cold].share
+    swap(house_year, hot, cold)
+
+    diff = diff_schedules(base_schedule, schedule)
+
+    assert diff["changes"] == [
+        (2027, min(hot, cold), base_schedule[2].weeks[min(hot, cold)].share, house_year.weeks[min(hot, cold)].share),
+        (2027, max(hot, cold), base_schedule[2].weeks[max(hot, cold)].share, house_year.weeks[max(hot, cold)].share),
+    ]
+    assert diff["by_owner"][hot_share] == {"gained": [(2027, cold)], "lost": [(2027, hot)]}
+    assert diff["fairness"][hot_share] == {"hot": -1, "cold": 1}
+    assert diff["fairness"][cold_share] == {"hot": 1, "cold": -1}
+
+
+def test_holiday_reassignment(base_schedule, schedule):
+    house_year = schedule[1]
+    holiday = next(i for i, w in enumerate(house_year.weeks) if w.holiday)
+    other = next(i for i, w in enumerate(house_year.weeks)
+                 if not w.holiday and w.share not in (house_year.weeks[holiday].share, "everyone"))
+    old_share = house_year.weeks[holiday].share
+    swap(house_year, holiday, other)
+
+    diff = diff_schedules(base_schedule, schedule)
+
+    assert diff["holiday_changes"] == [
+        (2026, house_year.weeks[holiday].holiday, old_share, house_year.weeks[holiday].share)
+    ]
+    assert diff["fairness"][old_share]["holidays"] == -1
+
+
+def test_changed_events_are_the_minimal_calendar_update(base_schedule, schedule):
+    swap(schedule[0], 3, 20)
+    schedule[4].weeks.pop()
+    diff = diff_schedules(base_schedule, schedule)
+
+    events = changed_events(diff, schedule)
+
+    assert [e.event_id for e in events] == [make_event_id(2025, 3), make_event_id(2025, 20)]
+    assert events[0].share == schedule[0].weeks[3].share
+    assert removed_event_ids(diff) == [make_event_id(2029, 40)]
+
+
+def test_years_only_in_one_schedule(base_schedule):
+    diff = diff_schedules(base_schedule[:3], base_schedule[1:])
+
+    assert diff["years_added"] == [2028, 2029]
+    assert diff["years_removed"] == [2025]
+    assert diff["changes"] == []
+
+
+def test_longer_horizon_creates_the_added_years_events(base_schedule):
+    diff = diff_schedules(base_schedule[:3], base_schedule[:4])
+
+    events = changed_events(diff, base_schedule[:4])
+
+    assert [e.event_id for e in events] == [
+        make_event_id(2028, w_idx) for w_idx in range(len(base_schedule[3].weeks))
+    ]
+    assert removed_event_ids(diff) == []
+
+
+def test_shorter_horizon_removes_the_dropped_years_events(base_schedule):
+    diff = diff_schedules(base_schedule[:4], base_schedule[:3])
+
+    assert changed_events(diff, base_schedule[:3]) == []
+    assert removed_event_ids(diff) == [
+        make_event_id(2028, w_idx) for w_idx in range(len(base_schedule[3].weeks))
+    ]
+
+
+def test_renamed_share_is_recoded(base_schedule, schedule):
+    for house_year in schedule:
+        for week in house_year.weeks:
+            if week.share == "eddie":
+                week.share = "new_owner"
+
+    diff = diff_schedules(base_schedule, schedule)
+
+    assert set(diff["by_owner"]) == {"eddie", "new_owner"}
+    assert diff["fairness"]["new_owner"]["weeks"] == 20
+    assert diff["fairness"]["eddie"]["weeks"] == -20
+
+
+def test_century_diff_is_fast():
+    old = ScheduleArrays.from_schedule([take2.generate_schedule(y) for y in range(2025, 2125)])
+    new_schedule = [take2.generate_schedule(y) for y in range(2025, 2125)]
+    for house_year in new_schedule[::3]:
+        swap(house_year, 5, 30)
+    new = ScheduleArrays.from_schedule(new_schedule)
+
+    start = time.perf_counter()
+    diff = diff_schedules(old, new)
+    elapsed = time.perf_counter() - start
+
+    assert len(diff["changed_slots"]) == 2 * 34
+    assert elapsed < 0.5
@@ -0,0 +1,115 @@
+"""
+Pytest tests for the schedule HTTP service, run against localhost.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import roster
+from scenarios import apply_changes
+from schedule_service import ScheduleService, make_server
+
+
+@pytest.fixture
+def roster_path(tmp_path):
+    path = tmp_path / "roster.json"
+    shutil.copy(roster.DEFAULT_ROSTER_PATH, path)
+    return str(path)
+
+
+@pytest.fixture
+def service(roster_path):
+    service = ScheduleService(roster_path, 2025, 3, poll_interval=0.05)
+    service.start()
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+def get(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(base + path) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def rewrite(path, text):
+    before = os.stat(path).st_mtime_ns
+    with open(path, "w") as f:
+        f.write(text)
+    # make sure the change is visible even on coarse-grained filesystems
+    os.utime(path, ns=(before + 10**9, before + 10**9))
+
+
+def test_whose_week_is_it(get, service):
+    christmas = next(w for w in service.index.year_weeks(2026) if w["holiday"] == "Christmas")
+
+    status, week = get("/week?date=2026-12-25")
+
+    assert status == 200
+    assert week == christmas
+    assert week["start"] <= "2026-12-25" < week["end"]
+    assert get("/week?date=2026-02-01")[0] == 404
+    assert get("/week?date=someday")[0] == 400
+
+
+def test_a_shares_weeks(get):
+    status, weeks = get("/shares/eddie/weeks?year=2026")
+
+    assert status == 200
+    assert len(weeks) == 4
+    assert {w["share"] for w in weeks} == {"eddie"}
+    assert len(get("/shares/eddie/weeks")[1]) == 12
+    assert get("/shares/nobody/weeks")[0] == 404
+
+
+def test_a_year_and_status(get):
+    status, weeks = get("/years/2027")
+
+    assert status == 200
+    assert [w["week_index"] for w in weeks] == list(range(len(weeks)))
+    assert get("/years/2040")[0] == 404
+    assert get("/status")[1]["generation"] == 1
+    assert get("/nowhere")[0] == 404
+
+
+def test_roster_change_rebuilds_in_the_background(get, service, roster_path):
+    data = apply_changes(roster.load_roster(roster_path).to_dict(), [{"sell": {"share": "eddie", "to": "new_owner"}}])
+
+    rewrite(roster_path, json.dumps(data))
+    deadline = time.monotonic() + 10
+    while service.generation < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert service.generation == 2
+    assert len(get("/shares/new_owner/weeks?year=2026")[1]) == 4
+    assert get("/shares/eddie/weeks")[0] == 404
+
+
+def test_broken_roster_keeps_the_old_schedule(get, service, roster_path):
+    service.stop()
+    rewrite(roster_path, "not json")
+
+    assert not service.check_roster()
+
+    assert service.last_error.startswith("JSONDecodeError")
+    assert get("/status")[1]["generation"] == 1
+    assert len(get("/shares/eddie/weeks?year=2026")[1]) == 4
@@ -0,0 +1,88 @@
+"""
+Pytest tests for the season layout checker.
+"""
+
+import datetime
+
+import pytest
+
+import date_finders
+import season_layout
+import take2
+
+YEARS = range(1900, 2300)
+
+
+def test_anchor_columns_match_date_finders():
+    years = list(range(2015, 2045))
+    counts = [date_finders.hot_weeks_before_tate_annual_week_start(year) for year in years]
+
+    columns = season_layout.anchor_columns(years, counts)
+
+    finders = {
+        "tate_annual_week_start": date_finders.tate_annual_week_start,
+        "hot_weeks_start": date_finders.hot_weeks_start,
+        "early_warm_weeks_start": date_finders.early_warm_weeks_start,
+        "early_cool_weeks_start": date_finders.early_cool_weeks_start,
+        "early_cold_weeks_start": date_finders.early_cold_weeks_start,
+        "late_warm_weeks_start": date_finders.late_warm_weeks_start,
+        "late_cool_weeks_start": date_finders.late_cool_weeks_start,
+        "late_cold_weeks_start": date_finders.late_cold_weeks_start,
+        "Memorial Day": date_finders.memorial_day_week_start,
+        "Independence Day": date_finders.independence_day_week_start,
+        "Labor Day": date_finders.labor_day_week_start,
+        "Thanksgiving": date_finders.thanksgiving_week_start,
+        "Christmas": date_finders.christmas_week_start,
+    }
+    for name, finder in finders.items():
+        assert [datetime.date.fromordinal(d) for d in columns[name]] == [finder(y) for y in years], name
+
+
+def test_every_year_keeps_the_required_rules():
+    assert season_layout.check_years(YEARS, rules=season_layout.REQUIRED_RULES) == {}
+    assert season_layout.exception_table(YEARS) == {}
+
+
+def test_year_end_breaks_when_august_starts_on_a_sunday():
+    problems = season_layout.check_years(YEARS, hot_weeks=8)
+
+    sunday_aug1 = {year for year in YEARS if datetime.date(year, 8, 1).weekday() == 6}
+    assert set(problems) == sunday_aug1
+    assert {2021, 2027, 2032, 2038} <= set(problems)
+    assert all(p.startswith("year_end:") for year_problems in problems.values() for p in year_problems)
+
+    strict = season_layout.exception_table(YEARS, rules=season_layout.RULES)
+    assert strict == {year: 9 for year in sunday_aug1}
+    assert strict[2021] == date_finders.HOT_WEEKS_EXCEPTIONS[2021]
+
+
+def test_table_keeps_the_current_exceptions(capsys):
+    assert season_layout.main(["--table"]) == 0
+    assert capsys.readouterr().out == "HOT_WEEKS_EXCEPTIONS = {\n    2021: 9,\n}\n"
+
+    assert season_layout.main(["--table", "--strict"]) == 0
+    printed = capsys.readouterr().out
+    assert printed.startswith("HOT_WEEKS_EXCEPTIONS = {\n    1909: 9,")
+    assert "2021: 9," in printed and "\n\n" not in printed
+
+
+def test_an_empty_table_has_no_body():
+    assert season_layout.format_table({}) == "HOT_WEEKS_EXCEPTIONS = {}"
+
+
+def test_nine_hot_weeks_everywhere_breaks_christmas():
+    problems = season_layout.check_years(YEARS, hot_weeks=9, rules=season_layout.REQUIRED_RULES)
+
+    assert problems
+    assert all("Christmas" in p for year_problems in problems.values() for p in year_problems)
+
+
+@pytest.mark.parametrize("year", [2025, 2026, 2027, 2028, 2029, 2030, 2032, 2033, 2034, 2036, 2040, 2044, 2048, 2052])
+def test_generation_for_every_calendar(year):
+    # between them these cover all 14 calendars: each weekday for Jan 1, leap and not
+    house_year = take2.generate_schedule(year)
+
+    assert len(house_year.weeks) == season_layout.SEASON_WEEKS
+    assert [week.kind for week in house_year.weeks] == season_layout.layout_kinds(
+        date_finders.hot_weeks_before_tate_annual_week_start(year)
+    )
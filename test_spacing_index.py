@@ -0,0 +1,47 @@
+"""
+Pytest tests for cross-year spacing.
+"""
+
+import datetime
+
+import pytest
+
+import roster
+import take2
+from spacing_index import SpacingIndex
+
+
+@pytest.fixture(scope="module")
+def ten_percent_shares():
+    return roster.default_roster().ten_percent_shares
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return take2.generate_multi_year_schedule(2025, 20)
+
+
+def sunday(year, month, day):
+    return SpacingIndex.position(datetime.date(year, month, day))
+
+
+def test_gap_across_year_boundary():
+    index = SpacingIndex(["frank_may"], 8)
+    index.add("frank_may", sunday(2025, 12, 21))
+    index.add("frank_may", sunday(2026, 1, 11))
+
+    assert index.violations() == [("frank_may", datetime.date(2025, 12, 21), datetime.date(2026, 1, 11))]
+
+
+def test_the_closed_season_counts():
+    index = SpacingIndex(["frank_may"], 8)
+    index.add("frank_may", sunday(2025, 12, 21))
+
+    # week 39 of 2025 and week 0 of 2026 are a week index apart, but 12 weeks
+    index.add("frank_may", sunday(2026, 3, 15))
+    assert index.violations() == []
+
+
+def test_the_closed_season_keeps_generated_years_apart(schedule, ten_percent_shares):
+    assert SpacingIndex.from_schedule(schedule, ten_percent_shares, take2.MIN_TEN_PERCENT_SPACING).violations() == []
+    take2.test_schedule(schedule)
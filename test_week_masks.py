@@ -0,0 +1,83 @@
+"""
+Pytest tests for the week bitmasks.
+"""
+
+import copy
+
+import pytest
+
+import rebalance2
+import take2
+from week_masks import ScheduleMasks, WeekMasks, iter_bits, near_mask, well_spaced
+
+
+@pytest.fixture(scope="module")
+def schedule():
+    return take2.generate_multi_year_schedule(2025, 10)
+
+
+def test_masks_match_the_weeks(schedule):
+    house_year = schedule[3]
+
+    masks = WeekMasks(house_year.weeks)
+
+    assert masks.open == 0
+    for share in house_year.roster.shares:
+        held = [i for i, week in enumerate(house_year.weeks) if week.share == share]
+        assert list(iter_bits(masks.held(share))) == held
+        assert masks.count(share) == len(held)
+        for kind in ("hot", "warm", "cool", "cold"):
+            assert masks.has_kind(share, kind) == any(house_year.weeks[i].kind == kind for i in held)
+    holidays = [i for i, week in enumerate(house_year.weeks) if week.holiday]
+    assert list(iter_bits(masks.holidays)) == holidays
+
+
+def test_take_release_and_spacing():
+    weeks = [take2.AllocatedWeek(None, "cold" if i < 5 else "hot") for i in range(20)]
+    masks = WeekMasks(weeks)
+
+    masks.take(10, "eddie")
+    assert not masks.is_open(10)
+    assert masks.next_open(10) == 11
+    assert masks.next_open(6, "cold") == 0
+    assert list(iter_bits(masks.too_close("eddie", 3))) == [8, 9, 10, 11, 12]
+    assert list(iter_bits(masks.missing_kinds("eddie"))) == [0, 1, 2, 3, 4]
+
+    masks.release(10, "eddie")
+    assert masks.is_open(10, "hot")
+    assert masks.count("eddie") == 0
+
+
+def test_near_mask_and_well_spaced():
+    assert near_mask(0b1, 3, 8) == 0b111
+    assert near_mask(1 << 7, 3, 8) == 0b11100000
+    assert well_spaced((1 << 0) | (1 << 8) | (1 << 16), 8)
+    assert not well_spaced((1 << 0) | (1 << 7), 8)
+
+
+def test_swap_years_match_a_scan(schedule):
+    masks = ScheduleMasks(schedule)
+
+    for share, w_give, w_get in (("eddie", 3, 4), ("joe", 20, 21), ("frank_may", 0, 40)):
+        expected = [
+            y for y, house_year in enumerate(schedule)
+            if house_year.weeks[w_give].share == share and house_year.weeks[w_get].share != share
+            and not house_year.weeks[w_give].holiday and not house_year.weeks[w_get].holiday
+        ]
+        assert list(masks.swap_years(share, w_give, w_get)) == expected
+
+
+def test_try_swap_with_masks_matches_scan(schedule):
+    with_masks = copy.deepcopy(schedule)
+    without = copy.deepcopy(schedule)
+    masks = ScheduleMasks(with_masks)
+    owner_percent = rebalance2.owner_percent
+
+    for share, w_give, w_get in (("joe", 21, 22), ("eddie", 2, 3), ("will", 30, 29)):
+        swapped = rebalance2.try_swap(with_masks, share, w_give, w_get, owner_percent, set(), masks=masks)
+        assert swapped == rebalance2.try_swap(without, share, w_give, w_get, owner_percent, set())
+
+    assert [[w.share for w in hy.weeks] for hy in with_masks] == [[w.share for w in hy.weeks] for hy in without]
+    fresh = ScheduleMasks(with_masks)
+    assert fresh.holds == masks.holds
+    assert [m.shares for m in fresh.years] == [m.shares for m in masks.years]
@@ -0,0 +1,79 @@
+"""
+Pytest tests for the winship command line.
+"""
+
+import json
+
+import pytest
+
+import roster
+import winship
+from scenarios import apply_changes
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+    def run(*argv):
+        code = winship.main([*argv, "--years", "4", "--cache-dir", str(tmp_path / "cache")])
+        return code, capsys.readouterr().out
+    return run
+
+
+def test_chained_commands_share_the_cache(run, tmp_path):
+    code, out = run("rebalance")
+    assert code == 0
+    checksum = out.split("checksum ")[1][:12]
+
+    code, out = run("validate")
+    assert code == 0
+    assert out.startswith("Valid 2025-2028") and checksum in out
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+def test_print_a_year(run):
+    code, out = run("print", "2026")
+
+    assert code == 0
+    lines = out.splitlines()
+    assert lines[0] == "2026"
+    assert {"cold", "cool", "warm", "hot"} <= set(lines)
+    assert "(Christmas)" in out
+
+
+def test_print_rejects_a_year_outside_the_horizon(run):
+    code, _ = run("print", "2030")
+
+    assert code == 1
+
+
+def test_export_ics(run, tmp_path):
+    path = tmp_path / "winship.ics"
+
+    code, _ = run("export-ics", "-o", str(path))
+
+    assert code == 0
+    assert path.read_text().startswith("BEGIN:VCALENDAR")
+
+
+@pytest.mark.parametrize("command", ["generate", "rebalance"])
+def test_no_rebalance_is_only_offered_where_it_applies(run, command):
+    with pytest.raises(SystemExit):
+        run(command, "--no-rebalance")
+
+
+def test_a_year_that_cant_be_generated_is_named(tmp_path, capsys):
+    # with every 5% pair merged, ten 10% shares have to fill every week,
+    # and in 2032 the search finds no way to space them
+    pairs = [["becca", "will"], ["david", "hugh"], ["hayley", "jordan"], ["jim", "joe"], ["lane", "myers"]]
+    data = apply_changes(
+        roster.default_roster().to_dict(), [{"merge": {"shares": pair, "into": "_".join(pair)}} for pair in pairs]
+    )
+    path = tmp_path / "roster.json"
+    path.write_text(json.dumps(data))
+
+    code = winship.main(["validate", "--start-year", "2032", "--years", "4", "--roster", str(path), "--no-cache"])
+
+    captured = capsys.readouterr()
+    assert code == 1
+    assert captured.err == "Can't generate 2032: No weeks available for richard\n"
+    assert captured.out == ""
@@ -15,6 +15,8 @@ from winship_calendar_core import (
     get_year_from_schedule,
     get_events_for_year,
     calendar_event_to_google_format,
+    make_event_id,
+    plan_sync,
     CalendarEvent
 )
 
@@ -295,6 +297,50 @@ def test_calendar_event_to_google_format(sample_calendar_event):
     assert "Winship House" in google_event['location']
 
 
+def test_scheduled_events_get_deterministic_ids(mock_schedule):
+    """Events from a schedule are keyed by (year, week index)"""
+    event = get_events_for_year(mock_schedule, 2027, 'monday-sunday')[0]
+    google_event = calendar_event_to_google_format(event)
+
+    assert event.event_id == make_event_id(2027, 0)
+    assert google_event['id'] == event.event_id
+    assert google_event['extendedProperties']['private'] == {
+        'winship_year': '2027',
+        'winship_week': '0',
+        'winship_share': 'joe',
+        'winship_hash': event.content_hash(),
+    }
+    assert 'id' not in calendar_event_to_google_format(
+        CalendarEvent("x", date(2027, 3, 8), date(2027, 3, 15), "", "")
+    )
+
+
+def test_make_event_id_is_a_valid_google_id():
+    event_id = make_event_id(2027, 40)
+    assert 5 <= len(event_id) <= 1024
+    assert set(event_id) <= set("0123456789abcdefghijklmnopqrstuv")
+    assert event_id != make_event_id(2027, 39)
+    assert event_id != make_event_id(2028, 40)
+
+
+def test_plan_sync(mock_schedule):
+    """Only new, changed and stale events need writes"""
+    events = [
+        CalendarEvent(f"Owner {i}", date(2027, 3, 8), date(2027, 3, 15), "", "", 2027, i, "joe")
+        for i in range(4)
+    ]
+    existing = [calendar_event_to_google_format(e) for e in events[:3]]
+    existing[1]['extendedProperties']['private']['winship_hash'] = 'stale'
+    existing.append({'id': make_event_id(2027, 9), 'summary': 'Gone'})
+
+    creates, updates, deletes = plan_sync(events, existing)
+
+    assert creates == [events[3]]
+    assert updates == [events[1]]
+    assert deletes == [make_event_id(2027, 9)]
+    assert plan_sync(events, [calendar_event_to_google_format(e) for e in events]) == ([], [], [])
+
+
 # Parametrized tests
 @pytest.mark.parametrize("share,expected", [
     ("frank_may", "Frank May"),
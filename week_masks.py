@@ -0,0 +1,238 @@
+"""
+A year's weeks as integer bitmasks: bit i stands for week index i.
+WeekMasks keeps which weeks are open, which are of each kind, which are
+holidays and which each share holds, so the questions allocation and swap
+search keep asking (is week i open, of the right kind, far enough from the
+share's other weeks?) are a few bitwise operations, and candidates are found
+by walking set bits.
+"""
+
+from typing import Dict, Iterator, Optional
+
+
+def bit(index: int) -> int:
+    return 1 << index
+
+
+def has_bit(mask: int, index: int) -> bool:
+    return (mask >> index) & 1 == 1
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Indices of the set bits, lowest first.
+
+    >>> list(iter_bits(0b101001))
+    [0, 3, 5]
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def near_mask(mask: int, distance: int, size: int) -> int:
+    """Weeks less than distance away from a set bit (not wrapping around the
+    year), the set bits included.
+
+    >>> bin(near_mask(0b1000000, 3, 10))
+    '0b111110000'
+    """
+    near = mask
+    for k in range(1, distance):
+        near |= (mask << k) | (mask >> k)
+    return near & ((1 << size) - 1)
+
+
+def well_spaced(mask: int, distance: int) -> bool:
+    """Whether every two set bits are at least distance apart.
+
+    >>> well_spaced(0b100000001, 8), well_spaced(0b10000001, 8)
+    (True, False)
+    """
+    return all(mask & (mask >> k) == 0 for k in range(1, distance))
+
+
+def nearest_bits(mask: int, target: int, size: int) -> Iterator[int]:
+    """Set bits ordered by circular distance from target, forward before
+    backward on ties (+0, +1, -1, +2, -2, ...).
+
+    >>> list(nearest_bits(0b1111101111, 4, 10))[:4]
+    [5, 3, 6, 2]
+    """
+    target %= size
+    if has_bit(mask, target):
+        yield target
+    for d in range(1, size // 2 + 1):
+        ahead = (target + d) % size
+        if has_bit(mask, ahead):
+            yield ahead
+        behind = (target - d) % size
+        if behind != ahead and has_bit(mask, behind):
+            yield behind
+
+
+class WeekMasks:
+    """Open, per-kind, holiday and per-share masks for one year's weeks."""
+
+    def __init__(self, weeks):
+        self.size = len(weeks)
+        self.kinds = [week.kind for week in weeks]
+        self.open = 0
+        self.holidays = 0
+        self.kind_masks: Dict[str, int] = {}
+        self.shares: Dict[str, int] = {}
+        for index, week in enumerate(weeks):
+            b = bit(index)
+            self.kind_masks[week.kind] = self.kind_masks.get(week.kind, 0) | b
+            if week.holiday:
+                self.holidays |= b
+            if week.share is None:
+                self.open |= b
+            else:
+                self.shares[week.share] = self.shares.get(week.share, 0) | b
+
+    def _open(self, kind=None) -> int:
+        if kind is None:
+            return self.open
+        return self.open & self.kind_masks.get(kind, 0)
+
+    def is_open(self, index, kind=None) -> bool:
+        return has_bit(self._open(kind), index % self.size)
+
+    def take(self, index, share: Optional[str] = None):
+        index = index % self.size
+        self.open &= ~bit(index)
+        if share is not None:
+            self.shares[share] = self.shares.get(share, 0) | bit(index)
+
+    def release(self, index, share: Optional[str] = None):
+        index = index % self.size
+        self.open |= bit(index)
+        if share is not None:
+            self.shares[share] = self.shares.get(share, 0) & ~bit(index)
+
+    def move(self, share: str, old: int, new: int):
+        """The share gives up week old for week new (a swap's half)."""
+        self.shares[share] = (self.shares.get(share, 0) & ~bit(old)) | bit(new)
+
+    def held(self, share: str) -> int:
+        return self.shares.get(share, 0)
+
+    def count(self, share: str) -> int:
+        return self.held(share).bit_count()
+
+    def has_kind(self, share: str, kind: str) -> bool:
+        return self.held(share) & self.kind_masks.get(kind, 0) != 0
+
+    def too_close(self, share: str, distance: int) -> int:
+        """Weeks forbidden to the share by spacing: less than distance from
+        one it holds."""
+        if distance <= 0:
+            return 0
+        return near_mask(self.held(share), distance, self.size)
+
+    def of_kinds(self, kinds) -> int:
+        """Weeks of any of the kinds."""
+        mask = 0
+        for kind in kinds:
+            mask |= self.kind_masks.get(kind, 0)
+        return mask
+
+    def missing_kinds(self, share: str) -> int:
+        """Weeks of the kinds the share doesn't hold yet."""
+        held = self.held(share)
+        mask = 0
+        for kind_mask in self.kind_masks.values():
+            if not held & kind_mask:
+                mask |= kind_mask
+        return mask
+
+    def next_open(self, start, kind=None, mask: Optional[int] = None) -> Optional[int]:
+        """First open index (within mask, if given) at or after start,
+        wrapping around the year.  Returns None if nothing of that kind is open.
+
+        >>> from take2 import AllocatedWeek
+        >>> free = WeekMasks([AllocatedWeek(None, k) for k in "ab" * 5])
+        >>> free.take(8)
+        >>> free.next_open(7, "a")
+        0
+        """
+        mask = self._open(kind) if mask is None else self._open(kind) & mask
+        if not mask:
+            return None
+        ahead = mask >> (start % self.size)
+        if ahead:
+            return start % self.size + (ahead & -ahead).bit_length() - 1
+        return (mask & -mask).bit_length() - 1
+
+    def open_from(self, start, kind=None, mask: Optional[int] = None) -> Iterator[int]:
+        """Every open index (within mask, if given) at or after start, then
+        the ones before it; next_open's is first.
+
+        >>> from take2 import AllocatedWeek
+        >>> free = WeekMasks([AllocatedWeek(None, k) for k in "ab" * 5])
+        >>> list(free.open_from(5, "a"))
+        [6, 8, 0, 2, 4]
+        """
+        candidates = self._open(kind) if mask is None else self._open(kind) & mask
+        start %= self.size
+        yield from iter_bits(candidates >> start << start)
+        yield from iter_bits(candidates & (bit(start) - 1))
+
+    def nearest(self, target, kind=None, mask: Optional[int] = None) -> Iterator[int]:
+        """Open indices (within mask, if given) ordered by circular distance
+        from target, forward before backward on ties.
+
+        >>> from take2 import AllocatedWeek
+        >>> free = WeekMasks([AllocatedWeek(None, "cold") for _ in range(10)])
+        >>> free.take(4)
+        >>> list(free.nearest(4))[:4]
+        [5, 3, 6, 2]
+        """
+        candidates = self._open(kind)
+        if mask is not None:
+            candidates &= mask
+        return nearest_bits(candidates, target, self.size)
+
+
+class ScheduleMasks:
+    """
+    Masks across the years of a schedule, for swap search.
+
+        holds[share][w]  bit y set if the share holds week index w in year y
+                         (y counting from 0 in schedule order)
+        holidays[w]      bit y set if week index w is a holiday in year y
+        years[y]         WeekMasks of year y
+
+    so the years where a share could trade week index a for b are one
+    expression, walked bit by bit.
+    """
+
+    def __init__(self, schedule):
+        self.years = [WeekMasks(house_year.weeks) for house_year in schedule]
+        size = max((masks.size for masks in self.years), default=0)
+        self.holds: Dict[str, list] = {}
+        self.holidays = [0] * size
+        for y, masks in enumerate(self.years):
+            year_bit = bit(y)
+            for w in iter_bits(masks.holidays):
+                self.holidays[w] |= year_bit
+            for share, held in masks.shares.items():
+                holds = self.holds.setdefault(share, [0] * size)
+                for w in iter_bits(held):
+                    holds[w] |= year_bit
+
+    def swap_years(self, share: str, w_give: int, w_get: int) -> Iterator[int]:
+        """Years where the share holds w_give but not w_get and neither is a
+        holiday, earliest first."""
+        holds = self.holds.get(share)
+        if holds is None:
+            return iter(())
+        return iter_bits(holds[w_give] & ~holds[w_get] & ~(self.holidays[w_give] | self.holidays[w_get]))
+
+    def move(self, y: int, share: str, old: int, new: int):
+        """In year y the share gives up week old for week new."""
+        self.years[y].move(share, old, new)
+        holds = self.holds.setdefault(share, [0] * len(self.holidays))
+        holds[old] &= ~bit(y)
+        holds[new] |= bit(y)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+One command line for the schedule.
+
+    python winship.py generate --years 20
+    python winship.py rebalance --seed 7 --manifest manifest.json
+    python winship.py validate
+    python winship.py print 2026
+    python winship.py owner eddie --year 2031 --ics eddie.ics
+    python winship.py export-xlsx -o winship_schedule.xlsx
+    python winship.py export-ics -o winship.ics
+    python winship.py sync-calendar 2026
+
+Every subcommand gets its schedule from schedule_cache, so a chain of
+commands over the same horizon generates and rebalances it once; --no-cache
+recomputes without touching the cache.  Exporters and the calendar client
+are only imported by the subcommands that use them.
+"""
+
+import argparse
+import sys
+
+import roster
+import schedule_cache
+import take2
+
+
+def load(args):
+    share_roster = roster.load_roster(args.roster) if args.roster else roster.default_roster()
+    cache = None if args.no_cache else schedule_cache.ScheduleCache(args.cache_dir)
+    schedule, made = schedule_cache.load_schedule(
+        args.start_year, args.years, share_roster, args.seed, not args.no_rebalance, cache
+    )
+    return schedule, made, share_roster
+
+
+def describe(schedule, made) -> str:
+    return (
+        f"{schedule[0].year}-{schedule[-1].year} ({len(schedule)} years), "
+        f"checksum {made['checksum'][:12]}"
+    )
+
+
+def cmd_generate(args):
+    schedule, made, _ = load(args)
+    print(f"Generated {describe(schedule, made)}")
+    return 0
+
+
+def cmd_rebalance(args):
+    schedule, made, _ = load(args)
+    print(f"Rebalanced {describe(schedule, made)}: {made['swaps']} swaps in {made['passes']} passes")
+    if args.manifest:
+        import manifest
+
+        manifest.write_manifest(made, args.manifest)
+        print(f"Wrote {args.manifest}")
+    return 0
+
+
+def cmd_validate(args):
+    import fairness
+
+    schedule, made, share_roster = load(args)
+    try:
+        take2.test_schedule(schedule, share_roster)
+    except AssertionError as e:
+        print(f"INVALID {describe(schedule, made)}: {e}")
+        return 1
+    print(f"Valid {describe(schedule, made)}")
+    for name, value in fairness.fairness_scores(schedule, share_roster).items():
+        print(f"  {name}: {value:g}")
+    return 0
+
+
+def cmd_print(args):
+    schedule, _, share_roster = load(args)
+    house_years = {house_year.year: house_year for house_year in schedule}
+    for year in args.year:
+        if year not in house_years:
+            print(f"{year} is not in {schedule[0].year}-{schedule[-1].year}", file=sys.stderr)
+            return 1
+        print(year)
+        kind = None
+        for week in house_years[year].weeks:
+            if week.kind != kind:
+                kind = week.kind
+                print()
+                print(kind)
+            name = share_roster.display_name(week.share)
+            holiday = f" ({week.holiday})" if week.holiday else ""
+            print(f"\t{week.start.strftime('%A, %x')} - {name}{holiday}")
+        print("-" * 80)
+    return 0
+
+
+def cmd_owner(args):
+    from owner_index import OwnerIndex, format_owner_report, write_owner_ics
+
+    schedule, _, share_roster = load(args)
+    index = OwnerIndex(schedule)
+    if args.share not in index.weeks:
+        print(f"No share {args.share!r}", file=sys.stderr)
+        return 1
+    print(format_owner_report(index, args.share, share_roster, args.year))
+    if args.ics:
+        with open(args.ics, "w", newline="", encoding="utf-8") as f:
+            count = write_owner_ics(index, args.share, f, args.week_format, share_roster, args.year)
+        print(f"Wrote {count} events to {args.ics}", file=sys.stderr)
+    return 0
+
+
+def cmd_export_xlsx(args):
+    import export_to_excel
+
+    schedule, _, _ = load(args)
+    if args.by_owner:
+        from owner_index import OwnerIndex
+
+        export_to_excel.export_owner_sheets(args.output, OwnerIndex(schedule))
+    else:
+        export_to_excel.export_to_excel(args.output, schedule)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+def cmd_export_ics(args):
+    from ics_export import write_ics
+
+    schedule, _, _ = load(args)
+    if args.output == "-":
+        write_ics(schedule, sys.stdout, args.week_format)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            count = write_ics(schedule, f, args.week_format)
+        print(f"Wrote {count} events to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_sync_calendar(args):
+    import export_winship_schedule_to_google_calender as exporter
+
+    schedule, _, _ = load(args)
+    house_years = {house_year.year for house_year in schedule}
+    for year in args.year:
+        if year not in house_years:
+            print(f"{year} is not in {schedule[0].year}-{schedule[-1].year}", file=sys.stderr)
+            return 1
+    for year in args.year:
+        exporter.export_year(
+            year, args.week_format, snapshot_path=args.snapshot or None, schedule=schedule
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--start-year", type=int, default=2025)
+    common.add_argument("--years", type=int, default=20)
+    common.add_argument("--seed", type=int, default=None, help="rebalancer tie-breaking seed")
+    common.add_argument("--roster", default=None, help="roster.json (default: the repo's)")
+    common.add_argument("--cache-dir", default=schedule_cache.DEFAULT_CACHE_DIR)
+    common.add_argument("--no-cache", action="store_true")
+
+    # generate and rebalance fix this themselves
+    rebalancing = argparse.ArgumentParser(add_help=False)
+    rebalancing.add_argument("--no-rebalance", action="store_true")
+
+    week_format = argparse.ArgumentParser(add_help=False)
+    week_format.add_argument("--week-format", choices=["monday-sunday", "sunday-saturday"],
+                             default="monday-sunday")
+
+    parser = argparse.ArgumentParser(prog="winship", description="Winship house schedule")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sub = commands.add_parser("generate", parents=[common], help="generate the schedule (no rebalancing)")
+    sub.set_defaults(func=cmd_generate, no_rebalance=True)
+
+    sub = commands.add_parser("rebalance", parents=[common], help="generate and rebalance the schedule")
+    sub.add_argument("--manifest", default=None, help="write the run's manifest here")
+    sub.set_defaults(func=cmd_rebalance, no_rebalance=False)
+
+    sub = commands.add_parser("validate", parents=[common, rebalancing], help="check the schedule's rules and fairness")
+    sub.set_defaults(func=cmd_validate)
+
+    sub = commands.add_parser("print", parents=[common, rebalancing], help="print years of the schedule")
+    sub.add_argument("year", type=int, nargs="+")
+    sub.set_defaults(func=cmd_print)
+
+    sub = commands.add_parser("owner", parents=[common, rebalancing, week_format], help="one owner's weeks")
+    sub.add_argument("share")
+    sub.add_argument("--year", type=int, default=None, help="only this year")
+    sub.add_argument("--ics", default=None, help="also write the owner's weeks as an iCalendar feed")
+    sub.set_defaults(func=cmd_owner)
+
+    sub = commands.add_parser("export-xlsx", parents=[common, rebalancing], help="write an Excel workbook")
+    sub.add_argument("-o", "--output", default="winship_schedule.xlsx")
+    sub.add_argument("--by-owner", action="store_true", help="one sheet per owner instead of per year")
+    sub.set_defaults(func=cmd_export_xlsx)
+
+    sub = commands.add_parser("export-ics", parents=[common, rebalancing, week_format], help="write an iCalendar feed")
+    sub.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    sub.set_defaults(func=cmd_export_ics)
+
+    sub = commands.add_parser("sync-calendar", parents=[common, rebalancing, week_format],
+                              help="sync years to the house Google calendar")
+    sub.add_argument("year", type=int, nargs="+")
+    sub.add_argument("--snapshot", default="calendar_snapshot.json",
+                     help="local calendar snapshot ('' to list remotely)")
+    sub.set_defaults(func=cmd_sync_calendar)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except take2.ScheduleGenerationError as e:
+        print(f"Can't generate {e.year}: {e.reason}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,9 +4,32 @@ This module contains pure functions with no external dependencies for easy testi
 """
 
 import datetime
+import hashlib
 from typing import List, Dict, Tuple, Optional, Protocol
 from dataclasses import dataclass
 
+# Keys in a Google event's extendedProperties.private tagging it as ours
+PROPERTY_YEAR = "winship_year"
+PROPERTY_WEEK = "winship_week"
+PROPERTY_SHARE = "winship_share"
+PROPERTY_HASH = "winship_hash"
+
+
+def make_event_id(year: int, week_index: int) -> str:
+    """
+    Deterministic Google Calendar event ID for a schedule slot.
+
+    The ID names the slot (year, week index), not the owner, so reassigning a
+    week is an update of the same event.  Google allows [a-v0-9] IDs of 5-1024
+    characters; a hex digest qualifies.
+
+    >>> make_event_id(2027, 3)
+    'd9c19aa67eea19e3390c7f0acbd0deb8f3a28dd0'
+    >>> make_event_id(2027, 3) == make_event_id(2027, 3)
+    True
+    """
+    return hashlib.sha1(f"winship:{year}:{week_index}".encode()).hexdigest()
+
 
 @dataclass
 class CalendarEvent:
@@ -16,13 +39,40 @@ class CalendarEvent:
     end_date: datetime.date
     location: str
     description: str
+    # schedule slot; set for events generated from a schedule
+    year: Optional[int] = None
+    week_index: Optional[int] = None
+    share: Optional[str] = None
+
+    @property
+    def event_id(self) -> Optional[str]:
+        if self.year is None or self.week_index is None:
+            return None
+        return make_event_id(self.year, self.week_index)
+
+    def content_hash(self) -> str:
+        """Hash of everything the export writes, to skip unchanged events."""
+        content = "\x1f".join([
+            self.summary,
+            self.start_date.isoformat(),
+            self.end_date.isoformat(),
+            self.location,
+            self.description,
+            self.share or "",
+        ])
+        return hashlib.sha1(content.encode()).hexdigest()
 
 
 class CalendarServiceProtocol(Protocol):
     """Protocol for calendar service - allows for mocking in tests"""
 
     def list_events(self, calendar_id: str, time_min: str, time_max: str,
-                   page_token: Optional[str] = None, max_results: int = 100) -> Dict:
+                   page_token: Optional[str] = None, max_results: int = 100,
+                   private_extended_property: Optional[str] = None,
+                   sync_token: Optional[str] = None) -> Dict:
+        ...
+
+    def get_event(self, calendar_id: str, event_id: str) -> Optional[Dict]:
         ...
 
     def create_event(self, calendar_id: str, event: Dict) -> Dict:
@@ -75,13 +125,16 @@ def adapt_week_dates(week_start: datetime.date,
     return start_date, end_date
 
 
-def week_to_event(week, week_format: str = 'monday-sunday') -> CalendarEvent:
+def week_to_event(week, week_format: str = 'monday-sunday',
+                  year: Optional[int] = None,
+                  week_index: Optional[int] = None) -> CalendarEvent:
     """
     Convert AllocatedWeek to CalendarEvent.
 
     Args:
         week: AllocatedWeek object with start, share, kind, holiday attributes
         week_format: Format for the week (monday-sunday or sunday-saturday)
+        year, week_index: Schedule slot, which gives the event its ID
 
     Returns:
         CalendarEvent object
@@ -99,7 +152,10 @@ def week_to_event(week, week_format: str = 'monday-sunday') -> CalendarEvent:
         start_date=start_date,
         end_date=end_date,
         location="Winship House, 1083 Lake Sequoyah Road, Jasper, GA, 30143",
-        description=description
+        description=description,
+        year=year,
+        week_index=week_index,
+        share=week.share,
     )
 
 
@@ -172,8 +228,8 @@ def get_events_for_year(schedule: List, year: int, week_format: str = 'monday-su
         return []
 
     events = []
-    for week in house_year.weeks:
-        event = week_to_event(week, week_format)
+    for week_index, week in enumerate(house_year.weeks):
+        event = week_to_event(week, week_format, year, week_index)
         events.append(event)
     return events
 
@@ -188,10 +244,54 @@ def calendar_event_to_google_format(event: CalendarEvent) -> Dict:
     Returns:
         Dictionary in Google Calendar API format
     """
-    return {
+    google_event = {
         "summary": event.summary,
         "location": event.location,
         "start": {"date": event.start_date.isoformat(), "timeZone": "America/New_York"},
         "end": {"date": event.end_date.isoformat(), "timeZone": "America/New_York"},
         "description": event.description
-    }
\ No newline at end of file
+    }
+    if event.event_id:
+        google_event["id"] = event.event_id
+        google_event["extendedProperties"] = {
+            "private": {
+                PROPERTY_YEAR: str(event.year),
+                PROPERTY_WEEK: str(event.week_index),
+                PROPERTY_SHARE: event.share or "",
+                PROPERTY_HASH: event.content_hash(),
+            }
+        }
+    return google_event
+
+
+def stored_hash(google_event: Dict) -> Optional[str]:
+    """The content hash an exported event was written with, if any."""
+    return google_event.get("extendedProperties", {}).get("private", {}).get(PROPERTY_HASH)
+
+
+def plan_sync(events: List[CalendarEvent],
+              existing: List[Dict]) -> Tuple[List[CalendarEvent], List[CalendarEvent], List[str]]:
+    """
+    Work out the writes needed to bring a calendar in line with the events.
+
+    Args:
+        events: Events generated from the schedule (with IDs)
+        existing: Google events previously exported for the same range
+
+    Returns:
+        (events to create, events to update, IDs of stale events to delete);
+        all three are empty when nothing changed
+    """
+    existing_by_id = {e["id"]: e for e in existing if e.get("status") != "cancelled"}
+    wanted_ids = set()
+    creates = []
+    updates = []
+    for event in events:
+        wanted_ids.add(event.event_id)
+        current = existing_by_id.get(event.event_id)
+        if current is None:
+            creates.append(event)
+        elif stored_hash(current) != event.content_hash():
+            updates.append(event)
+    deletes = [event_id for event_id in existing_by_id if event_id not in wanted_ids]
+    return creates, updates, deletes
\ No newline at end of file
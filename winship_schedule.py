@@ -2,9 +2,9 @@
 
 from collections import namedtuple, deque
 import sys
-import pprint
 from datetime import date, timedelta
 from date_finders import *
+import roster
 
 """
 Hot Weeks - 8 weeks before the Tate Annual Weekend, and 2 weeks after
@@ -42,48 +42,7 @@ Frank L             10%
 """
 
 
-SHARE_WEEKS = [
-    "becca-1",
-    "becca-2",
-    "david-1",
-    "david-2",
-    "hugh_ann_laurel-1",
-    "hugh_ann_laurel-2",
-    "eddie-1",
-    "eddie-2",
-    "eddie-3",
-    "eddie-4",
-    "frank_latimer-1",
-    "frank_latimer-2",
-    "frank_latimer-3",
-    "frank_latimer-4",
-    "frank_may-1",
-    "frank_may-2",
-    "frank_may-3",
-    "frank_may-4",
-    "hankey-1",
-    "hankey-2",
-    "hankey-3",
-    "hankey-4",
-    "jim-1",
-    "jim-2",
-    "joe-1",
-    "joe-2",
-    "myers-1",
-    "myers-2",
-    "lane-1",
-    "lane-2",
-    "hayley-1",
-    "hayley-2",
-    "jordan-2",
-    "jordan-1",
-    "richard-1",
-    "richard-2",
-    "richard-3",
-    "richard-4",
-    "will-1",
-    "will-2",
-]
+ROSTER = roster.default_roster()
 
 # 'hankey-1',
 # 'hayley-1',
@@ -165,9 +124,10 @@ SCHEDULE["even"]["warm"] = list(reversed(SCHEDULE["even"]["cool"]))
 SCHEDULE["even"]["cold"] = list(reversed(SCHEDULE["even"]["hot"]))
 
 def share_name_to_name(share):
-    ret = share.split("-")[0].replace("_", " ").title()
-    if ret == "Hankey":
-        return "Charlie"
+    share = share.split("-")[0]
+    if share in ROSTER.share_ids:
+        return ROSTER.display_name(share)
+    ret = share.replace("_", " ").title()
     if ret == "Hugh Ann Laurel":
         return "Hugh & Ann Laurel"
     return ret
@@ -236,6 +196,8 @@ def check_house_year(year):
                 ), f"{last_week.end!r} should equal {week.start!r}"
                 last_week = week
     if problems:
+        import pprint
+
         pprint.pprint(problems)
         return False
     return True